@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from backend.engine.backtester import TradeLog
+
+# Body layout: one Arrow IPC stream per named section, concatenated. Each section's schema
+# metadata carries b"section"; the first section also carries any JSON-encoded extras
+# (summary, benchmarks, config, ...). decode_sections() reads them all back.
+
+
+def encode_sections(sections: Dict[str, pa.Table], extras: Optional[dict] = None) -> bytes:
+    sink = pa.BufferOutputStream()
+    for i, (name, table) in enumerate(sections.items()):
+        metadata = {b"section": name.encode()}
+        if i == 0 and extras:
+            metadata.update({k.encode(): json.dumps(v).encode() for k, v in extras.items()})
+        table = table.replace_schema_metadata(metadata)
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def decode_sections(payload: bytes) -> Dict[str, pa.Table]:
+    """Inverse of encode_sections; extras stay available in each table's schema metadata."""
+    reader = pa.BufferReader(payload)
+    sections: Dict[str, pa.Table] = {}
+    while reader.tell() < len(payload):
+        table = pa.ipc.open_stream(reader).read_all()
+        sections[table.schema.metadata[b"section"].decode()] = table
+    return sections
+
+
+def section_extras(table: pa.Table) -> dict:
+    """JSON extras stored on a section's schema metadata (everything but b"section")."""
+    meta = table.schema.metadata or {}
+    return {k.decode(): json.loads(v) for k, v in meta.items() if k != b"section"}
+
+
+def equity_table(index: pd.DatetimeIndex, equity: np.ndarray, float32: bool = False) -> pa.Table:
+    values = np.asarray(equity, dtype=np.float32 if float32 else np.float64)
+    return pa.table({"ts": pa.array(index), "equity": values})
+
+
+def trades_table(log: TradeLog) -> pa.Table:
+    return pa.table(
+        {
+            "ts": pa.array(log.ts),
+            "side": log.side,              # +1 buy, -1 sell
+            "price": log.price,
+            "qty": log.qty,
+            "fees": log.fees,
+            "slippage": log.slippage,
+        }
+    )
+
+
+def records_table(rows: List[dict], columns: List[str]) -> pa.Table:
+    """Flat row dicts (e.g. batch summaries, sweep rows) as one columnar table."""
+    return pa.Table.from_pandas(pd.DataFrame(rows, columns=columns), preserve_index=False)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+from backend import jobs
+from backend.api.schemas import (
+    BacktestRequest,
+    BatchRequest,
+    JobRequest,
+    JobStatus,
+    PortfolioRequest,
+    RobustnessRequest,
+    SweepRequest,
+    WalkForwardRequest,
+)
+
+router = APIRouter(prefix="/jobs")
+
+
+# ---------------------------------------------------------------------
+# Job kinds run the same handlers as their synchronous endpoints; the stored result is the
+# JSON body those endpoints would have returned. Handlers with long engine loops get
+# jobs.progress, which reports to (and cancels) the job the worker thread is running.
+def _run_backtest(req: BacktestRequest) -> str:
+    from backend.api.routes import run_backtest
+
+    return run_backtest(req, None, None, "float64").body.decode()
+
+
+def _run_sweep(req: SweepRequest) -> str:
+    from backend.api.routes import run_sweep
+
+    return run_sweep(req, None, progress=jobs.progress).model_dump_json()
+
+
+def _run_walkforward(req: WalkForwardRequest) -> str:
+    from backend.api.routes import run_walkforward
+
+    return run_walkforward(req, progress=jobs.progress).model_dump_json()
+
+
+def _run_portfolio(req: PortfolioRequest) -> str:
+    from backend.api.routes import run_portfolio
+
+    return run_portfolio(req).model_dump_json()
+
+
+def _run_robustness(req: RobustnessRequest) -> str:
+    from backend.api.routes import run_robustness
+
+    return run_robustness(req, progress=jobs.progress).model_dump_json()
+
+
+def _run_batch(req: BatchRequest) -> str:
+    from backend.api.routes import run_batch_backtest
+
+    return run_batch_backtest(req, None, progress=jobs.progress).model_dump_json()
+
+
+JOB_KINDS: Dict[str, Tuple[Type[BaseModel], Callable[[BaseModel], str]]] = {
+    "backtest": (BacktestRequest, _run_backtest),
+    "sweep": (SweepRequest, _run_sweep),
+    "walkforward": (WalkForwardRequest, _run_walkforward),
+    "portfolio": (PortfolioRequest, _run_portfolio),
+    "robustness": (RobustnessRequest, _run_robustness),
+    "batch": (BatchRequest, _run_batch),
+}
+
+
+def _runner(kind: str) -> Callable[[dict], str]:
+    model, run = JOB_KINDS[kind]
+
+    def runner(spec: dict) -> str:
+        try:
+            return run(model.model_validate(spec))
+        except HTTPException as e:  # handler errors -> the job's error message
+            raise RuntimeError(e.detail) from None
+
+    return runner
+
+
+for _kind in JOB_KINDS:
+    jobs.register_runner(_kind, _runner(_kind))
+
+
+# ---------------------------------------------------------------------
+def _iso(ts: Optional[float]) -> Optional[str]:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec="milliseconds")
+
+
+def _status(job: jobs.Job) -> JobStatus:
+    return JobStatus(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        priority=job.priority,
+        progress=job.progress,
+        message=job.message,
+        error=job.error,
+        created_at=_iso(job.created_at),
+        started_at=_iso(job.started_at),
+        finished_at=_iso(job.finished_at),
+    )
+
+
+def _get(job_id: str) -> jobs.Job:
+    job = jobs.get_queue().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+
+@router.post("", response_model=JobStatus, status_code=202)
+def submit_job(req: JobRequest) -> JobStatus:
+    """
+    Queue a backtest/sweep/walk-forward/portfolio/robustness/batch run; poll
+    GET /jobs/{id} for progress and fetch GET /jobs/{id}/result when it succeeded.
+    """
+    model, _ = JOB_KINDS[req.kind]
+    try:
+        spec = model.model_validate(req.spec)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**err, "loc": ("body", "spec", *err["loc"])} for err in e.errors()]
+        )
+    job = jobs.get_queue().submit(req.kind, spec.model_dump(mode="json"), req.priority)
+    return _status(job)
+
+
+@router.get("", response_model=List[JobStatus])
+def list_jobs(
+    status: Optional[str] = Query(None, description="Only jobs in this state"),
+    limit: int = Query(50, ge=1, le=1000),
+) -> List[JobStatus]:
+    """Most recent jobs first."""
+    return [_status(j) for j in jobs.get_queue().store.list(status=status, limit=limit)]
+
+
+@router.get("/{job_id}", response_model=JobStatus)
+def get_job(job_id: str) -> JobStatus:
+    return _status(_get(job_id))
+
+
+@router.get("/{job_id}/result")
+def get_job_result(job_id: str) -> Response:
+    """The finished job's response body, exactly as its synchronous endpoint returns it."""
+    job = _get(job_id)
+    if job.status != "succeeded":
+        detail = f"Job is {job.status}" + (f": {job.error}" if job.error else "")
+        raise HTTPException(status_code=409, detail=detail)
+    return Response(content=jobs.get_queue().store.result(job_id), media_type="application/json")
+
+
+@router.post("/{job_id}/cancel", response_model=JobStatus)
+def cancel_job(job_id: str) -> JobStatus:
+    """
+    Queued jobs are cancelled immediately; running jobs stop at their next progress step
+    (their status turns "cancelled" then). Finished jobs are left as they are.
+    """
+    _get(job_id)
+    return _status(jobs.get_queue().cancel(job_id))
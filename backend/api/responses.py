@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import json
+from typing import Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+NDJSON = "application/x-ndjson"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+
+def accepts(accept: Optional[str], media_type: str) -> bool:
+    """True if the Accept header lists ``media_type`` (parameters like q= are ignored)."""
+    if not accept:
+        return False
+    return any(part.split(";")[0].strip() == media_type for part in accept.split(","))
+
+
+def iso_timestamps(index: pd.DatetimeIndex) -> List[str]:
+    """ISO 8601 strings for a DatetimeIndex, vectorized (tz-aware indexes are rendered in UTC)."""
+    suffix = ""
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+        suffix = "+00:00"
+    stamps = np.datetime_as_string(index.to_numpy(dtype="datetime64[s]"), unit="s")
+    return [s + suffix for s in stamps.tolist()] if suffix else stamps.tolist()
+
+
+def ndjson_lines(
+    header: dict,
+    index: pd.DatetimeIndex,
+    equity: np.ndarray,
+    chunk_size: int = 10_000,
+) -> Iterator[bytes]:
+    """
+    Streamed equity curve: one JSON header line (summary/benchmarks/config/trades), then one
+    ``{"ts": ..., "equity": ...}`` line per bar, yielded ``chunk_size`` lines at a time.
+    """
+    yield (json.dumps({**header, "points": len(equity)}) + "\n").encode()
+    for i in range(0, len(equity), chunk_size):
+        stamps = iso_timestamps(index[i : i + chunk_size])
+        values = np.asarray(equity[i : i + chunk_size], dtype=float).tolist()
+        yield "".join(
+            f'{{"ts":"{ts}","equity":{v!r}}}\n' for ts, v in zip(stamps, values, strict=True)
+        ).encode()
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+from backend.engine.cache import LRUCache
+
+# Bump when the response shape or engine semantics change, so old disk entries are ignored.
+RESULT_CACHE_VERSION = "1"
+
+log = logging.getLogger(__name__)
+
+
+def result_key(req: BaseModel, data_version: str, variant: str = "") -> str:
+    """Canonical hash of a request body + the data it ran on (also used as the ETag)."""
+    canonical = json.dumps(
+        {
+            "v": RESULT_CACHE_VERSION,
+            "kind": type(req).__name__,
+            "request": req.model_dump(mode="json"),
+            "data": data_version,
+            "variant": variant,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 9110 If-None-Match comparison (weak, so W/ prefixes are ignored)."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag.strip('"') == etag:
+            return True
+    return False
+
+
+class ResultCache:
+    """
+    Two-tier cache of serialized responses keyed by result_key().
+
+    - memory: LRUCache bounded by bytes
+    - disk (optional): one file per key under ``disk_dir``, bounded by ``disk_max_bytes``
+      (oldest files removed first); disk hits are promoted to memory. The directory is
+      scanned on the first write and then only when the running size total crosses the
+      budget. Disk errors are logged and treated as misses; they never fail a request.
+    - entries older than ``ttl_seconds`` are treated as misses in both tiers
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 3600.0,
+        disk_dir: Optional[Path] = None,
+        disk_max_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.ttl_seconds = float(ttl_seconds)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_bytes = int(disk_max_bytes)
+        self._memory = LRUCache(max_bytes=max_bytes)
+        self.disk_hits = 0
+        self._disk_lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None    # running total; None until the first scan
+
+    @classmethod
+    def from_env(cls) -> "ResultCache":
+        """
+        ALGOTRADE_RESULT_CACHE_MB (memory budget, default 64; 0 disables),
+        ALGOTRADE_RESULT_CACHE_TTL (seconds, default 3600),
+        ALGOTRADE_RESULT_CACHE_DIR (enables the disk tier),
+        ALGOTRADE_RESULT_CACHE_DISK_MB (disk budget, default 512).
+        """
+        disk_dir = os.environ.get("ALGOTRADE_RESULT_CACHE_DIR")
+        return cls(
+            max_bytes=int(float(os.environ.get("ALGOTRADE_RESULT_CACHE_MB", 64)) * 1024 * 1024),
+            ttl_seconds=float(os.environ.get("ALGOTRADE_RESULT_CACHE_TTL", 3600)),
+            disk_dir=Path(disk_dir) if disk_dir else None,
+            disk_max_bytes=int(
+                float(os.environ.get("ALGOTRADE_RESULT_CACHE_DISK_MB", 512)) * 1024 * 1024
+            ),
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            created, payload = entry
+            if time.time() - created <= self.ttl_seconds:
+                return payload
+            self._memory.invalidate(key)
+
+        path = self._disk_path(key)
+        if path is None:
+            return None
+        try:
+            created = path.stat().st_mtime
+            if time.time() - created > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                return None
+            payload = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            log.warning("result cache: reading %s failed: %s", path, e)
+            return None
+        self.disk_hits += 1
+        self._memory.put(key, (created, payload), len(payload))
+        return payload
+
+    def put(self, key: str, payload: bytes) -> None:
+        now = time.time()
+        self._memory.put(key, (now, payload), len(payload))
+
+        path = self._disk_path(key)
+        if path is None:
+            return
+        try:
+            self._write_disk(path, payload)
+        except OSError as e:
+            log.warning("result cache: writing %s failed: %s", path, e)
+
+    def discard(self, key: str) -> None:
+        """Drop one entry from both tiers."""
+        self._memory.invalidate(key)
+        path = self._disk_path(key)
+        if path is not None:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                log.warning("result cache: removing %s failed: %s", path, e)
+
+    def clear(self) -> None:
+        self._memory.clear()
+        if self.disk_dir is not None and self.disk_dir.exists():
+            for p in self.disk_dir.glob("*.json"):
+                p.unlink(missing_ok=True)
+            with self._disk_lock:
+                self._disk_bytes = None
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._memory.stats(), "disk_hits": self.disk_hits}
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        return self.disk_dir / f"{key}.json" if self.disk_dir is not None else None
+
+    def _write_disk(self, path: Path, payload: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # unique per write: concurrent identical requests each rename their own file
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+        try:
+            tmp.write_bytes(payload)
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+        with self._disk_lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += len(payload) - replaced
+                if self._disk_bytes <= self.disk_max_bytes:
+                    return
+            # first write (files from earlier runs uncounted) or over budget: rescan + trim
+            self._disk_bytes = self._trim_disk()
+
+    def _trim_disk(self) -> int:
+        """Remove the oldest files until under budget; returns the bytes left on disk."""
+        files = []
+        for p in self.disk_dir.glob("*.json"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in files)
+        for _, size, p in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+        return total
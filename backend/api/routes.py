@@ -1,54 +1,159 @@
 from __future__ import annotations
 
 import traceback
-from fastapi import APIRouter, HTTPException
+from typing import Callable, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 import pandas as pd
 
+from backend import telemetry
+from backend.api.responses import (
+    ARROW_STREAM,
+    NDJSON,
+    accepts,
+    iso_timestamps,
+    ndjson_lines,
+)
+from backend.api.result_cache import ResultCache, etag_matches, result_key
 from backend.api.schemas import (
     BacktestRequest,
+    BatchItem,
+    BatchRequest,
+    BatchResponse,
     BacktestResponse,
     BacktestSummary,
     Benchmarks,
-    ConfigEcho,
+    ChartRequest,
+    ChartResponse,
+    ChartSeries,
+    PortfolioRequest,
+    PortfolioResponse,
+    RobustnessRequest,
+    RobustnessResponse,
+    StrategyInfo,
+    SweepRequest,
+    SweepResponse,
+    SweepRow,
     Trade,
+    WalkForwardRequest,
+    WalkForwardResponse,
+    WalkForwardWindowResult,
 )
 
 router = APIRouter()
 
+# Serialized /backtest responses keyed by request + data fingerprint (see result_cache.py)
+RESULT_CACHE = ResultCache.from_env()
+
+# Long engine loops report progress(done, total) through this. Over HTTP it is None;
+# backend.api.jobs passes jobs.progress when it runs a handler as a background job.
+ProgressFn = Callable[[float, float], None]
+
+
+async def _no_progress() -> Optional[ProgressFn]:
+    return None
+
+
+@router.get("/strategies", response_model=List[StrategyInfo])
+def list_strategies() -> List[StrategyInfo]:
+    """Registered strategies with their parameter schema and default warm-up."""
+    from backend.engine.strategies import STRATEGIES
+
+    return [
+        StrategyInfo(
+            name=spec.name,
+            description=spec.description,
+            params=[
+                {
+                    "name": p.name,
+                    "type": p.type.__name__,
+                    "default": p.default,
+                    "ge": p.ge,
+                    "le": p.le,
+                    "description": p.description,
+                }
+                for p in spec.params
+            ],
+            default_lookback=spec.warmup_bars({}),
+        )
+        for spec in STRATEGIES.values()
+    ]
+
 
 @router.post("/backtest", response_model=BacktestResponse)
-def run_backtest(req: BacktestRequest) -> BacktestResponse:
-    """Main backtest endpoint with internal error handling for debugging."""
+def run_backtest(
+    req: BacktestRequest,
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+    equity_dtype: Literal["float64", "float32"] = Query(
+        "float64", description="Equity precision for Arrow responses"
+    ),
+) -> Response:
+    """
+    Main backtest endpoint with internal error handling for debugging.
+
+    Results are deterministic given the request and the data snapshot, so responses carry an
+    ETag (request hash + data fingerprint) and are served from RESULT_CACHE when possible;
+    a matching If-None-Match returns 304 without re-running the backtest.
+
+    ``Accept: application/x-ndjson`` streams the result instead: a header line, then one
+    timestamped equity point per line (honours ``max_points`` too).
+
+    ``Accept: application/vnd.apache.arrow.stream`` returns Arrow IPC sections "equity"
+    (ts, equity) and "trades" (columnar trade log) with summary/benchmarks/config as JSON
+    schema metadata; no pydantic models are built on that path.
+    """
 
     try:
         # Lazy imports so we can pinpoint if a submodule fails
-        from backend.engine.data import fetch_ohlc
-        from backend.engine.strategies.sma import generate_signals_sma
-        from backend.engine.backtester import simulate_long_only
+        from backend.engine.data import fetch_ohlc_with_warmup, frame_fingerprint
+        from backend.engine.strategies import build_signal, get_strategy
+        from backend.engine.backtester import simulate_long_only, trim_warmup
+        from backend.engine.downsample import minmax_indices
         from backend.engine.metrics import compute_metrics, compute_buy_and_hold
     except Exception as e:
         tb = traceback.format_exc()
         raise HTTPException(status_code=500, detail=f"Import failed: {e}\n{tb}")
 
-    # --- 1. Fetch data
+    stream = accepts(accept, NDJSON)
+    binary = accepts(accept, ARROW_STREAM)
+
+    # --- 1. Fetch data (plus the strategy's declared warm-up before start)
     try:
-        df = fetch_ohlc(req.symbol, start=req.start, end=req.end)
+        lookback = get_strategy(req.strategy).warmup_bars(req.params)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid strategy params: {e}")
+    try:
+        df, warmup = fetch_ohlc_with_warmup(req.symbol, req.start, req.end, lookback)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Data fetch failed: {e}")
 
     if df.empty:
         raise HTTPException(status_code=400, detail="No data returned for symbol.")
+    telemetry.lap("fetch")
+    telemetry.observe_bars(len(df))
+
+    headers = {}
+    if not (stream or binary):
+        etag = result_key(req, frame_fingerprint(df))
+        headers = {
+            "ETag": f'"{etag}"',
+            "Cache-Control": f"private, max-age={int(RESULT_CACHE.ttl_seconds)}",
+        }
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        cached = RESULT_CACHE.get(etag)
+        telemetry.lap("result_cache")
+        if cached is not None:
+            return Response(content=cached, media_type="application/json", headers=headers)
 
     # --- 2. Build signals
     try:
-        if req.strategy == "sma_crossover":
-            fast = int(req.params.get("fast", 10))
-            slow = int(req.params.get("slow", 30))
-            signal = generate_signals_sma(df, fast=fast, slow=slow)
-        else:
-            raise HTTPException(status_code=400, detail=f"Unsupported strategy: {req.strategy}")
+        signal = build_signal(df, req.strategy, req.params)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Signal generation failed: {e}")
+    telemetry.lap("signal")
 
     # --- 3. Run backtest
     try:
@@ -58,37 +163,532 @@ def run_backtest(req: BacktestRequest) -> BacktestResponse:
             cost_bps=req.cost_bps,
             slippage_bps=req.slippage_bps,
         )
+        out = trim_warmup(out, df, signal, warmup)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Backtest simulation failed: {e}")
+    telemetry.lap("simulate")
 
-    # --- 4. Compute metrics
+    # --- 4. Compute metrics (requested range only)
+    bars = df.iloc[warmup:]
     try:
-        equity = pd.Series(out.equity_curve, index=df.index[: len(out.equity_curve)])
+        equity = pd.Series(out.equity_curve, index=bars.index[: len(out.equity_curve)])
         metrics = compute_metrics(equity, rf_rate_pct=req.rf_rate_pct)
-        bh_return = compute_buy_and_hold(df)
+        bh_return = compute_buy_and_hold(bars)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Metrics computation failed: {e}")
+    telemetry.lap("metrics")
+
+    summary = {**metrics, "trades": len(out.trade_log)}
+    benchmarks = _benchmarks(req, bh_return)
+    config = _config_echo(req)
 
-    summary = BacktestSummary(**metrics, trades=len(out.trades))
+    # --- 5. Build response (optionally downsampled / streamed / binary)
+    if req.max_points:
+        equity = equity.iloc[minmax_indices(equity.to_numpy(), req.max_points)]
+
+    if binary:
+        from backend.api.arrow import encode_sections, equity_table, trades_table
+
+        body = encode_sections(
+            {
+                "equity": equity_table(
+                    equity.index, equity.to_numpy(), float32=equity_dtype == "float32"
+                ),
+                "trades": trades_table(out.trade_log),
+            },
+            extras={"summary": summary, "benchmarks": benchmarks, "config": config},
+        )
+        telemetry.lap("serialize")
+        return Response(content=body, media_type=ARROW_STREAM)
 
-    # --- 5. Build response
-    return BacktestResponse(
+    if stream:
+        header = {
+            "summary": summary,
+            "benchmarks": benchmarks,
+            "config": config,
+            "trades": out.trades,
+        }
+        telemetry.lap("serialize")  # lines are encoded while streaming, after the header
+        return StreamingResponse(
+            ndjson_lines(header, equity.index, equity.to_numpy()), media_type=NDJSON
+        )
+
+    response = BacktestResponse(
         summary=summary,
-        equity_curve=out.equity_curve,
+        equity_curve=equity.tolist(),
+        equity_timestamps=iso_timestamps(equity.index) if req.max_points else None,
+        trades=[Trade(**t) for t in out.trades],
+        benchmarks=benchmarks,
+        config=config,
+    )
+    payload = response.model_dump_json().encode()
+    RESULT_CACHE.put(etag, payload)
+    telemetry.lap("serialize")
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+
+# Plain dicts (validated into Benchmarks / ConfigEcho only on the JSON path)
+def _benchmarks(req: BacktestRequest, bh_return: float) -> dict:
+    return {
+        "buy_and_hold_return_pct": bh_return,
+        "rf_rate_pct": req.rf_rate_pct,
+        "reference_symbol": req.symbol,
+    }
+
+
+def _config_echo(req: BacktestRequest) -> dict:
+    return {
+        "symbol": req.symbol,
+        "start": str(req.start) if req.start else None,
+        "end": str(req.end) if req.end else None,
+        "strategy": req.strategy,
+        "params": req.params,
+        "cost_bps": req.cost_bps,
+        "slippage_bps": req.slippage_bps,
+        "rf_rate_pct": req.rf_rate_pct,
+    }
+
+
+@router.post("/backtest/chart", response_model=ChartResponse)
+def run_chart(req: ChartRequest, if_none_match: Optional[str] = Header(None)) -> Response:
+    """
+    Plot-ready series for one backtest: Close, the strategy's indicators, the equity curve
+    and the trade markers, aligned on the same downsampled timestamps, plus the summary and
+    benchmarks, so a dashboard renders a whole backtest from this one call.
+
+    Frames and indicators come from the backend's caches (fetch_ohlc, the shared indicator
+    store the signal itself used); min/max bucketing on Close keeps price peaks and troughs
+    visible. Like /backtest, responses carry an ETag and are served from RESULT_CACHE.
+    """
+    try:
+        from backend.engine.data import fetch_ohlc_with_warmup, frame_fingerprint
+        from backend.engine.strategies import build_signal, get_strategy
+        from backend.engine.backtester import simulate_long_only, trim_warmup
+        from backend.engine.downsample import minmax_indices
+        from backend.engine.metrics import compute_metrics, compute_buy_and_hold
+    except Exception as e:
+        tb = traceback.format_exc()
+        raise HTTPException(status_code=500, detail=f"Import failed: {e}\n{tb}")
+
+    try:
+        spec = get_strategy(req.strategy)
+        lookback = spec.warmup_bars(req.params)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid strategy params: {e}")
+    try:
+        df, warmup = fetch_ohlc_with_warmup(req.symbol, req.start, req.end, lookback)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Data fetch failed: {e}")
+
+    if df.empty:
+        raise HTTPException(status_code=400, detail="No data returned for symbol.")
+    telemetry.lap("fetch")
+
+    etag = result_key(req, frame_fingerprint(df))
+    headers = {
+        "ETag": f'"{etag}"',
+        "Cache-Control": f"private, max-age={int(RESULT_CACHE.ttl_seconds)}",
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    cached = RESULT_CACHE.get(etag)
+    telemetry.lap("result_cache")
+    if cached is not None:
+        return Response(content=cached, media_type="application/json", headers=headers)
+
+    try:
+        signal = build_signal(df, req.strategy, req.params)
+        indicators = spec.indicator_values(df["Close"].to_numpy(), req.params)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Signal generation failed: {e}")
+    telemetry.lap("signal")
+
+    try:
+        out = simulate_long_only(
+            df,
+            signal,
+            cost_bps=req.cost_bps,
+            slippage_bps=req.slippage_bps,
+        )
+        out = trim_warmup(out, df, signal, warmup)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Backtest simulation failed: {e}")
+    telemetry.lap("simulate")
+
+    bars = df.iloc[warmup:]
+    try:
+        equity = pd.Series(out.equity_curve, index=bars.index[: len(out.equity_curve)])
+        metrics = compute_metrics(equity, rf_rate_pct=req.rf_rate_pct)
+        bh_return = compute_buy_and_hold(bars)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Metrics computation failed: {e}")
+    telemetry.lap("metrics")
+
+    close = bars["Close"].to_numpy(dtype=float)
+    keep = minmax_indices(close, req.max_points)
+    response = ChartResponse(
+        timestamps=iso_timestamps(bars.index[keep]),
+        close=close[keep].tolist(),
+        equity=equity.to_numpy()[keep].tolist(),
+        indicators=[
+            ChartSeries(
+                name=name,
+                pane=spec.indicator_pane,
+                values=[None if v != v else v for v in values[warmup:][keep].tolist()],
+            )
+            for name, values in indicators.items()
+        ],
         trades=[Trade(**t) for t in out.trades],
-        benchmarks=Benchmarks(
-            buy_and_hold_return_pct=bh_return,
+        bars=len(bars),
+        summary={**metrics, "trades": len(out.trade_log)},
+        benchmarks=_benchmarks(req, bh_return),
+        config=_config_echo(req),
+    )
+    payload = response.model_dump_json().encode()
+    RESULT_CACHE.put(etag, payload)
+    telemetry.lap("serialize")
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+
+@router.post("/backtest/sweep", response_model=SweepResponse)
+def run_sweep(
+    req: SweepRequest,
+    accept: Optional[str] = Header(None),
+    progress: Optional[ProgressFn] = Depends(_no_progress),
+) -> SweepResponse:
+    """
+    Evaluate a whole fast/slow SMA grid on one data fetch, ranked by ``rank_by``.
+    ``Accept: application/vnd.apache.arrow.stream`` returns the ranked table as Arrow
+    (section "results").
+    """
+
+    try:
+        from backend.engine.data import fetch_ohlc
+        from backend.engine.backtester import sweep_sma_crossover
+    except Exception as e:
+        tb = traceback.format_exc()
+        raise HTTPException(status_code=500, detail=f"Import failed: {e}\n{tb}")
+
+    # --- 1. Fetch data (once for the whole grid)
+    try:
+        df = fetch_ohlc(req.symbol, start=req.start, end=req.end)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Data fetch failed: {e}")
+
+    if df.empty:
+        raise HTTPException(status_code=400, detail="No data returned for symbol.")
+
+    # --- 2. Simulate every combination
+    try:
+        table = sweep_sma_crossover(
+            df,
+            fasts=req.fast.values(),
+            slows=req.slow.values(),
+            cost_bps=req.cost_bps,
+            slippage_bps=req.slippage_bps,
             rf_rate_pct=req.rf_rate_pct,
-            reference_symbol=req.symbol,
-        ),
-        config=ConfigEcho(
-            symbol=req.symbol,
-            start=str(req.start) if req.start else None,
-            end=str(req.end) if req.end else None,
+            rank_by=req.rank_by,
+            progress=progress,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Parameter sweep failed: {e}")
+
+    # --- 3. Build response
+    ranked = table.head(req.top_n) if req.top_n else table
+    if accepts(accept, ARROW_STREAM):
+        import pyarrow as pa
+        from backend.api.arrow import encode_sections
+
+        body = encode_sections(
+            {"results": pa.Table.from_pandas(ranked, preserve_index=False)},
+            extras={"symbol": req.symbol, "bars": len(df), "evaluated": len(table)},
+        )
+        return Response(content=body, media_type=ARROW_STREAM)
+
+    return SweepResponse(
+        symbol=req.symbol,
+        bars=len(df),
+        evaluated=len(table),
+        rank_by=req.rank_by,
+        results=[SweepRow(**row) for row in ranked.to_dict(orient="records")],
+    )
+
+
+@router.post("/backtest/walkforward", response_model=WalkForwardResponse)
+def run_walkforward(
+    req: WalkForwardRequest,
+    progress: Optional[ProgressFn] = Depends(_no_progress),
+) -> WalkForwardResponse:
+    """
+    Walk-forward optimization: best ``grid`` params on each train window, traded on the next
+    test window. Returns the stitched out-of-sample curve and per-window choices.
+    """
+
+    try:
+        from backend.engine.data import fetch_ohlc
+        from backend.engine.metrics import compute_metrics
+        from backend.engine.walkforward import walk_forward
+    except Exception as e:
+        tb = traceback.format_exc()
+        raise HTTPException(status_code=500, detail=f"Import failed: {e}\n{tb}")
+
+    # --- 1. Fetch data (once for every window)
+    try:
+        df = fetch_ohlc(req.symbol, start=req.start, end=req.end)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Data fetch failed: {e}")
+
+    if df.empty:
+        raise HTTPException(status_code=400, detail="No data returned for symbol.")
+
+    # --- 2. Optimize / evaluate every window
+    try:
+        out = walk_forward(
+            df,
             strategy=req.strategy,
-            params=req.params,
+            grid=req.grid,
+            train_bars=req.train_bars,
+            test_bars=req.test_bars,
+            anchored=req.anchored,
+            objective=req.objective,
+            cost_bps=req.cost_bps,
+            slippage_bps=req.slippage_bps,
+            rf_rate_pct=req.rf_rate_pct,
+            progress=progress,
+        )
+        metrics = compute_metrics(out.equity, rf_rate_pct=req.rf_rate_pct)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Walk-forward failed: {e}")
+
+    # --- 3. Build response
+    windows = [
+        WalkForwardWindowResult(
+            train_start=w.train_start.isoformat(),
+            train_end=w.train_end.isoformat(),
+            test_start=w.test_start.isoformat(),
+            test_end=w.test_end.isoformat(),
+            params=w.params,
+            train={k: None if pd.isna(v) else v for k, v in w.train_metrics.items()},
+            test=BacktestSummary(**w.test_metrics, trades=w.trades),
+        )
+        for w in out.windows
+    ]
+    return WalkForwardResponse(
+        symbol=req.symbol,
+        bars=len(df),
+        combinations=out.combinations,
+        objective=req.objective,
+        summary=BacktestSummary(**metrics, trades=out.trades),
+        equity_curve=out.equity.tolist(),
+        equity_timestamps=iso_timestamps(out.equity.index),
+        windows=windows,
+    )
+
+
+@router.post("/backtest/portfolio", response_model=PortfolioResponse)
+def run_portfolio(req: PortfolioRequest) -> PortfolioResponse:
+    """
+    Backtest one portfolio of target weights over many symbols on a shared calendar.
+    Optional ``strategy`` gates each symbol's weight with its own signal.
+    """
+
+    try:
+        from backend.engine.data import fetch_ohlc
+        from backend.engine.metrics import compute_metrics
+        from backend.engine.portfolio import (
+            align_closes,
+            signal_matrix,
+            simulate_portfolio,
+            static_weights,
+        )
+        from backend.engine.strategies import build_signal
+    except Exception as e:
+        tb = traceback.format_exc()
+        raise HTTPException(status_code=500, detail=f"Import failed: {e}\n{tb}")
+
+    # --- 1. Fetch data
+    frames = {}
+    for symbol in dict.fromkeys(req.symbols):
+        try:
+            frames[symbol] = fetch_ohlc(symbol, start=req.start, end=req.end)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Data fetch failed for {symbol}: {e}")
+
+    # --- 2. Align prices and build the target-weights matrix
+    try:
+        prices = align_closes(frames)
+        weights = static_weights(prices, req.weights)
+        if req.strategy:
+            signals = {s: build_signal(df, req.strategy, req.params) for s, df in frames.items()}
+            weights = weights * signal_matrix(prices, signals)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Portfolio setup failed: {e}")
+
+    # --- 3. Simulate and compute metrics on the combined equity
+    try:
+        out = simulate_portfolio(
+            prices.close,
+            weights,
             cost_bps=req.cost_bps,
             slippage_bps=req.slippage_bps,
+            index=prices.index,
+            symbols=prices.symbols,
+        )
+        metrics = compute_metrics(out.equity_series(), rf_rate_pct=req.rf_rate_pct)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Portfolio simulation failed: {e}")
+
+    # --- 4. Build response
+    return PortfolioResponse(
+        symbols=prices.symbols,
+        bars=len(prices.index),
+        summary=BacktestSummary(**metrics, trades=out.trades),
+        equity_curve=out.equity.tolist(),
+        equity_timestamps=iso_timestamps(prices.index),
+        contributions_pct={s: round(v * 100, 2) for s, v in out.contribution_totals().items()},
+        turnover=round(float(out.turnover.sum()), 4),
+        costs_pct=round(float(out.costs.sum()) * 100, 4),
+    )
+
+
+@router.post("/backtest/robustness", response_model=RobustnessResponse)
+def run_robustness(
+    req: RobustnessRequest,
+    progress: Optional[ProgressFn] = Depends(_no_progress),
+) -> RobustnessResponse:
+    """
+    Run one backtest, then score ``n_paths`` resampled histories of its net returns
+    (block bootstrap or trade shuffle) for Sharpe / drawdown / return intervals.
+    """
+
+    try:
+        from backend.engine.data import fetch_ohlc_with_warmup
+        from backend.engine.strategies import build_signal, get_strategy
+        from backend.engine.backtester import simulate_long_only, trim_warmup
+        from backend.engine.metrics import compute_metrics
+        from backend.engine.robustness import resample_metrics
+    except Exception as e:
+        tb = traceback.format_exc()
+        raise HTTPException(status_code=500, detail=f"Import failed: {e}\n{tb}")
+
+    # --- 1. Fetch data (plus warm-up)
+    try:
+        lookback = get_strategy(req.strategy).warmup_bars(req.params)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid strategy params: {e}")
+    try:
+        df, warmup = fetch_ohlc_with_warmup(req.symbol, req.start, req.end, lookback)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Data fetch failed: {e}")
+
+    if df.empty:
+        raise HTTPException(status_code=400, detail="No data returned for symbol.")
+
+    # --- 2. Historical backtest
+    try:
+        signal = build_signal(df, req.strategy, req.params)
+        out = simulate_long_only(df, signal, cost_bps=req.cost_bps, slippage_bps=req.slippage_bps)
+        out = trim_warmup(out, df, signal, warmup)
+        bars = df.iloc[warmup:]
+        equity = pd.Series(out.equity_curve, index=bars.index[: len(out.equity_curve)])
+        metrics = compute_metrics(equity, rf_rate_pct=req.rf_rate_pct)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Backtest simulation failed: {e}")
+
+    # --- 3. Resample the per-bar returns the metrics were computed from
+    try:
+        curve = equity.to_numpy()
+        res = resample_metrics(
+            curve[1:] / curve[:-1] - 1,
+            method=req.method,
+            n_paths=req.n_paths,
+            block=req.block_bars,
+            signal=signal.to_numpy()[warmup + 1 :],
+            seed=req.seed,
             rf_rate_pct=req.rf_rate_pct,
-        ),
+            progress=progress,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Resampling failed: {e}")
+
+    return RobustnessResponse(
+        symbol=req.symbol,
+        bars=len(bars),
+        method=req.method,
+        n_paths=req.n_paths,
+        block_bars=res.block,
+        confidence=req.confidence,
+        summary=BacktestSummary(**metrics, trades=len(out.trade_log)),
+        metrics=res.summary(metrics, confidence=req.confidence),
+    )
+
+
+@router.post("/backtest/batch", response_model=BatchResponse)
+def run_batch_backtest(
+    req: BatchRequest,
+    accept: Optional[str] = Header(None),
+    progress: Optional[ProgressFn] = Depends(_no_progress),
+) -> BatchResponse:
+    """
+    Run one strategy config over many symbols on a process pool; failures are per symbol.
+    ``Accept: application/vnd.apache.arrow.stream`` returns sections "results" (one row per
+    symbol: summary metrics, buy-and-hold, bars) and "errors" (symbol, error).
+    """
+
+    try:
+        from backend.engine.batch import BatchConfig, run_batch
+    except Exception as e:
+        tb = traceback.format_exc()
+        raise HTTPException(status_code=500, detail=f"Import failed: {e}\n{tb}")
+
+    config = BatchConfig(
+        strategy=req.strategy,
+        params=req.params,
+        start=req.start,
+        end=req.end,
+        cost_bps=req.cost_bps,
+        slippage_bps=req.slippage_bps,
+        rf_rate_pct=req.rf_rate_pct,
+    )
+    try:
+        out = run_batch(req.symbols, config, max_workers=req.max_workers, progress=progress)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Batch backtest failed: {e}")
+
+    if accepts(accept, ARROW_STREAM):
+        from backend.api.arrow import encode_sections, records_table
+
+        rows = [
+            {
+                "symbol": symbol,
+                **res["summary"],
+                "buy_and_hold_return_pct": res["buy_and_hold_return_pct"],
+                "bars": res["bars"],
+            }
+            for symbol, res in out.results.items()
+        ]
+        errors = [{"symbol": symbol, "error": msg} for symbol, msg in out.errors.items()]
+        body = encode_sections(
+            {
+                "results": records_table(rows, columns=list(rows[0]) if rows else ["symbol"]),
+                "errors": records_table(errors, columns=["symbol", "error"]),
+            },
+            extras={"rf_rate_pct": req.rf_rate_pct},
+        )
+        return Response(content=body, media_type=ARROW_STREAM)
+
+    return BatchResponse(
+        results={
+            symbol: BatchItem(
+                summary=BacktestSummary(**res["summary"]),
+                benchmarks=Benchmarks(
+                    buy_and_hold_return_pct=res["buy_and_hold_return_pct"],
+                    rf_rate_pct=req.rf_rate_pct,
+                    reference_symbol=symbol,
+                ),
+                bars=res["bars"],
+            )
+            for symbol, res in out.results.items()
+        },
+        errors=out.errors,
     )
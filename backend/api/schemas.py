@@ -1,13 +1,52 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Dict, List, Literal, Optional
+from typing import Annotated, Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import AfterValidator, BaseModel, Field, field_validator
 
+from backend.engine.strategies import available_strategies
 
-# ---- Strategy enum -----------------------------------------------------------
-StrategyName = Literal["sma_crossover", "rsi"]
+
+# ---- Strategy name (any strategy in the engine's registry) -----------------------
+def _check_strategy(v: str) -> str:
+    if v not in available_strategies():
+        raise ValueError(f"Unknown strategy {v!r}; available: {available_strategies()}")
+    return v
+
+
+StrategyName = Annotated[
+    str,
+    AfterValidator(_check_strategy),
+    Field(examples=["sma_crossover", "rsi"], description="See GET /strategies"),
+]
+
+# ---- Metric keys (usable as ranking objectives) ------------------------------
+MetricName = Literal["ann_return_pct", "ann_vol_pct", "sharpe", "max_drawdown_pct", "win_rate_pct"]
+
+
+def _check_end_after_start(v: Optional[date], info) -> Optional[date]:
+    start = info.data.get("start")
+    if v and start and v <= start:
+        raise ValueError("end must be after start (note: end is exclusive).")
+    return v
+
+
+# ---- Strategy catalogue (GET /strategies) ---------------------------------------
+class StrategyParam(BaseModel):
+    name: str
+    type: Literal["int", "float"]
+    default: float
+    ge: Optional[float] = None
+    le: Optional[float] = None
+    description: str = ""
+
+
+class StrategyInfo(BaseModel):
+    name: str
+    description: str
+    params: List[StrategyParam]
+    default_lookback: int = Field(..., description="Warm-up bars loaded before start (defaults)")
 
 
 # ---- Request ----------------------------------------------------------------
@@ -31,13 +70,18 @@ class BacktestRequest(BaseModel):
         0.0, description="Annualized risk-free rate in percent (e.g. 3.5 for 3.5%)"
     )
 
+    # Response shaping
+    max_points: Optional[int] = Field(
+        None,
+        ge=4,
+        description="Downsample the returned equity curve to at most this many points "
+        "(min/max bucketing; metrics are always computed on the full curve)",
+    )
+
     @field_validator("end")
     @classmethod
     def _validate_dates(cls, v: Optional[date], info):
-        start = info.data.get("start")
-        if v and start and v <= start:
-            raise ValueError("end must be after start (note: end is exclusive).")
-        return v
+        return _check_end_after_start(v, info)
 
 
 # ---- Trade log item ----------------------------------------------------------
@@ -83,6 +127,341 @@ class ConfigEcho(BaseModel):
 class BacktestResponse(BaseModel):
     summary: BacktestSummary
     equity_curve: List[float] = Field(..., description="Cumulative equity series, 1.0 = start")
+    equity_timestamps: Optional[List[str]] = Field(
+        None, description="Timestamps of equity_curve points (only when downsampled)"
+    )
     trades: List[Trade] = Field(default_factory=list)
     benchmarks: Benchmarks
     config: ConfigEcho
+
+
+# ---- Chart data (POST /backtest/chart) ---------------------------------------
+class ChartRequest(BacktestRequest):
+    """Same inputs as /backtest; the series come back downsampled to ``max_points``."""
+    max_points: int = Field(
+        1000,
+        ge=4,
+        description="Points per series (min/max bucketing on Close; all series share them)",
+    )
+
+
+class ChartSeries(BaseModel):
+    name: str = Field(..., examples=["SMA 10", "RSI 14"])
+    pane: Literal["price", "separate"] = Field(
+        ..., description="Plot over the price (same scale) or in a panel of its own"
+    )
+    values: List[Optional[float]] = Field(
+        ..., description="One value per timestamp; null where the indicator is undefined"
+    )
+
+
+class ChartResponse(BaseModel):
+    timestamps: List[str] = Field(..., description="ISO 8601 bar timestamps (downsampled)")
+    close: List[float]
+    equity: List[float] = Field(..., description="Equity (1.0 = start) at each timestamp")
+    indicators: List[ChartSeries] = Field(default_factory=list)
+    trades: List[Trade] = Field(default_factory=list, description="Every fill in the range")
+    bars: int = Field(..., description="Bars in the requested range before downsampling")
+    summary: BacktestSummary = Field(..., description="Metrics over the full, undownsampled run")
+    benchmarks: Benchmarks
+    config: ConfigEcho
+
+
+# ---- Parameter sweep ---------------------------------------------------------
+class ParamRange(BaseModel):
+    """Inclusive integer range: start, start+step, ..., up to stop."""
+    start: int = Field(..., ge=1)
+    stop: int = Field(..., ge=1, description="Inclusive upper bound")
+    step: int = Field(1, ge=1)
+
+    @field_validator("stop")
+    @classmethod
+    def _validate_stop(cls, v: int, info):
+        start = info.data.get("start")
+        if start is not None and v < start:
+            raise ValueError("stop must be >= start.")
+        return v
+
+    def values(self) -> List[int]:
+        return list(range(self.start, self.stop + 1, self.step))
+
+    def count(self) -> int:
+        return len(range(self.start, self.stop + 1, self.step))
+
+
+# One request's grid is simulated synchronously; bigger searches are split by the client.
+MAX_SWEEP_COMBINATIONS = 5000
+
+
+class SweepRequest(BaseModel):
+    """
+    Input contract for POST /backtest/sweep (SMA crossover grid search)
+    """
+    symbol: str = Field(..., examples=["AAPL", "MSFT", "EURUSD=X"])
+    start: Optional[date] = Field(None, description="Inclusive start date (YYYY-MM-DD)")
+    end: Optional[date] = Field(None, description="Exclusive end date (YYYY-MM-DD)")
+    strategy: Literal["sma_crossover"] = "sma_crossover"
+    fast: ParamRange = Field(..., examples=[{"start": 5, "stop": 50, "step": 5}])
+    slow: ParamRange = Field(..., examples=[{"start": 20, "stop": 200, "step": 10}])
+
+    cost_bps: float = Field(0.0, ge=0, description="Per trade cost in basis points (0.05% = 5)")
+    slippage_bps: float = Field(0.0, ge=0, description="Assumed slippage in bps applied on fills")
+    rf_rate_pct: float = Field(
+        0.0, description="Annualized risk-free rate in percent (e.g. 3.5 for 3.5%)"
+    )
+
+    rank_by: MetricName = Field("sharpe", description="Metric to rank by (higher is better)")
+    top_n: Optional[int] = Field(None, ge=1, description="Return only the best N combinations")
+
+    @field_validator("end")
+    @classmethod
+    def _validate_dates(cls, v: Optional[date], info):
+        return _check_end_after_start(v, info)
+
+    @field_validator("slow")
+    @classmethod
+    def _validate_grid_size(cls, v: ParamRange, info):
+        fast = info.data.get("fast")
+        if fast is not None and fast.count() * v.count() > MAX_SWEEP_COMBINATIONS:
+            raise ValueError(
+                f"Grid has {fast.count() * v.count()} (fast, slow) combinations; "
+                f"at most {MAX_SWEEP_COMBINATIONS} per request."
+            )
+        return v
+
+
+class SweepRow(BacktestSummary):
+    fast: int
+    slow: int
+
+
+class SweepResponse(BaseModel):
+    symbol: str
+    bars: int
+    evaluated: int = Field(..., description="Number of (fast, slow) combinations simulated")
+    rank_by: MetricName
+    results: List[SweepRow] = Field(default_factory=list, description="Best combination first")
+
+
+# ---- Walk-forward optimization ----------------------------------------------------
+class WalkForwardRequest(BaseModel):
+    """
+    Input contract for POST /backtest/walkforward
+    """
+    symbol: str = Field(..., examples=["AAPL", "MSFT", "EURUSD=X"])
+    start: Optional[date] = Field(None, description="Inclusive start date (YYYY-MM-DD)")
+    end: Optional[date] = Field(None, description="Exclusive end date (YYYY-MM-DD)")
+    strategy: StrategyName
+    grid: Dict[str, List[float]] = Field(
+        ...,
+        description="Candidate values per param; every combination is scored",
+        examples=[{"fast": [5, 10, 20], "slow": [50, 100, 150]}],
+    )
+    train_bars: int = Field(..., ge=2, description="Bars per optimization (in-sample) window")
+    test_bars: int = Field(..., ge=2, description="Bars per out-of-sample window (roll step)")
+    anchored: bool = Field(False, description="Grow train windows from the first bar")
+    objective: MetricName = Field("sharpe", description="Metric maximized on each train window")
+
+    cost_bps: float = Field(0.0, ge=0, description="Per trade cost in basis points (0.05% = 5)")
+    slippage_bps: float = Field(0.0, ge=0, description="Assumed slippage in bps applied on fills")
+    rf_rate_pct: float = Field(
+        0.0, description="Annualized risk-free rate in percent (e.g. 3.5 for 3.5%)"
+    )
+
+    @field_validator("end")
+    @classmethod
+    def _validate_dates(cls, v: Optional[date], info):
+        return _check_end_after_start(v, info)
+
+
+class WalkForwardWindowResult(BaseModel):
+    train_start: str
+    train_end: str = Field(..., description="Last train bar (inclusive)")
+    test_start: str
+    test_end: str = Field(..., description="Last test bar (inclusive)")
+    params: Dict[str, float] = Field(..., description="Best params on the train window")
+    train: Dict[str, Optional[float]] = Field(..., description="In-sample metrics of params")
+    test: BacktestSummary = Field(..., description="Out-of-sample metrics of params")
+
+
+class WalkForwardResponse(BaseModel):
+    symbol: str
+    bars: int
+    combinations: int = Field(..., description="Parameter sets scored per train window")
+    objective: MetricName
+    summary: BacktestSummary = Field(..., description="Metrics of the stitched OOS curve")
+    equity_curve: List[float] = Field(..., description="Stitched out-of-sample equity, 1.0 = start")
+    equity_timestamps: List[str]
+    windows: List[WalkForwardWindowResult] = Field(default_factory=list)
+
+
+# ---- Multi-asset portfolio ------------------------------------------------------
+class PortfolioRequest(BaseModel):
+    """
+    Input contract for POST /backtest/portfolio: one combined book over many symbols
+    """
+    symbols: List[str] = Field(..., min_length=1, examples=[["AAPL", "MSFT", "NVDA"]])
+    start: Optional[date] = Field(None, description="Inclusive start date (YYYY-MM-DD)")
+    end: Optional[date] = Field(None, description="Exclusive end date (YYYY-MM-DD)")
+    weights: Optional[Dict[str, float]] = Field(
+        None,
+        description="Target weight per symbol (default: equal weight); may be negative",
+        examples=[{"AAPL": 0.5, "MSFT": 0.3, "NVDA": 0.2}],
+    )
+    strategy: Optional[StrategyName] = Field(
+        None, description="If set, each symbol only holds its weight while its signal is long"
+    )
+    params: Dict[str, float] = Field(default_factory=dict)
+
+    cost_bps: float = Field(0.0, ge=0, description="Per trade cost in basis points (0.05% = 5)")
+    slippage_bps: float = Field(0.0, ge=0, description="Assumed slippage in bps applied on fills")
+    rf_rate_pct: float = Field(
+        0.0, description="Annualized risk-free rate in percent (e.g. 3.5 for 3.5%)"
+    )
+
+    @field_validator("end")
+    @classmethod
+    def _validate_dates(cls, v: Optional[date], info):
+        return _check_end_after_start(v, info)
+
+
+class PortfolioResponse(BaseModel):
+    symbols: List[str]
+    bars: int = Field(..., description="Bars on the shared (union) calendar")
+    summary: BacktestSummary = Field(..., description="Metrics of the combined equity")
+    equity_curve: List[float] = Field(..., description="Combined equity, 1.0 = start")
+    equity_timestamps: List[str]
+    contributions_pct: Dict[str, float] = Field(
+        ..., description="Sum of each symbol's per-bar return contributions, in percent"
+    )
+    turnover: float = Field(..., description="Total traded weight (sum of |weight changes|)")
+    costs_pct: float = Field(..., description="Sum of per-bar frictions, in percent")
+
+
+# ---- Monte Carlo robustness -------------------------------------------------------
+class RobustnessRequest(BaseModel):
+    """
+    Input contract for POST /backtest/robustness: one backtest, then resampled histories
+    """
+    symbol: str = Field(..., examples=["AAPL", "MSFT", "EURUSD=X"])
+    start: Optional[date] = Field(None, description="Inclusive start date (YYYY-MM-DD)")
+    end: Optional[date] = Field(None, description="Exclusive end date (YYYY-MM-DD)")
+    strategy: StrategyName
+    params: Dict[str, float] = Field(default_factory=dict)
+
+    cost_bps: float = Field(0.0, ge=0, description="Per trade cost in basis points (0.05% = 5)")
+    slippage_bps: float = Field(0.0, ge=0, description="Assumed slippage in bps applied on fills")
+    rf_rate_pct: float = Field(
+        0.0, description="Annualized risk-free rate in percent (e.g. 3.5 for 3.5%)"
+    )
+
+    method: Literal["block_bootstrap", "trade_shuffle"] = Field(
+        "block_bootstrap",
+        description="Resample bar returns in circular blocks, or reorder whole trades",
+    )
+    n_paths: int = Field(1000, ge=1, le=100_000, description="Number of resampled histories")
+    block_bars: Optional[int] = Field(
+        None, ge=1, description="Bootstrap block length in bars (default: bars^(1/3))"
+    )
+    confidence: float = Field(0.95, gt=0, lt=1, description="Confidence level of the intervals")
+    seed: Optional[int] = Field(None, ge=0, description="Fix for reproducible paths")
+
+    @field_validator("end")
+    @classmethod
+    def _validate_dates(cls, v: Optional[date], info):
+        return _check_end_after_start(v, info)
+
+
+class MetricDistribution(BaseModel):
+    observed: float = Field(..., description="Value on the historical path")
+    mean: float
+    std: float
+    lower: float = Field(..., description="Lower bound of the confidence interval")
+    upper: float = Field(..., description="Upper bound of the confidence interval")
+    quantiles: Dict[str, float] = Field(..., description="Quantile level -> value")
+    below_observed_pct: float = Field(..., description="Share of paths below the observed value")
+
+
+class RobustnessResponse(BaseModel):
+    symbol: str
+    bars: int
+    method: Literal["block_bootstrap", "trade_shuffle"]
+    n_paths: int
+    block_bars: Optional[int] = None
+    confidence: float
+    summary: BacktestSummary = Field(..., description="Metrics of the historical backtest")
+    metrics: Dict[str, MetricDistribution] = Field(
+        ..., description="sharpe, max_drawdown_pct and ann_return_pct across resampled paths"
+    )
+
+
+# ---- Multi-symbol batch --------------------------------------------------------
+class BatchRequest(BaseModel):
+    """
+    Input contract for POST /backtest/batch: one strategy config over many symbols
+    """
+    symbols: List[str] = Field(..., min_length=1, examples=[["AAPL", "MSFT", "NVDA"]])
+    start: Optional[date] = Field(None, description="Inclusive start date (YYYY-MM-DD)")
+    end: Optional[date] = Field(None, description="Exclusive end date (YYYY-MM-DD)")
+    strategy: StrategyName
+    params: Dict[str, float] = Field(default_factory=dict)
+
+    cost_bps: float = Field(0.0, ge=0, description="Per trade cost in basis points (0.05% = 5)")
+    slippage_bps: float = Field(0.0, ge=0, description="Assumed slippage in bps applied on fills")
+    rf_rate_pct: float = Field(
+        0.0, description="Annualized risk-free rate in percent (e.g. 3.5 for 3.5%)"
+    )
+
+    max_workers: Optional[int] = Field(
+        None,
+        ge=1,
+        description=(
+            "Symbols run in parallel (default and server-side cap: ALGOTRADE_BATCH_WORKERS, "
+            "else one per CPU core)"
+        ),
+    )
+
+    @field_validator("end")
+    @classmethod
+    def _validate_dates(cls, v: Optional[date], info):
+        return _check_end_after_start(v, info)
+
+
+class BatchItem(BaseModel):
+    summary: BacktestSummary
+    benchmarks: Benchmarks
+    bars: int
+
+
+class BatchResponse(BaseModel):
+    results: Dict[str, BatchItem] = Field(default_factory=dict)
+    errors: Dict[str, str] = Field(
+        default_factory=dict, description="Per-symbol failures (symbol -> error message)"
+    )
+
+
+# ---- Background jobs ------------------------------------------------------------
+JobKind = Literal["backtest", "sweep", "walkforward", "portfolio", "robustness", "batch"]
+
+
+class JobRequest(BaseModel):
+    """
+    Input contract for POST /jobs: ``spec`` is the request body of the matching endpoint
+    (/backtest, /backtest/sweep, ...), validated when the job is submitted
+    """
+    kind: JobKind
+    spec: Dict[str, Any] = Field(..., examples=[{"symbol": "AAPL", "strategy": "sma_crossover"}])
+    priority: int = Field(0, ge=-10, le=10, description="Higher runs first among queued jobs")
+
+
+class JobStatus(BaseModel):
+    id: str
+    kind: JobKind
+    status: Literal["queued", "running", "succeeded", "failed", "cancelled"]
+    priority: int
+    progress: float = Field(..., ge=0, le=1, description="Fraction of the work done")
+    message: Optional[str] = None
+    error: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
@@ -1,33 +1,179 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from functools import cached_property
+from typing import Callable, Dict, List, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
+from backend.engine.metrics import compute_metrics_batch
+from backend.engine.strategies.sma import rolling_means, sma_crossover_grid, sma_crossover_pairs
+
+
+@dataclass
+class TradeLog:
+    """
+    Columnar trade log: one array per field, one element per fill.
+    Use to_frame() for analysis; to_dicts() builds the per-trade dicts only when asked.
+    """
+    ts: pd.DatetimeIndex                # execution timestamps
+    side: np.ndarray                    # +1 buy, -1 sell (int8)
+    price: np.ndarray                   # fill price
+    qty: np.ndarray                     # notionalized quantity (1.0)
+    fees: np.ndarray                    # transaction cost as fraction of equity
+    slippage: np.ndarray                # slippage as fraction of equity
+
+    def __len__(self) -> int:
+        return len(self.side)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "side": np.where(self.side > 0, "buy", "sell"),
+                "price": self.price,
+                "qty": self.qty,
+                "fees": self.fees,
+                "slippage": self.slippage,
+            },
+            index=pd.DatetimeIndex(self.ts, name="ts"),
+        )
+
+    def to_dicts(self) -> List[Dict]:
+        return [
+            {
+                "ts": ts.isoformat(),
+                "side": "buy" if side > 0 else "sell",
+                "price": price,
+                "qty": qty,
+                "fees": fees,
+                "slippage": slippage,
+            }
+            for ts, side, price, qty, fees, slippage in zip(
+                self.ts,
+                self.side.tolist(),
+                self.price.tolist(),
+                self.qty.tolist(),
+                self.fees.tolist(),
+                self.slippage.tolist(),
+                strict=True,
+            )
+        ]
+
 
 @dataclass
 class BacktestOutput:
     equity_curve: List[float]           # cumulative equity, starts at 1.0
-    trades: List[Dict]                  # list of trade dicts (ts, side, price, qty, fees, slippage)
+    trade_log: TradeLog                 # columnar fills; see .trades for the dict view
+
+    @cached_property
+    def trades(self) -> List[Dict]:
+        """List of trade dicts (ts, side, price, qty, fees, slippage), built on first access."""
+        return self.trade_log.to_dicts()
 
 
-def _validate_inputs(df: pd.DataFrame, signal: pd.Series) -> None:
+# ---------------------------------------------------------------------
+# Simulation kernel
+#
+# Arrays in, arrays out: closes (bars,) and target positions (bars,) or (params x bars),
+# any float (1 long, -1 short, 0.5 half size). The target decided at bar t's close is held
+# over bar t+1 (next-bar execution); |target[t] - target[t-1]| is charged
+# (cost_bps + slippage_bps) / 10000 on bar t. Every path below (single backtest, grids,
+# chunked files) goes through it, so they agree bit for bit.
+def position_net_returns(
+    close: np.ndarray,
+    target: np.ndarray,
+    cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+    prev_close: Optional[float] = None,
+    prev_target: Optional[np.ndarray] = None,
+    validate: bool = True,
+) -> np.ndarray:
+    """
+    Per-bar net returns (gross position return minus turnover frictions), same shape as
+    ``target``, computed into one output buffer.
+
+    - prev_close / prev_target continue a series split into blocks (the last close and
+      target before bar 0); without them bar 0 has no return and no turnover.
+    - validate=False skips the shape and finiteness checks (trusted callers in hot loops).
+    """
+    close = np.asarray(close, dtype=float)
+    target = np.asarray(target)
+    if validate:
+        if close.ndim != 1 or target.shape[-1:] != close.shape or target.ndim > 2:
+            raise ValueError("Targets must be 1D or 2D with one column per bar of Close.")
+        if target.dtype.kind == "f" and not np.isfinite(target).all():
+            raise ValueError("Target positions contain NaN/inf.")
+    n = close.shape[0]
+    net = np.empty(target.shape, dtype=float)
+    if n == 0:
+        return net
+
+    r_close = np.empty(n)
+    r_close[0] = 0.0 if prev_close is None else close[0] / prev_close - 1
+    np.divide(close[1:], close[:-1], out=r_close[1:])
+    r_close[1:] -= 1
+
+    held0 = target[..., 0] if prev_target is None else prev_target
+    np.multiply(target[..., :-1], r_close[1:], out=net[..., 1:])
+    net[..., 0] = held0 * r_close[0]
+
+    fric = (cost_bps + slippage_bps) / 10000.0
+    if fric:
+        turnover = np.empty(target.shape, dtype=float)
+        np.subtract(target[..., 0], held0, out=turnover[..., 0], dtype=float)
+        np.subtract(target[..., 1:], target[..., :-1], out=turnover[..., 1:], dtype=float)
+        np.abs(turnover, out=turnover)
+        turnover *= fric
+        net -= turnover
+    return net
+
+
+def simulate_positions(
+    close: np.ndarray,
+    target: np.ndarray,
+    cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+    prev_close: Optional[float] = None,
+    prev_target: Optional[np.ndarray] = None,
+    equity0: float = 1.0,
+    validate: bool = True,
+) -> np.ndarray:
+    """
+    Equity for target positions: cumprod(1 + net) seeded with ``equity0``, computed in place
+    over position_net_returns' buffer (see there for the arguments).
+    """
+    net = position_net_returns(
+        close, target, cost_bps, slippage_bps, prev_close, prev_target, validate
+    )
+    net += 1.0
+    if net.shape[-1]:
+        net[..., 0] *= equity0
+    return np.cumprod(net, axis=-1, out=net)
+
+
+# ---------------------------------------------------------------------
+def _validate_inputs(df: pd.DataFrame, signal: pd.Series) -> pd.Series:
+    """Check the frame, align the signal to it (ffill, then 0) and check it is binary."""
     if not isinstance(df.index, pd.DatetimeIndex):
         raise ValueError("Price dataframe index must be a DatetimeIndex.")
     if "Close" not in df.columns:
         raise ValueError("Price dataframe must contain a 'Close' column.")
     if not signal.index.equals(df.index):
         # try auto-align (common if user built signal from another copy)
-        signal.index = pd.DatetimeIndex(signal.index)
+        signal = signal.set_axis(pd.DatetimeIndex(signal.index))
         if not signal.index.equals(df.index):
             # last try: reindex to df and forward-fill
-            signal = signal.reindex(df.index).fillna(method="ffill").fillna(0)
-    if signal.isna().any():
+            signal = signal.reindex(df.index).ffill().fillna(0)
+    values = signal.to_numpy()
+    if values.dtype.kind == "f" and np.isnan(values).any():
         raise ValueError("Signal contains NaNs after alignment.")
-    bad_vals = set(signal.unique()) - {0, 1}
-    if bad_vals:
-        raise ValueError(f"Signal must be binary {0,1}. Found values: {bad_vals}")
+    if values.dtype.kind != "b":
+        bad = (values != 0) & (values != 1)
+        if bad.any():
+            bad_vals = set(np.unique(values[bad]).tolist())
+            raise ValueError(f"Signal must be binary {{0,1}}. Found values: {bad_vals}")
+    return signal
 
 
 def simulate_long_only(
@@ -35,51 +181,183 @@ def simulate_long_only(
     signal: pd.Series,
     cost_bps: float = 0.0,
     slippage_bps: float = 0.0,
+    validate: bool = True,
 ) -> BacktestOutput:
     """
     Long-only backtest with next-bar execution and per-trade frictions.
 
     - Positions are 1 (long) or 0 (flat).
-    - Execution: signal decided at bar t-1 is executed on bar t (next bar) -> we use signal.shift(1).
+    - Execution: signal decided at bar t-1 is executed on bar t (next bar), i.e. the
+      position over bar t is signal[t-1].
     - Costs/slippage: applied when signal changes (entry or exit); modeled as a negative return of
       (cost_bps + slippage_bps)/10000 on that execution bar.
-    - Equity starts at 1.0. Qty for trade log is 1.0 (notionalized); prices are from 'Open' if available, else 'Close'.
+    - Equity starts at 1.0. Qty for trade log is 1.0 (notionalized); prices are from 'Open'
+      if available, else 'Close'.
+    - A thin wrapper over simulate_positions; validate=False skips the frame/signal checks
+      and alignment for callers that pass a binary signal on df's own index.
     """
-    signal = signal.astype(int)
-    _validate_inputs(df, signal)
+    if validate:
+        signal = _validate_inputs(df, signal)
+    if signal.dtype.kind not in "iu":
+        signal = signal.astype(np.int8)
 
-    # core returns
-    r_close = df["Close"].pct_change().fillna(0.0)
-    pos = signal.shift(1).fillna(0).astype(int)  # next-bar execution -> previous signal applies
-    gross = r_close * pos
+    equity = simulate_positions(
+        df["Close"].to_numpy(dtype=float),
+        signal.to_numpy(),
+        cost_bps=cost_bps,
+        slippage_bps=slippage_bps,
+        validate=False,
+    )
+    return BacktestOutput(
+        equity_curve=equity.tolist(),
+        trade_log=build_trade_log(df, signal, cost_bps=cost_bps, slippage_bps=slippage_bps),
+    )
 
-    # frictions on *changes* in signal (entries/exits)
-    turnover = signal.diff().abs().fillna(0.0)  # 1 at entry/exit, else 0
-    fric = (cost_bps + slippage_bps) / 10000.0
-    net = gross - turnover * fric
 
-    equity = (1.0 + net).cumprod()
+def trim_warmup(
+    out: BacktestOutput,
+    df: pd.DataFrame,
+    signal: pd.Series,
+    warmup: int,
+) -> BacktestOutput:
+    """
+    Drop the first ``warmup`` bars (indicator history loaded before the requested start)
+    from a simulate_long_only result over the whole frame.
 
-    # ---- trade log (at next-bar open if available, else close) ----
-    opens = df["Open"] if "Open" in df.columns else df["Close"]
-    changes = signal.diff().fillna(0.0)
-    trades: List[Dict] = []
-    for ts, ch in changes.items():
-        if ch == 0:
-            continue
-        side = "buy" if ch == 1 else "sell"
-        price = float(opens.loc[ts])
-        trade = {
-            "ts": ts.isoformat(),
-            "side": side,
-            "price": price,
-            "qty": 1.0,                               # notionalized
-            "fees": round(cost_bps / 10000.0, 8),     # as fraction of equity
-            "slippage": round(slippage_bps / 10000.0, 8),
-        }
-        trades.append(trade)
+    - Equity is rebased to 1.0 on the first kept bar; the market move into that bar (from the
+      last warm-up close) is excluded, a fill on that bar is still charged.
+    - The position the warmed-up strategy holds entering the range is carried in; no
+      synthetic entry fill is logged for it. Fills before the range are dropped.
+    """
+    if warmup <= 0:
+        return out
+    k = warmup
+    equity = np.asarray(out.equity_curve)
+    close = df["Close"].to_numpy(dtype=float)
+    held = float(signal.iloc[k - 1])
+    base = equity[k - 1] * (1.0 + held * (close[k] / close[k - 1] - 1))
 
+    log = out.trade_log
+    keep = np.asarray(log.ts >= df.index[k])
     return BacktestOutput(
-        equity_curve=[float(x) for x in equity.tolist()],
-        trades=trades,
+        equity_curve=(equity[k:] / base).tolist(),
+        trade_log=TradeLog(
+            ts=log.ts[keep],
+            side=log.side[keep],
+            price=log.price[keep],
+            qty=log.qty[keep],
+            fees=log.fees[keep],
+            slippage=log.slippage[keep],
+        ),
     )
+
+
+def build_trade_log(
+    df: pd.DataFrame,
+    signal: pd.Series,
+    cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+) -> TradeLog:
+    """
+    Trade log from signal changes, gathered with array ops (no per-trade Python work).
+    Fills are at the bar where the signal changes, priced at 'Open' if available, else 'Close'.
+    """
+    opens = df["Open"] if "Open" in df.columns else df["Close"]
+    changes = np.diff(signal.to_numpy(), prepend=signal.iloc[0] if len(signal) else 0)
+    idx = np.flatnonzero(changes)
+    n = len(idx)
+
+    return TradeLog(
+        ts=df.index[idx],
+        side=np.sign(changes[idx]).astype(np.int8),
+        price=opens.to_numpy(dtype=float)[idx],
+        qty=np.ones(n),                                          # notionalized
+        fees=np.full(n, round(cost_bps / 10000.0, 8)),           # as fraction of equity
+        slippage=np.full(n, round(slippage_bps / 10000.0, 8)),
+    )
+
+
+def grid_net_returns(
+    close: np.ndarray,
+    signals: np.ndarray,
+    cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+) -> np.ndarray:
+    """
+    Per-bar net returns of simulate_long_only for many binary signals at once.
+    - close: 1D array of closes (bars,)
+    - signals: 2D {0,1} array (params x bars), one signal row per parameter set
+    Returns a 2D float array (params x bars). Same next-bar execution and friction rules.
+    """
+    close = np.asarray(close, dtype=float)
+    signals = np.asarray(signals)
+    if signals.ndim != 2 or signals.shape[1] != close.shape[0]:
+        raise ValueError("Signal matrix must be 2D with one column per bar.")
+    return position_net_returns(close, signals, cost_bps, slippage_bps, validate=False)
+
+
+def simulate_signal_grid(
+    close: np.ndarray,
+    signals: np.ndarray,
+    cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+) -> np.ndarray:
+    """
+    simulate_long_only for many binary signals at once.
+    Returns the 2D equity matrix (params x bars); see grid_net_returns for the inputs.
+    """
+    signals = np.asarray(signals)
+    if signals.ndim != 2 or signals.shape[1] != np.shape(close)[0]:
+        raise ValueError("Signal matrix must be 2D with one column per bar.")
+    return simulate_positions(close, signals, cost_bps, slippage_bps, validate=False)
+
+
+def sweep_sma_crossover(
+    df: pd.DataFrame,
+    fasts: Sequence[int],
+    slows: Sequence[int],
+    cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+    rf_rate_pct: float = 0.0,
+    rank_by: str = "sharpe",
+    chunk_size: int = 256,
+    progress: Optional[Callable[[float, float], None]] = None,
+) -> pd.DataFrame:
+    """
+    Evaluate every (fast, slow) SMA crossover combination in one vectorized pass.
+
+    - Each distinct window is computed once from a shared cumulative sum of Close.
+    - Combinations are simulated as a (params x bars) matrix, ``chunk_size`` rows at a time
+      to bound memory.
+    - Returns one row per combination (fast, slow, compute_metrics keys, trades), sorted
+      best-first by ``rank_by``.
+    - progress(done, total) is called with the combinations evaluated after each chunk.
+    """
+    if "Close" not in df.columns:
+        raise ValueError("Price dataframe must contain a 'Close' column.")
+    pairs = sma_crossover_pairs(fasts, slows)
+    if not pairs:
+        raise ValueError("No valid (fast, slow) pairs: slow must be strictly greater than fast.")
+
+    close = df["Close"].to_numpy(dtype=float)
+    means = rolling_means(close, {w for pair in pairs for w in pair})
+
+    chunks = []
+    for i in range(0, len(pairs), chunk_size):
+        block = pairs[i : i + chunk_size]
+        signals = sma_crossover_grid(means, block)
+        equity = simulate_signal_grid(close, signals, cost_bps=cost_bps, slippage_bps=slippage_bps)
+        metrics = compute_metrics_batch(equity, rf_rate_pct=rf_rate_pct)
+        metrics["trades"] = np.count_nonzero(np.diff(signals, axis=1), axis=1)
+        chunks.append(
+            pd.DataFrame({"fast": [f for f, _ in block], "slow": [s for _, s in block], **metrics})
+        )
+        if progress is not None:
+            progress(i + len(block), len(pairs))
+
+    table = pd.concat(chunks, ignore_index=True)
+    if rank_by not in table.columns:
+        raise ValueError(f"Unknown rank_by column: {rank_by}")
+    return table.sort_values(
+        [rank_by, "fast", "slow"], ascending=[False, True, True], na_position="last"
+    ).reset_index(drop=True)
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import pandas as pd
+
+# ---------------------------------------------------------------------
+# One process pool per server process, shared by every batch (HTTP or job): concurrent
+# batches queue for its ALGOTRADE_BATCH_WORKERS processes (default: one per core) instead
+# of each forking its own. Workers come from a clean forkserver/spawn process, never a fork
+# of the threaded server, and are kept between batches.
+ENV_BATCH_WORKERS = "ALGOTRADE_BATCH_WORKERS"
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+
+def max_batch_workers() -> int:
+    value = os.environ.get(ENV_BATCH_WORKERS)
+    return max(1, int(value) if value else os.cpu_count() or 1)
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """The shared batch pool, created on first use."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(max_workers=max_batch_workers(), mp_context=_mp_context())
+        return _POOL
+
+
+def shutdown_pool(wait: bool = True) -> None:
+    """Stop the shared pool's processes (the app's lifespan hook calls this on exit)."""
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@dataclass
+class BatchConfig:
+    strategy: str
+    params: Dict[str, float] = field(default_factory=dict)
+    start: Optional[date] = None
+    end: Optional[date] = None
+    cost_bps: float = 0.0
+    slippage_bps: float = 0.0
+    rf_rate_pct: float = 0.0
+    # fetch_ohlc-compatible loader (symbol, start=, end=); default data.fetch_ohlc. Runs in
+    # the pool's processes, so it must be picklable (a module-level function).
+    loader: Optional[Callable[..., pd.DataFrame]] = None
+
+
+@dataclass
+class BatchOutput:
+    results: Dict[str, Dict]            # symbol -> {"summary", "buy_and_hold_return_pct", "bars"}
+    errors: Dict[str, str]              # symbol -> error message
+
+
+def backtest_symbol(symbol: str, config: BatchConfig) -> Dict:
+    """
+    Full single-symbol pipeline: fetch (+ warm-up) -> signal -> simulate_long_only ->
+    trim warm-up -> compute_metrics. Raises on any failure; run_batch turns that into a
+    per-symbol error.
+    """
+    from backend.engine import data as data_mod
+    from backend.engine.backtester import simulate_long_only, trim_warmup
+    from backend.engine.metrics import compute_buy_and_hold, compute_metrics
+    from backend.engine.strategies import build_signal, get_strategy
+
+    lookback = get_strategy(config.strategy).warmup_bars(config.params)
+    df, warmup = data_mod.fetch_ohlc_with_warmup(
+        symbol, config.start, config.end, lookback, fetch=config.loader
+    )
+    if df.empty:
+        raise ValueError("No data returned for symbol.")
+
+    signal = build_signal(df, config.strategy, config.params)
+    out = simulate_long_only(
+        df, signal, cost_bps=config.cost_bps, slippage_bps=config.slippage_bps
+    )
+    out = trim_warmup(out, df, signal, warmup)
+    bars = df.iloc[warmup:]
+    equity = pd.Series(out.equity_curve, index=bars.index[: len(out.equity_curve)])
+    metrics = compute_metrics(equity, rf_rate_pct=config.rf_rate_pct)
+
+    return {
+        "summary": {**metrics, "trades": len(out.trade_log)},
+        "buy_and_hold_return_pct": compute_buy_and_hold(bars),
+        "bars": len(bars),
+    }
+
+
+def _run_symbol(symbol: str, config: BatchConfig) -> Tuple[str, Optional[Dict], Optional[str]]:
+    # Never raise across the process boundary: exceptions may not pickle, and one bad
+    # ticker must not take down the batch.
+    try:
+        return symbol, backtest_symbol(symbol, config), None
+    except Exception as e:
+        return symbol, None, f"{type(e).__name__}: {e}"
+
+
+def run_batch(
+    symbols: Sequence[str],
+    config: BatchConfig,
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[float, float], None]] = None,
+) -> BatchOutput:
+    """
+    Run the same strategy config over many symbols on the shared process pool.
+
+    - max_workers: symbols of this batch in flight at once (default and cap:
+      max_batch_workers(), also capped at the number of symbols). 1 runs everything inline
+      in the calling process.
+    - Per-symbol failures are collected in ``errors`` instead of failing the batch.
+    - progress(done, total) is called with the symbols finished so far.
+    """
+    symbols = list(dict.fromkeys(s.strip() for s in symbols if s.strip()))
+    if not symbols:
+        raise ValueError("No symbols given.")
+
+    limit = max_batch_workers()
+    workers = min(max_workers or limit, limit, len(symbols))
+    outcomes: List[Tuple[str, Optional[Dict], Optional[str]]] = []
+
+    if workers == 1:
+        for s in symbols:
+            outcomes.append(_run_symbol(s, config))
+            if progress is not None:
+                progress(len(outcomes), len(symbols))
+    else:
+        pool = get_pool()
+        todo = iter(symbols)
+        running: Set[Future] = set()
+        try:
+            while True:
+                for s in todo:              # keep up to ``workers`` of ours in flight
+                    running.add(pool.submit(_run_symbol, s, config))
+                    if len(running) >= workers:
+                        break
+                if not running:
+                    break
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for f in done:
+                    outcomes.append(f.result())
+                    if progress is not None:
+                        progress(len(outcomes), len(symbols))
+        except BrokenProcessPool:          # a worker died: the next batch gets a fresh pool
+            _discard_pool(pool)
+            raise
+        except BaseException:  # e.g. job cancelled: drop symbols not started yet
+            for f in running:
+                f.cancel()
+            raise
+
+    results: Dict[str, Dict] = {}
+    errors: Dict[str, str] = {}
+    order = {s: i for i, s in enumerate(symbols)}
+    for symbol, result, error in sorted(outcomes, key=lambda o: order[o[0]]):
+        if error is None:
+            results[symbol] = result
+        else:
+            errors[symbol] = error
+    return BatchOutput(results=results, errors=errors)
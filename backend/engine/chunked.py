@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from backend.engine.backtester import TradeLog, simulate_positions
+from backend.engine.metrics import StreamingMetrics
+
+# ---------------------------------------------------------------------
+# Chunked (memory-bounded) simulation
+#
+# Bars are read from a memory-mapped parquet or Arrow IPC file in fixed-size blocks and
+# simulated block by block; only the position, last close and equity cross a block
+# boundary. Peak memory is a few arrays of ``block_bars`` regardless of history length,
+# and every value matches simulate_long_only on the whole frame bit for bit.
+BLOCK_BARS = 1 << 16
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
+TS_COLUMNS = ("Datetime", "Date", "ts")
+
+
+@dataclass
+class Block:
+    ts: np.ndarray                      # datetime64[ns]
+    open: np.ndarray
+    close: np.ndarray
+    signal: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+
+def write_bars(
+    df: pd.DataFrame,
+    path: Union[str, Path],
+    signal: Optional[pd.Series] = None,
+    float32: bool = False,
+    block_bars: int = BLOCK_BARS,
+) -> Path:
+    """
+    Store bars for simulate_chunked: parquet, or Arrow IPC when the suffix is .arrow/.feather.
+    - columns Datetime, Open (if present), Close, plus an int8 ``signal`` column if given
+    - float32=True halves the price storage; the engine still computes in float64
+    """
+    path = Path(path)
+    dtype = np.float32 if float32 else np.float64
+    columns = {"Datetime": pa.array(df.index.to_numpy(dtype="datetime64[ns]"))}
+    for col in ("Open", "Close"):
+        if col in df.columns:
+            columns[col] = pa.array(df[col].to_numpy(dtype=dtype))
+    if "Close" not in columns:
+        raise ValueError("Price dataframe must contain a 'Close' column.")
+    if signal is not None:
+        columns["signal"] = pa.array(signal.to_numpy(dtype=np.int8))
+    table = pa.table(columns)
+
+    if path.suffix in ARROW_SUFFIXES:
+        with pa.OSFile(str(path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table, max_chunksize=block_bars)
+    else:
+        pq.write_table(table, path, row_group_size=block_bars)
+    return path
+
+
+def _record_batches(path: Path, columns: List[str], block_bars: int) -> Iterator[pa.RecordBatch]:
+    if path.suffix in ARROW_SUFFIXES:
+        reader = pa.ipc.open_file(pa.memory_map(str(path), "r"))
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i).select(columns)
+            for offset in range(0, batch.num_rows, block_bars):
+                yield batch.slice(offset, block_bars)   # zero-copy views of the mapping
+    else:
+        yield from pq.ParquetFile(path, memory_map=True).iter_batches(
+            batch_size=block_bars, columns=columns
+        )
+
+
+def read_blocks(path: Union[str, Path], block_bars: int = BLOCK_BARS) -> Iterator[Block]:
+    """
+    Stream a bars file (write_bars output or a data-cache parquet partition) as Blocks.
+    Prices are upcast to float64 one block at a time.
+    """
+    path = Path(path)
+    if block_bars < 1:
+        raise ValueError("block_bars must be >= 1.")
+    if path.suffix in ARROW_SUFFIXES:
+        names = pa.ipc.open_file(pa.memory_map(str(path), "r")).schema.names
+    else:
+        names = pq.read_schema(path).names
+    ts_col = next((c for c in TS_COLUMNS if c in names), None)
+    if ts_col is None or "Close" not in names:
+        raise ValueError(f"Bars file needs a timestamp and a 'Close' column. Got: {names}")
+    columns = [c for c in (ts_col, "Open", "Close", "signal") if c in names]
+
+    for batch in _record_batches(path, columns, block_bars):
+        if batch.num_rows == 0:
+            continue
+        col = dict(zip(batch.schema.names, batch.columns, strict=True))
+        close = col["Close"].to_numpy(zero_copy_only=False).astype(float, copy=False)
+        yield Block(
+            ts=col[ts_col].to_numpy(zero_copy_only=False).astype("datetime64[ns]", copy=False),
+            open=(
+                col["Open"].to_numpy(zero_copy_only=False).astype(float, copy=False)
+                if "Open" in col else close
+            ),
+            close=close,
+            signal=col["signal"].to_numpy(zero_copy_only=False) if "signal" in col else None,
+        )
+
+
+def with_strategy_signal(
+    blocks: Iterable[Block], strategy: str, params: Dict[str, float]
+) -> Iterator[Block]:
+    """
+    Attach the strategy's signal to each block using the streaming indicator states, which
+    carry their history across block boundaries and reproduce build_signal exactly.
+    """
+    from backend.engine.streaming import make_signal_state
+
+    state = make_signal_state(strategy, params)
+    for block in blocks:
+        signal = np.fromiter(
+            (state.update(c) for c in block.close.tolist()), dtype=np.int8, count=len(block)
+        )
+        yield Block(block.ts, block.open, block.close, signal)
+
+
+@dataclass
+class ChunkedOutput:
+    bars: int
+    final_equity: float
+    summary: dict                       # compute_metrics keys, accumulated block by block
+    trade_log: TradeLog                 # fills only (a small fraction of bars)
+    equity_path: Optional[Path] = None  # per-bar equity, when a sink was given
+
+
+def simulate_chunked(
+    blocks: Iterable[Block],
+    cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+    rf_rate_pct: float = 0.0,
+    equity_sink: Union[str, Path, None] = None,
+) -> ChunkedOutput:
+    """
+    simulate_long_only over a stream of Blocks (each carrying its signal).
+
+    - Per block: simulate_positions continued from the previous block's last close, last
+      signal (held into bar 0) and equity, so the running product never restarts.
+    - Metrics go through StreamingMetrics.update_many, fills are gathered per block.
+    - equity_sink: optional parquet path receiving (Datetime, equity) per block; otherwise
+      the per-bar equity curve is never held in memory.
+    """
+    fees = round(cost_bps / 10000.0, 8)
+    slippage = round(slippage_bps / 10000.0, 8)
+
+    metrics = StreamingMetrics(rf_rate_pct=rf_rate_pct)
+    last_close: Optional[float] = None
+    last_signal = 0
+    equity = 1.0
+    bars = 0
+    fills: Dict[str, List[np.ndarray]] = {"ts": [], "side": [], "price": []}
+
+    writer = None
+    sink = Path(equity_sink) if equity_sink is not None else None
+    try:
+        for block in blocks:
+            n = len(block)
+            if n == 0:
+                continue
+            if block.signal is None:
+                raise ValueError("Block has no signal (add a signal column or a strategy).")
+            close = block.close
+            signal = block.signal.astype(np.int64, copy=False)
+            if not np.isin(signal, (0, 1)).all():
+                raise ValueError("Signal must be binary {0, 1}.")
+            if last_close is None:
+                # bar 0 of the series: no return, and its signal is not a fill
+                last_close, last_signal = float(close[0]), int(signal[0])
+
+            curve = simulate_positions(
+                close,
+                signal,
+                cost_bps,
+                slippage_bps,
+                prev_close=last_close,
+                prev_target=last_signal,
+                equity0=equity,
+                validate=False,
+            )
+            changes = np.diff(signal, prepend=last_signal)
+
+            metrics.update_many(curve)
+            idx = np.flatnonzero(changes)
+            if len(idx):
+                fills["ts"].append(block.ts[idx])
+                fills["side"].append(np.sign(changes[idx]).astype(np.int8))
+                fills["price"].append(np.asarray(block.open, dtype=float)[idx])
+
+            if sink is not None:
+                table = pa.table({"Datetime": block.ts, "equity": curve})
+                if writer is None:
+                    writer = pq.ParquetWriter(sink, table.schema)
+                writer.write_table(table)
+
+            last_close, last_signal = float(close[-1]), int(signal[-1])
+            equity = float(curve[-1])
+            bars += n
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if bars == 0:
+        raise ValueError("No bars to simulate.")
+
+    ts = np.concatenate(fills["ts"]) if fills["ts"] else np.array([], dtype="datetime64[ns]")
+    n_fills = len(ts)
+    return ChunkedOutput(
+        bars=bars,
+        final_equity=equity,
+        summary=metrics.snapshot(),
+        trade_log=TradeLog(
+            ts=pd.DatetimeIndex(ts),
+            side=np.concatenate(fills["side"]) if n_fills else np.zeros(0, dtype=np.int8),
+            price=np.concatenate(fills["price"]) if n_fills else np.zeros(0),
+            qty=np.ones(n_fills),
+            fees=np.full(n_fills, fees),
+            slippage=np.full(n_fills, slippage),
+        ),
+        equity_path=sink,
+    )
+
+
+def simulate_file(
+    path: Union[str, Path],
+    strategy: Optional[str] = None,
+    params: Optional[Dict[str, float]] = None,
+    cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+    rf_rate_pct: float = 0.0,
+    block_bars: int = BLOCK_BARS,
+    equity_sink: Union[str, Path, None] = None,
+) -> ChunkedOutput:
+    """
+    Chunked backtest of a bars file: uses its ``signal`` column, or runs ``strategy``
+    block by block when one is given.
+    """
+    blocks = read_blocks(path, block_bars=block_bars)
+    if strategy is not None:
+        blocks = with_strategy_signal(blocks, strategy, params or {})
+    return simulate_chunked(
+        blocks,
+        cost_bps=cost_bps,
+        slippage_bps=slippage_bps,
+        rf_rate_pct=rf_rate_pct,
+        equity_sink=equity_sink,
+    )
@@ -1,80 +1,403 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
+import threading
+import uuid
+from contextlib import contextmanager
 from datetime import date, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Iterator, List, Optional, Protocol, Tuple
 
 import pandas as pd
-import yfinance as yf
 
+from backend import telemetry
+from backend.engine.cache import LRUCache
+from backend.engine.singleflight import SingleFlight
+
+try:  # cross-process cache locking where the platform supports it
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
 
 # ---------------------------------------------------------------------
 # Local cache directory (.cache/)
+#
+# One directory per (symbol, interval), partitioned by calendar year:
+#   .cache/AAPL_1d/_coverage.json    {"start": "2019-01-02", "end": "2024-01-01"}  (end exclusive)
+#   .cache/AAPL_1d/2019.parquet
+#   .cache/AAPL_1d/2020.parquet ...
+# Reads only open the years overlapping the requested range; downloads only fetch the
+# head/tail that the recorded coverage does not already contain. Directories are created on
+# the first write, never at import.
 CACHE_DIR = Path(".cache")
-CACHE_DIR.mkdir(exist_ok=True)
+
+COVERAGE_FILE = "_coverage.json"
+ENV_DATA_STORE = "ALGOTRADE_DATA_STORE"
+OHLC_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# In-process layer in front of the parquet cache: parsed frames keyed by
+# (symbol, interval, start, end), bounded by total bytes, invalidated when the on-disk
+# coverage file changes (every download rewrites it).
+FRAME_CACHE_MAX_BYTES = 256 * 1024 * 1024
+FRAME_CACHE = LRUCache(max_bytes=FRAME_CACHE_MAX_BYTES)
+
+# Concurrent misses for the same (symbol, interval, range) share one load, and writers to the
+# same cache directory are serialized (threads via a lock, processes via flock on .lock).
+_FLIGHTS = SingleFlight()
+_KEY_LOCKS: Dict[Path, threading.Lock] = {}
+_KEY_LOCKS_GUARD = threading.Lock()
+
+
+# ---------------------------------------------------------------------
+# Providers
+class DataProvider(Protocol):
+    def download(self, symbol: str, start: date, end: date, interval: str) -> pd.DataFrame:
+        """Return OHLCV bars in [start, end) with a sorted DatetimeIndex (may be empty)."""
+        ...
+
+
+def normalize_ohlc(data: pd.DataFrame) -> pd.DataFrame:
+    """Capitalized OHLCV columns on a sorted DatetimeIndex named 'Datetime'."""
+    if data.empty:
+        return data
+
+    # yfinance returns (field, ticker) columns even for a single symbol
+    if isinstance(data.columns, pd.MultiIndex):
+        data = data.copy()
+        data.columns = data.columns.get_level_values(0)
+
+    data = data.rename(columns=str.capitalize)
+    if not all(col in data.columns for col in OHLC_COLUMNS):
+        raise ValueError(f"Downloaded data missing OHLC columns. Got: {list(data.columns)}")
+
+    data = data.reset_index()
+    if "Date" in data.columns:
+        data = data.rename(columns={"Date": "Datetime"})
+    data["Datetime"] = pd.to_datetime(data["Datetime"])
+    return data.set_index("Datetime").sort_index()
+
+
+class YFinanceProvider:
+    """Default provider: Yahoo Finance via yfinance (imported on first download)."""
+
+    def download(self, symbol: str, start: date, end: date, interval: str) -> pd.DataFrame:
+        import yfinance as yf
+
+        data = yf.download(
+            symbol,
+            start=start,
+            end=end,
+            interval=interval,
+            progress=False,
+            auto_adjust=True,
+            threads=True,
+        )
+        return normalize_ohlc(data)
+
+
+_provider: Optional[DataProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> DataProvider:
+    """
+    The process-wide provider: a LocalStoreProvider over $ALGOTRADE_DATA_STORE when that is
+    set (fully offline), yfinance otherwise. Created on first use.
+    """
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            root = os.environ.get(ENV_DATA_STORE)
+            if root:
+                from backend.engine.market_store import LocalStoreProvider
+
+                _provider = LocalStoreProvider(root)
+            else:
+                _provider = YFinanceProvider()
+        return _provider
+
+
+def set_provider(provider: Optional[DataProvider]) -> Optional[DataProvider]:
+    """
+    Swap the process-wide default provider (e.g. a local fake in tests); returns the previous
+    one. None goes back to the lazily created default.
+    """
+    global _provider
+    with _provider_lock:
+        previous, _provider = _provider, provider
+    return previous
+
+
+# ---------------------------------------------------------------------
+# Cache layout helpers
+def _cache_dir(symbol: str, interval: str) -> Path:
+    """Return the directory holding the symbol's cached year partitions."""
+    return CACHE_DIR / f"{symbol.replace('=', '_')}_{interval}"
+
+
+def _read_coverage(cache: Path) -> Optional[Tuple[date, date]]:
+    meta = cache / COVERAGE_FILE
+    if not meta.exists():
+        return None
+    raw = json.loads(meta.read_text())
+    return date.fromisoformat(raw["start"]), date.fromisoformat(raw["end"])
+
+
+def _write_coverage(cache: Path, coverage: Tuple[date, date]) -> None:
+    start, end = coverage
+    payload = {"start": start.isoformat(), "end": end.isoformat()}
+    _atomic_write(cache / COVERAGE_FILE, lambda tmp: tmp.write_text(json.dumps(payload)))
+
+
+def _atomic_write(path: Path, write) -> None:
+    """Write via a unique temp file in the same directory, then rename over ``path``."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
 
 
-def _cache_path(symbol: str, interval: str) -> Path:
-    """Return path for the symbol's cached parquet file."""
-    fname = f"{symbol.replace('=', '_')}_{interval}.parquet"
-    return CACHE_DIR / fname
+@contextmanager
+def _key_lock(cache: Path) -> Iterator[None]:
+    """Exclusive access to one cache directory for read-modify-write cycles."""
+    with _KEY_LOCKS_GUARD:
+        lock = _KEY_LOCKS.setdefault(cache, threading.Lock())
+    with lock:
+        if fcntl is None:
+            yield
+            return
+        cache.mkdir(parents=True, exist_ok=True)
+        with open(cache / ".lock", "w") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
 
 
+def _cache_version(cache: Path) -> Optional[Tuple[int, int, int]]:
+    """Cheap fingerprint of the on-disk cache state (one stat of the coverage file)."""
+    try:
+        st = (cache / COVERAGE_FILE).stat()
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def _freeze(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of df whose column arrays are read-only (shared safely between callers)."""
+    arrays = {}
+    for col in df.columns:
+        arr = df[col].to_numpy(copy=True)
+        arr.flags.writeable = False
+        arrays[col] = arr
+    return pd.DataFrame(arrays, index=df.index, copy=False)
+
+
+def _missing_ranges(
+    coverage: Optional[Tuple[date, date]],
+    start: date,
+    end: date,
+    force: bool = False,
+) -> List[Tuple[date, date]]:
+    """
+    Ranges to download so that [start, end) is covered and coverage stays contiguous.
+    - no coverage: the whole request
+    - otherwise: only the head before / tail after the covered span
+    - force: the whole request again, plus any gap to the existing coverage
+    """
+    if coverage is None:
+        return [(start, end)]
+    cov_start, cov_end = coverage
+
+    if force:
+        ranges = [(start, end)]
+        if end < cov_start:
+            ranges.append((end, cov_start))
+        if start > cov_end:
+            ranges.append((cov_end, start))
+        return ranges
+
+    ranges = []
+    if start < cov_start:
+        ranges.append((start, cov_start))
+    if end > cov_end:
+        ranges.append((cov_end, end))
+    return ranges
+
+
+def _write_partitions(cache: Path, new: pd.DataFrame) -> None:
+    """Merge new bars into their year partitions (new rows win on duplicate timestamps)."""
+    cache.mkdir(parents=True, exist_ok=True)
+    for year, part in new.groupby(new.index.year):
+        path = cache / f"{year}.parquet"
+        if path.exists():
+            part = pd.concat([pd.read_parquet(path), part])
+            part = part[~part.index.duplicated(keep="last")].sort_index()
+        _atomic_write(path, part.to_parquet)
+
+
+def _bound(d: date, index: pd.DatetimeIndex) -> pd.Timestamp:
+    ts = pd.Timestamp(d)
+    return ts.tz_localize(index.tz) if index.tz is not None else ts
+
+
+def _read_range(cache: Path, start: date, end: date) -> pd.DataFrame:
+    """Read only the year partitions overlapping [start, end), then slice to the range."""
+    last_day = end - timedelta(days=1)
+    paths = [cache / f"{year}.parquet" for year in range(start.year, last_day.year + 1)]
+    parts = [pd.read_parquet(p) for p in paths if p.exists()]
+    if not parts:
+        return pd.DataFrame(columns=OHLC_COLUMNS, index=pd.DatetimeIndex([], name="Datetime"))
+
+    df = pd.concat(parts) if len(parts) > 1 else parts[0]
+    mask = (df.index >= _bound(start, df.index)) & (df.index < _bound(end, df.index))
+    return df[mask]
+
+
+# ---------------------------------------------------------------------
 def fetch_ohlc(
     symbol: str,
     start: Optional[date] = None,
     end: Optional[date] = None,
     interval: str = "1d",
     force_download: bool = False,
+    provider: Optional[DataProvider] = None,
 ) -> pd.DataFrame:
     """
-    Fetch OHLCV data from yfinance and cache it locally in .cache/.
+    Fetch OHLCV bars in [start, end) through the local range-aware cache in .cache/.
+
+    - Defaults: end = today, start = end - 5 years.
+    - Only ranges missing from the cached coverage are downloaded and appended.
+      Coverage is recorded up to today at most, so a future end keeps the tail open.
+    - force_download re-downloads just the requested range (overwriting those bars).
+    - provider: data source (default: the process-wide provider, see get_provider()).
+      Local providers (``local = True``, e.g. the market store) are read directly: their
+      bars are already memory-mapped, so neither cache layer is involved.
+    - Parsed frames are kept in FRAME_CACHE; callers get a shallow, copy-on-write view
+      over read-only arrays, so mutating the result never corrupts the shared copy.
     """
+    provider = provider or get_provider()
+    end = end or date.today()
+    start = start or end - timedelta(days=5 * 365)
 
-    cache_file = _cache_path(symbol, interval)
-
-    # Try cache first
-    if cache_file.exists() and not force_download:
-        df = pd.read_parquet(cache_file)
-        if not df.empty:
-            return df
-
-    # Default range: 5 years
-    if start is None or end is None:
-        end = date.today()
-        start = end - timedelta(days=5 * 365)
-
-    data = yf.download(
-        symbol,
-        start=start,
-        end=end,
-        interval=interval,
-        progress=False,
-        auto_adjust=True,
-        threads=True,
-    )
+    if getattr(provider, "local", False):
+        with telemetry.stage("store_read"):
+            df = provider.download(symbol, start, end, interval)
+        if df.empty:
+            raise ValueError(f"No data for {symbol} ({start} to {end})")
+        return df
 
-    if data.empty:
+    cache = _cache_dir(symbol, interval)
+    # bars after today do not exist yet: a future end is keyed by the day, so the frame is
+    # reloaded (and the tail downloaded) once new bars can exist
+    key = (symbol, interval, start, min(end, date.today() + timedelta(days=1)))
+    if not force_download:
+        hit = FRAME_CACHE.get(key, version=_cache_version(cache))
+        if hit is not None:
+            return hit.copy(deep=False)
+
+    def load() -> pd.DataFrame:
+        frame = _freeze(_load_range(symbol, start, end, interval, force_download, provider))
+        nbytes = int(frame.memory_usage(index=True, deep=True).sum())
+        FRAME_CACHE.put(key, frame, nbytes, version=_cache_version(cache))
+        return frame
+
+    # concurrent callers for the same range wait for the one in-flight load
+    df = _FLIGHTS.do(key + (force_download,), load)
+    return df.copy(deep=False)
+
+
+def _load_range(
+    symbol: str,
+    start: date,
+    end: date,
+    interval: str,
+    force_download: bool,
+    provider: DataProvider,
+) -> pd.DataFrame:
+    """Disk layer: download what the coverage lacks, then read [start, end) from parquet."""
+    cache = _cache_dir(symbol, interval)
+    today = date.today()
+
+    with _key_lock(cache):
+        coverage = _read_coverage(cache)
+        for lo, hi in _missing_ranges(coverage, start, end, force=force_download):
+            with telemetry.stage("download"):
+                new = provider.download(symbol, lo, hi, interval)
+            if new.empty and coverage is None:
+                raise ValueError(f"No data for {symbol} ({lo} to {hi})")
+            if not new.empty:
+                _write_partitions(cache, new)
+            # only record coverage up to today: later bars (and today's, which may still be
+            # forming) are downloaded again once they can exist
+            hi = max(lo, min(hi, today))
+            if coverage is not None:
+                lo, hi = min(lo, coverage[0]), max(hi, coverage[1])
+            coverage = (lo, hi)
+            _write_coverage(cache, coverage)
+
+    with telemetry.stage("parquet_read"):
+        df = _read_range(cache, start, end)
+    if df.empty:
         raise ValueError(f"No data for {symbol} ({start} to {end})")
+    return df
 
-    # Ensure columns are consistent
-    data = data.rename(columns=str.capitalize)
-    expected = ["Open", "High", "Low", "Close", "Volume"]
-    if not all(col in data.columns for col in expected):
-        raise ValueError(f"Downloaded data missing OHLC columns. Got: {list(data.columns)}")
 
-    # Clean up index
-    data = data.reset_index()
-    if "Date" in data.columns:
-        data = data.rename(columns={"Date": "Datetime"})
-    data["Datetime"] = pd.to_datetime(data["Datetime"])
-    data = data.set_index("Datetime").sort_index()
+def fetch_ohlc_with_warmup(
+    symbol: str,
+    start: Optional[date],
+    end: Optional[date],
+    lookback: int,
+    fetch: Optional[Callable[..., pd.DataFrame]] = None,
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Daily bars in [start, end) preceded by exactly ``lookback`` bars of history (fewer only if
+    the symbol has no more), so indicators are warmed up on the first requested bar.
+    Returns (frame, warmup) where the first ``warmup`` rows precede ``start``.
+
+    - Without a start the default window is returned as is (warm-up happens inside it).
+    - Bars are counted, not days: the calendar padding starts at ~7/5 days per bar plus a
+      holiday margin and doubles until enough bars are in hand or history runs out.
+    - fetch: loader with fetch_ohlc's (symbol, start=, end=) signature (default fetch_ohlc).
+    """
+    fetch = fetch or fetch_ohlc
+    if start is None or lookback <= 0:
+        return fetch(symbol, start=start, end=end), 0
 
-    # Cache it
-    data.to_parquet(cache_file)
+    pad = timedelta(days=lookback * 7 // 5 + 10)
+    before = -1
+    while True:
+        df = fetch(symbol, start=start - pad, end=end)
+        k = int(df.index.searchsorted(_bound(start, df.index))) if len(df) else 0
+        if k >= lookback or k == before:
+            break
+        before, pad = k, pad * 2
 
-    return data
+    if k == len(df):
+        raise ValueError(f"No data for {symbol} ({start} to {end})")
+    first = max(0, k - lookback)
+    return df.iloc[first:], k - first
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Content hash of a price frame (index + every column), used as the data-version part of
+    result/indicator cache keys. Any revised or appended bar changes it.
+    """
+    h = hashlib.sha1(usedforsecurity=False)
+    h.update(str(df.shape).encode())
+    h.update(df.index.asi8.tobytes() if isinstance(df.index, pd.DatetimeIndex) else b"")
+    for col in df.columns:
+        h.update(str(col).encode())
+        h.update(df[col].to_numpy(dtype=float).tobytes())
+    return h.hexdigest()
 
 
 def get_price_series(symbol: str, **kwargs) -> pd.Series:
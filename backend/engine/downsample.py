@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+def minmax_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Shape-preserving downsampling by min/max bucketing.
+
+    Keeps the first and last point, splits the interior into (max_points - 2) // 2 equal
+    buckets and keeps each bucket's minimum and maximum, so peaks and troughs (drawdowns)
+    survive. Returns sorted positional indices into ``y`` (at most ``max_points`` of them).
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if max_points < 4:
+        raise ValueError("max_points must be >= 4.")
+    if n <= max_points:
+        return np.arange(n)
+
+    n_buckets = (max_points - 2) // 2
+    interior = y[1:-1]
+    m = len(interior)
+    size = -(-m // n_buckets)  # ceil
+    pad = size * n_buckets - m
+
+    lows = np.concatenate([interior, np.full(pad, np.inf)]).reshape(n_buckets, size)
+    highs = np.concatenate([interior, np.full(pad, -np.inf)]).reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    picks = np.concatenate([offsets + lows.argmin(axis=1), offsets + highs.argmax(axis=1)])
+    picks = picks[picks < m] + 1   # drop all-padding buckets, shift past the first point
+
+    return np.unique(np.concatenate([[0], picks, [n - 1]]))
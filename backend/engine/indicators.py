@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import weakref
+from typing import Callable, Dict, Hashable, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from backend.engine.cache import LRUCache
+
+# ---------------------------------------------------------------------
+# Shared indicator store
+#
+# Indicator arrays keyed by (fingerprint of the Close values, indicator name, params), so
+# requests that share a symbol/range and a window (SMA 50/200, RSI 14, ...) reuse one
+# computation. Values are read-only numpy arrays aligned with the frame's rows.
+INDICATOR_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+# Fingerprints of read-only buffers (frames served by data.fetch_ohlc are frozen), keyed by
+# buffer address/shape and dropped when the buffer is freed: a hot frame is hashed once.
+_FINGERPRINTS: Dict[Tuple[int, int, int], Tuple[weakref.ref, str]] = {}
+_FINGERPRINTS_LOCK = threading.Lock()
+
+
+def _root(arr: np.ndarray) -> np.ndarray:
+    while isinstance(arr.base, np.ndarray):
+        arr = arr.base
+    return arr
+
+
+def array_fingerprint(values: np.ndarray) -> str:
+    """
+    Content hash of a 1D price array (indicators depend on the values only, not timestamps).
+    Memoized when the owning buffer is read-only (e.g. fetch_ohlc results).
+    """
+    values = np.asarray(values)
+    root = _root(values)
+    key = None
+    # pandas hands out read-only views of any frame, so check the owning buffer itself
+    if not root.flags.writeable and len(values):
+        key = (values.__array_interface__["data"][0], len(values), values.strides[0])
+        with _FINGERPRINTS_LOCK:
+            memo = _FINGERPRINTS.get(key)
+        if memo is not None and memo[0]() is root:
+            return memo[1]
+
+    h = hashlib.sha1(usedforsecurity=False)
+    h.update(str(values.shape).encode())
+    h.update(np.ascontiguousarray(values, dtype=float).tobytes())
+    fp = h.hexdigest()
+
+    if key is not None:
+        ref = weakref.ref(root, lambda _, key=key: _FINGERPRINTS.pop(key, None))
+        with _FINGERPRINTS_LOCK:
+            _FINGERPRINTS[key] = (ref, fp)
+    return fp
+
+
+def close_fingerprint(df: pd.DataFrame) -> str:
+    """array_fingerprint of the frame's Close column."""
+    return array_fingerprint(df["Close"].to_numpy())
+
+
+def _close(data: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+    if isinstance(data, pd.DataFrame):
+        if "Close" not in data.columns:
+            raise ValueError("Dataframe must contain 'Close' column.")
+        return data["Close"].to_numpy()
+    return np.asarray(data)
+
+
+def _sma(close: np.ndarray, window: int) -> np.ndarray:
+    return pd.Series(close).rolling(window).mean().to_numpy()
+
+
+def _rsi(close: np.ndarray, period: int) -> np.ndarray:
+    from backend.engine.strategies.rsi import rsi
+
+    return rsi(close, period)
+
+
+class IndicatorStore:
+    """
+    Memoized indicator computations over a bounded LRUCache.
+
+    - get() returns the cached array for (close fingerprint, name, params) or computes it
+      from the Close values once and stores a read-only copy.
+    - Inputs are a frame with a Close column or the 1D array of closes itself.
+    - sma()/rsi() are the built-in indicators; their values are identical to
+      ``Close.rolling(window).mean()`` and ``strategies.rsi.rsi``.
+    """
+
+    def __init__(self, max_bytes: int = INDICATOR_CACHE_MAX_BYTES):
+        self._cache = LRUCache(max_bytes=max_bytes)
+
+    def get(
+        self,
+        data: Union[pd.DataFrame, np.ndarray],
+        name: str,
+        params: Tuple[Hashable, ...],
+        compute: Callable[[np.ndarray], np.ndarray],
+    ) -> np.ndarray:
+        close = _close(data)
+        key = (array_fingerprint(close), name, params)
+        hit = self._cache.get(key)
+        if hit is not None:
+            return hit
+
+        values = np.array(compute(close.astype(float, copy=False)), dtype=float)
+        values.flags.writeable = False
+        self._cache.put(key, values, values.nbytes)
+        return values
+
+    def sma(self, data: Union[pd.DataFrame, np.ndarray], window: int) -> np.ndarray:
+        window = int(window)
+        if window < 1:
+            raise ValueError("SMA window must be >= 1.")
+        return self.get(data, "sma", (window,), lambda close: _sma(close, window))
+
+    def rsi(self, data: Union[pd.DataFrame, np.ndarray], period: int) -> np.ndarray:
+        period = int(period)
+        if period < 1:
+            raise ValueError("RSI period must be >= 1.")
+        return self.get(data, "rsi", (period,), lambda close: _rsi(close, period))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+INDICATORS = IndicatorStore()
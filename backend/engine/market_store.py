@@ -0,0 +1,375 @@
+"""
+Offline consolidated market-data store.
+
+One Arrow IPC file holds every symbol's bars, sorted by (symbol, timestamp), next to a small
+JSON index of symbol -> [first row, stop row). Each build writes both into a fresh version
+directory and then swaps the one-line CURRENT pointer (a single atomic rename), so readers
+always see a matching pair and a rebuild never touches the files a reader has mapped.
+Record batches are packed up to BATCH_ROWS rows
+without splitting a symbol (unless it alone is larger), so opening the store memory-maps the
+file and a symbol's bars are a zero-copy slice of one batch; a cross-section for one date
+is a gather over the index. Nothing is parsed per symbol.
+
+    store/
+      CURRENT          name of the live version directory
+      v<time>-<id>/
+        bars.arrow     Symbol, Datetime, Open, High, Low, Close, Volume (uncompressed)
+        index.json     {"interval": "1d", "rows": N, "symbols": {"AAPL": [0, 2516], ...}}
+
+Build one from CSV/parquet files (one file per symbol named after it, or files with a
+Symbol/Ticker column):
+
+    python -m backend.engine.market_store import data/daily/ --out store/ [--interval 1d]
+
+and serve it to fetch_ohlc with ALGOTRADE_DATA_STORE=store/ (or set_provider(
+LocalStoreProvider("store/"))); a rebuilt store is picked up on the next read.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import uuid
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from backend.engine.data import OHLC_COLUMNS, _atomic_write, normalize_ohlc
+
+DATA_FILE = "bars.arrow"
+INDEX_FILE = "index.json"
+CURRENT_FILE = "CURRENT"
+SYMBOL_COLUMNS = ("Symbol", "Ticker")
+SOURCE_SUFFIXES = (".csv", ".parquet")
+BATCH_ROWS = 1 << 20
+
+_SCHEMA = pa.schema(
+    [("Symbol", pa.string()), ("Datetime", pa.timestamp("ns"))]
+    + [(col, pa.float64()) for col in OHLC_COLUMNS]
+)
+
+
+# ---------------------------------------------------------------------
+# Bulk import
+def _read_source(path: Path) -> pd.DataFrame:
+    if path.suffix == ".csv":
+        return pd.read_csv(path)
+    return pd.read_parquet(path)
+
+
+def _source_columns(path: Path) -> List[str]:
+    """Column names only: a CSV header line or a parquet footer schema, never the rows."""
+    if path.suffix == ".csv":
+        return [str(c) for c in pd.read_csv(path, nrows=0).columns]
+    return list(pq.read_schema(path).names)
+
+
+def _clean(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalized bars -> float OHLCV on a naive (UTC if it had a timezone), unique index."""
+    df = df[OHLC_COLUMNS].astype(float)
+    if df.index.tz is not None:
+        df.index = df.index.tz_convert("UTC").tz_localize(None)
+    return df[~df.index.duplicated(keep="last")]
+
+
+def _source_files(sources: Iterable[Union[str, Path]]) -> List[Path]:
+    files: List[Path] = []
+    for src in sources:
+        src = Path(src)
+        if src.is_dir():
+            files += sorted(p for p in src.rglob("*") if p.suffix in SOURCE_SUFFIXES)
+        else:
+            files.append(src)
+    return files
+
+
+def _symbol_frames(files: List[Path]) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    (symbol, frame) in symbol order. Files named after one symbol are only read when that
+    symbol's turn comes; files with a Symbol/Ticker column are read once and split.
+    """
+    by_symbol: Dict[str, List[Union[Path, pd.DataFrame]]] = {}
+    for path in files:
+        symbol_col = next((c.capitalize() for c in _source_columns(path)
+                           if c.capitalize() in SYMBOL_COLUMNS), None)
+        if symbol_col is None:
+            by_symbol.setdefault(path.stem.upper(), []).append(path)
+            continue
+        data = normalize_ohlc(_read_source(path))
+        for symbol, part in data.groupby(symbol_col, sort=False):
+            by_symbol.setdefault(str(symbol), []).append(_clean(part))
+
+    for symbol in sorted(by_symbol):
+        parts = [_clean(normalize_ohlc(_read_source(p))) if isinstance(p, Path) else p
+                 for p in by_symbol.pop(symbol)]
+        df = parts[0] if len(parts) == 1 else pd.concat(parts)
+        if len(parts) > 1:
+            df = df[~df.index.duplicated(keep="last")].sort_index()
+        if not df.empty:
+            yield symbol, df
+
+
+def build_store(
+    sources: Iterable[Union[str, Path]],
+    root: Union[str, Path],
+    interval: str = "1d",
+) -> "MarketDataStore":
+    """
+    Bulk-import CSV/parquet files (or directories of them) into a store at ``root``.
+    Symbols are written one at a time in sorted order, so memory stays at one symbol's
+    bars (plus any multi-symbol source files). Rebuilding replaces the store atomically:
+    the new version only becomes visible when CURRENT is swapped to it. Older versions
+    but the one just replaced (which readers may still be opening) are then removed.
+    """
+    root = Path(root)
+    files = _source_files(sources)
+    if not files:
+        raise ValueError("No CSV/parquet files to import.")
+    previous = _current_version(root)
+    version = root / f"v{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    version.mkdir(parents=True)
+
+    index: Dict[str, List[int]] = {}
+    rows = 0
+
+    def write(tmp: Path) -> None:
+        nonlocal rows
+        pending: List[pa.Table] = []
+        pending_rows = 0
+        with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, _SCHEMA) as writer:
+
+            def flush() -> None:
+                nonlocal pending, pending_rows
+                if pending:
+                    table = pa.concat_tables(pending).combine_chunks()
+                    writer.write_table(table, max_chunksize=max(BATCH_ROWS, table.num_rows))
+                pending, pending_rows = [], 0
+
+            for symbol, df in _symbol_frames(files):
+                n = len(df)
+                if pending_rows + n > BATCH_ROWS:
+                    flush()
+                columns = [
+                    pa.array(np.full(n, symbol, dtype=object), pa.string()),
+                    pa.array(df.index.to_numpy(dtype="datetime64[ns]")),
+                ] + [pa.array(df[col].to_numpy(dtype=float)) for col in OHLC_COLUMNS]
+                pending.append(pa.Table.from_arrays(columns, schema=_SCHEMA))
+                pending_rows += n
+                index[symbol] = [rows, rows + n]
+                rows += n
+            flush()
+
+    write(version / DATA_FILE)
+    payload = {"interval": interval, "rows": rows, "symbols": index}
+    (version / INDEX_FILE).write_text(json.dumps(payload))
+    _atomic_write(root / CURRENT_FILE, lambda tmp: tmp.write_text(version.name))
+    _prune_versions(root, keep={version, previous})
+    return MarketDataStore(root)
+
+
+def _current_version(root: Path) -> Path:
+    """The live version directory (the root itself for a store built before versioning)."""
+    try:
+        return root / (root / CURRENT_FILE).read_text().strip()
+    except FileNotFoundError:
+        return root
+
+
+def _prune_versions(root: Path, keep: set) -> None:
+    for path in root.glob("v*"):
+        if path.is_dir() and path not in keep:
+            shutil.rmtree(path, ignore_errors=True)   # mapped files stay readable (POSIX)
+    if root not in keep:                              # unversioned files of an old layout
+        for name in (DATA_FILE, INDEX_FILE):
+            (root / name).unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------
+class MarketDataStore:
+    """
+    Read side of the store: the bars file is memory-mapped once and every read is a view.
+
+    - symbols() / interval / rows: what the index holds
+    - read(symbol, start, end): the symbol's bars in [start, end) as a frame over read-only
+      arrays backed by the mapping (no copy; safe to share like fetch_ohlc results)
+    - cross_section(when): one row per symbol with a bar at ``when`` (or the last bar at or
+      before it with asof=True)
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self.path = _current_version(self.root)       # the version this instance maps
+        meta = json.loads((self.path / INDEX_FILE).read_text())
+        self.interval: str = meta["interval"]
+        self.rows: int = meta["rows"]
+        self._ranges: Dict[str, Tuple[int, int]] = {
+            s: (int(lo), int(hi)) for s, (lo, hi) in meta["symbols"].items()
+        }
+        self._table = pa.ipc.open_file(pa.memory_map(str(self.path / DATA_FILE), "r")).read_all()
+        lengths = [len(c) for c in self._table.column("Close").chunks]
+        self._batch_starts = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+        self._batches: Dict[Tuple[str, int], np.ndarray] = {}
+
+    def _values(self, name: str, lo: int, hi: int) -> np.ndarray:
+        """Rows [lo, hi) of a column: a view into the mapping when they sit in one batch."""
+        b = int(np.searchsorted(self._batch_starts, lo, side="right")) - 1
+        start, stop = self._batch_starts[b], self._batch_starts[b + 1]
+        if hi <= stop:
+            values = self._batches.get((name, b))
+            if values is None:
+                chunk = self._table.column(name).chunk(b)
+                values = self._batches[(name, b)] = chunk.to_numpy(zero_copy_only=True)
+            return values[lo - start : hi - start]
+        values = self._table.column(name).slice(lo, hi - lo).to_numpy()  # spans batches
+        values.flags.writeable = False
+        return values
+
+    def _gather(self, name: str, rows: np.ndarray) -> np.ndarray:
+        """Column values at arbitrary (sorted) rows, copied out batch by batch."""
+        batch = np.searchsorted(self._batch_starts, rows, side="right") - 1
+        out = np.empty(len(rows), dtype=self._table.schema.field(name).type.to_pandas_dtype())
+        for b in np.unique(batch):
+            start, stop = self._batch_starts[b], self._batch_starts[b + 1]
+            sel = batch == b
+            out[sel] = self._values(name, start, stop)[rows[sel] - start]
+        return out
+
+    def symbols(self) -> List[str]:
+        return list(self._ranges)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._ranges
+
+    def _rows(self, symbol: str, start: Optional[date], end: Optional[date]) -> slice:
+        try:
+            lo, hi = self._ranges[symbol]
+        except KeyError:
+            raise ValueError(f"Symbol not in store: {symbol}") from None
+        ts = self._values("Datetime", lo, hi)
+        if start is not None:
+            lo += int(ts.searchsorted(np.datetime64(pd.Timestamp(start), "ns")))
+        if end is not None:
+            hi -= len(ts) - int(ts.searchsorted(np.datetime64(pd.Timestamp(end), "ns")))
+        return slice(lo, max(lo, hi))
+
+    def read(
+        self,
+        symbol: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> pd.DataFrame:
+        rows = self._rows(symbol, start, end)
+        index = pd.DatetimeIndex(self._values("Datetime", rows.start, rows.stop), name="Datetime")
+        return pd.DataFrame(
+            {col: self._values(col, rows.start, rows.stop) for col in OHLC_COLUMNS},
+            index=index,
+            copy=False,
+        )
+
+    def cross_section(self, when, asof: bool = False) -> pd.DataFrame:
+        """Bars of every symbol at timestamp ``when`` (index: Symbol, column Datetime too)."""
+        when = np.datetime64(pd.Timestamp(when), "ns")
+        symbols = np.array(list(self._ranges), dtype=object)
+        firsts = np.fromiter((lo for lo, _ in self._ranges.values()), np.int64, len(symbols))
+
+        # bars at or before `when` per symbol: one vectorized pass over each record batch
+        # (rows are symbol-sorted, so every symbol is a run of consecutive rows)
+        before = np.zeros(len(symbols), dtype=np.int64)
+        for start, stop in zip(self._batch_starts[:-1], self._batch_starts[1:], strict=True):
+            first = int(np.searchsorted(firsts, start, side="right")) - 1
+            last = int(np.searchsorted(firsts, stop))
+            cuts = np.maximum(firsts[first:last], start) - start
+            ts = self._values("Datetime", start, stop)
+            before[first:last] += np.add.reduceat(ts <= when, cuts, dtype=np.int64)
+
+        found = before > 0
+        rows = firsts[found] + before[found] - 1
+        out = pd.DataFrame(
+            {col: self._gather(col, rows) for col in ["Datetime"] + OHLC_COLUMNS},
+            index=pd.Index(symbols[found], name="Symbol", dtype=object),
+        )
+        return out if asof else out[out["Datetime"] == when]
+
+
+class LocalStoreProvider:
+    """
+    DataProvider serving a MarketDataStore. ``local = True`` tells fetch_ohlc to read it
+    directly instead of copying bars into the parquet download cache. Given a directory it
+    serves whatever version is current there (see open_store); given a MarketDataStore it
+    stays on that one.
+    """
+
+    local = True
+
+    def __init__(self, store: Union[MarketDataStore, str, Path]):
+        self._store = store if isinstance(store, MarketDataStore) else None
+        self._root = None if self._store is not None else Path(store)
+
+    @property
+    def store(self) -> MarketDataStore:
+        return self._store if self._store is not None else open_store(self._root)
+
+    def download(self, symbol: str, start: date, end: date, interval: str) -> pd.DataFrame:
+        store = self.store
+        if interval != store.interval:
+            raise ValueError(f"Store holds {store.interval} bars, not {interval} ({store.root})")
+        if symbol not in store:
+            return pd.DataFrame(columns=OHLC_COLUMNS, index=pd.DatetimeIndex([], name="Datetime"))
+        return store.read(symbol, start, end)
+
+
+_STORES: Dict[Path, Tuple[Tuple[int, int], MarketDataStore]] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def _stamp(root: Path) -> Tuple[int, int]:
+    # every swap renames a new CURRENT into place: new inode, new mtime
+    try:
+        st = (root / CURRENT_FILE).stat()
+    except FileNotFoundError:
+        st = (root / INDEX_FILE).stat()
+    return st.st_ino, st.st_mtime_ns
+
+
+def open_store(root: Union[str, Path]) -> MarketDataStore:
+    """
+    MarketDataStore for ``root``'s current version, mapped once per process and per
+    version: one stat of the CURRENT pointer per call, a fresh mapping after a rebuild.
+    """
+    root = Path(root).resolve()
+    stamp = _stamp(root)
+    with _STORES_LOCK:
+        cached = _STORES.get(root)
+        if cached is None or cached[0] != stamp:
+            cached = _STORES[root] = (stamp, MarketDataStore(root))
+        return cached[1]
+
+
+# ---------------------------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.engine.market_store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_imp = sub.add_parser("import", help="bulk-import CSV/parquet files into a store")
+    p_imp.add_argument("sources", nargs="+", help="files or directories")
+    p_imp.add_argument("--out", required=True, help="store directory")
+    p_imp.add_argument("--interval", default="1d")
+    args = parser.parse_args(argv)
+
+    store = build_store(args.sources, args.out, interval=args.interval)
+    size = os.path.getsize(store.path / DATA_FILE)
+    print(f"{len(store.symbols()):,} symbols, {store.rows:,} bars, {size / 1e6:.1f} MB "
+          f"-> {store.root}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Optional
+
 import numpy as np
 import pandas as pd
 
@@ -55,6 +57,140 @@ def compute_metrics(
     }
 
 
+def compute_metrics_batch(
+    equity: np.ndarray,
+    rf_rate_pct: float = 0.0,
+    freq: str = "D",
+) -> dict:
+    """
+    Vectorized compute_metrics over many equity curves at once.
+    - equity: 2D array (curves x bars), each row a cumulative equity curve (starts at 1)
+    Returns the same keys as compute_metrics, each mapped to a 1D array (one value per row).
+    """
+    equity = np.asarray(equity, dtype=float)
+    if equity.ndim != 2:
+        raise ValueError("Equity matrix must be 2D (curves x bars).")
+    if equity.shape[1] < 2:
+        raise ValueError("Not enough data for metrics.")
+
+    rets = equity[:, 1:] / equity[:, :-1] - 1
+
+    periods_per_year = {"D": 252, "M": 12}.get(freq.upper(), 252)
+    rf_rate = rf_rate_pct / 100.0
+
+    mean = rets.mean(axis=1)
+    std = rets.std(axis=1, ddof=1) if rets.shape[1] > 1 else np.full(len(rets), np.nan)
+    ann_return = (1 + mean) ** periods_per_year - 1
+    ann_vol = std * np.sqrt(periods_per_year)
+
+    # excess returns only shift the mean; their std equals the raw std
+    sharpe = np.sqrt(periods_per_year) * (mean - rf_rate / periods_per_year) / (std + 1e-12)
+
+    roll_max = np.maximum.accumulate(equity, axis=1)
+    max_dd = (equity / roll_max - 1).min(axis=1)
+
+    win_rate = (rets > 0).mean(axis=1) * 100
+
+    return {
+        "ann_return_pct": np.round(ann_return * 100, 2),
+        "ann_vol_pct": np.round(ann_vol * 100, 2),
+        "sharpe": np.round(sharpe, 2),
+        "max_drawdown_pct": np.round(max_dd * 100, 2),
+        "win_rate_pct": np.round(win_rate, 2),
+    }
+
+
+class StreamingMetrics:
+    """
+    Incremental compute_metrics for an equity curve that grows one bar at a time.
+
+    Each update is O(1): return mean/variance via Welford, running peak and max drawdown,
+    and a count of positive returns. snapshot() returns the same keys (and rounding) as
+    compute_metrics on the full history. NaN equity values are skipped, like dropna().
+    """
+
+    def __init__(self, rf_rate_pct: float = 0.0, freq: str = "D"):
+        self.periods_per_year = {"D": 252, "M": 12}.get(freq.upper(), 252)
+        self.rf_rate = rf_rate_pct / 100.0
+        self.n = 0                  # number of returns seen
+        self.mean = 0.0             # running mean of returns
+        self.m2 = 0.0               # running sum of squared deviations (Welford)
+        self.wins = 0
+        self.last: Optional[float] = None
+        self.peak: Optional[float] = None
+        self.max_dd = 0.0
+
+    def update(self, equity: float) -> None:
+        equity = float(equity)
+        if equity != equity:  # NaN
+            return
+        if self.last is not None:
+            r = equity / self.last - 1
+            self.n += 1
+            delta = r - self.mean
+            self.mean += delta / self.n
+            self.m2 += delta * (r - self.mean)
+            if r > 0:
+                self.wins += 1
+        self.last = equity
+
+        if self.peak is None or equity > self.peak:
+            self.peak = equity
+        dd = equity / self.peak - 1
+        if dd < self.max_dd:
+            self.max_dd = dd
+
+    def update_many(self, equity: np.ndarray) -> None:
+        """Vectorized equivalent of calling update() for each value (parallel Welford merge)."""
+        values = np.asarray(equity, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        seq = values if self.last is None else np.concatenate(([self.last], values))
+        rets = seq[1:] / seq[:-1] - 1
+        if len(rets):
+            n_b = len(rets)
+            mean_b = rets.mean()
+            m2_b = ((rets - mean_b) ** 2).sum()
+            n = self.n + n_b
+            delta = mean_b - self.mean
+            self.mean += delta * n_b / n
+            self.m2 += m2_b + delta * delta * self.n * n_b / n
+            self.n = n
+            self.wins += int((rets > 0).sum())
+        self.last = float(values[-1])
+
+        start = values[0] if self.peak is None else self.peak
+        peaks = np.maximum.accumulate(np.concatenate(([start], values)))[1:]
+        self.peak = float(peaks[-1])
+        self.max_dd = min(self.max_dd, float((values / peaks - 1).min()))
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else float("nan")
+
+    def snapshot(self) -> dict:
+        if self.last is None:
+            raise ValueError("Equity series is empty.")
+        if self.n == 0:
+            raise ValueError("Not enough data for metrics.")
+
+        ppy = self.periods_per_year
+        ann_return = (1 + self.mean) ** ppy - 1
+        ann_vol = self.std * np.sqrt(ppy)
+        sharpe = np.sqrt(ppy) * (self.mean - self.rf_rate / ppy) / (self.std + 1e-12)
+        win_rate = self.wins / self.n * 100
+
+        return {
+            "ann_return_pct": float(round(ann_return * 100, 2)),
+            "ann_vol_pct": float(round(ann_vol * 100, 2)),
+            "sharpe": float(round(sharpe, 2)),
+            "max_drawdown_pct": float(round(self.max_dd * 100, 2)),
+            "win_rate_pct": float(round(win_rate, 2)),
+        }
+
+
 def compute_buy_and_hold(df: pd.DataFrame) -> float:
     """Return total % return of buy-and-hold."""
     if "Close" not in df.columns:
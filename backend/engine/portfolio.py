@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class PriceMatrix:
+    """
+    Closes of many symbols on one shared calendar.
+    - close: float array (bars x symbols); NaN before a symbol's first bar, forward-filled
+      over holidays/gaps after it
+    """
+    index: pd.DatetimeIndex
+    symbols: List[str]
+    close: np.ndarray
+
+    @property
+    def available(self) -> np.ndarray:
+        """Boolean (bars x symbols): True once the symbol has a price."""
+        return ~np.isnan(self.close)
+
+
+@dataclass
+class PortfolioOutput:
+    index: pd.DatetimeIndex
+    symbols: List[str]
+    equity: np.ndarray                  # combined equity per bar (starts at 1)
+    returns: np.ndarray                 # net portfolio return per bar
+    turnover: np.ndarray                # sum of |weight change| per bar
+    costs: np.ndarray                   # friction charged per bar (fraction of equity)
+    contributions: np.ndarray           # (bars x symbols) gross return contributed by each asset
+    trades: int = 0                     # (bar, symbol) weight changes
+
+    def equity_series(self) -> pd.Series:
+        return pd.Series(self.equity, index=self.index, name="equity")
+
+    def contribution_totals(self) -> Dict[str, float]:
+        """Per-symbol sum of return contributions over the whole run (additive, in fractions)."""
+        return dict(zip(self.symbols, self.contributions.sum(axis=0).tolist(), strict=True))
+
+
+def align_closes(frames: Mapping[str, pd.DataFrame]) -> PriceMatrix:
+    """
+    Align each frame's Close on the union of their timestamps into one (bars x symbols)
+    matrix. Prices are forward-filled after a symbol's first bar; earlier bars stay NaN.
+    """
+    if not frames:
+        raise ValueError("No price frames to align.")
+    for symbol, df in frames.items():
+        if "Close" not in df.columns:
+            raise ValueError(f"Price dataframe for {symbol} must contain a 'Close' column.")
+
+    closes = pd.concat({symbol: df["Close"] for symbol, df in frames.items()}, axis=1)
+    closes = closes.sort_index().ffill()
+    return PriceMatrix(
+        index=pd.DatetimeIndex(closes.index),
+        symbols=[str(s) for s in closes.columns],
+        close=closes.to_numpy(dtype=float),
+    )
+
+
+def simulate_portfolio(
+    close: np.ndarray,
+    weights: np.ndarray,
+    cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+    index: Optional[pd.DatetimeIndex] = None,
+    symbols: Optional[List[str]] = None,
+) -> PortfolioOutput:
+    """
+    Vectorized multi-asset simulation of target weights (same conventions as
+    simulate_long_only, which it reproduces for one symbol with 0/1 weights):
+
+    - weights[t] are decided on bar t and earn each asset's close-to-close return of bar t+1
+    - weights are targets held every bar (rebalanced to target; drift is not charged)
+    - (cost_bps + slippage_bps)/10000 * sum|w[t] - w[t-1]| is charged on bar t
+    - NaN prices (before a symbol's first bar) contribute nothing and must carry weight 0
+    """
+    close = np.asarray(close, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    if close.ndim != 2 or weights.shape != close.shape:
+        raise ValueError("close and weights must both be 2D (bars x symbols) of the same shape.")
+    if close.shape[0] < 2:
+        raise ValueError("Need at least 2 bars to simulate.")
+    if np.isnan(weights).any():
+        raise ValueError("Weights contain NaNs.")
+    missing = np.isnan(close)
+    if (weights[missing] != 0).any():
+        raise ValueError("Non-zero weight on a bar where the symbol has no price.")
+
+    asset_ret = np.zeros_like(close)
+    np.divide(close[1:], close[:-1], out=asset_ret[1:])
+    asset_ret[1:] -= 1.0
+    np.nan_to_num(asset_ret, copy=False, nan=0.0)
+
+    # next-bar execution: weights held at t-1 earn the returns of bar t
+    contributions = np.zeros_like(close)
+    np.multiply(weights[:-1], asset_ret[1:], out=contributions[1:])
+
+    changes = np.abs(np.diff(weights, axis=0))
+    turnover = np.zeros(close.shape[0])
+    turnover[1:] = changes.sum(axis=1)
+    costs = turnover * (cost_bps + slippage_bps) / 10000.0
+
+    returns = contributions.sum(axis=1) - costs
+    equity = np.cumprod(1.0 + returns)
+
+    n_bars, n_symbols = close.shape
+    return PortfolioOutput(
+        index=index if index is not None else pd.RangeIndex(n_bars),
+        symbols=symbols if symbols is not None else [str(i) for i in range(n_symbols)],
+        equity=equity,
+        returns=returns,
+        turnover=turnover,
+        costs=costs,
+        contributions=contributions,
+        trades=int(np.count_nonzero(changes)),
+    )
+
+
+def static_weights(
+    prices: PriceMatrix,
+    weights: Optional[Mapping[str, float]] = None,
+) -> np.ndarray:
+    """
+    Constant target weights broadcast over the calendar (equal weight if not given),
+    zeroed on bars where a symbol has no price yet.
+    """
+    if weights is None:
+        row = np.full(len(prices.symbols), 1.0 / len(prices.symbols))
+    else:
+        unknown = set(weights) - set(prices.symbols)
+        if unknown:
+            raise ValueError(f"Weights for unknown symbols: {sorted(unknown)}")
+        row = np.array([float(weights.get(s, 0.0)) for s in prices.symbols])
+    return np.where(prices.available, row, 0.0)
+
+
+def signal_matrix(prices: PriceMatrix, signals: Mapping[str, pd.Series]) -> np.ndarray:
+    """
+    Per-symbol signal series (e.g. from build_signal on each symbol's own frame) aligned to
+    the shared calendar: held over bars a symbol does not trade, 0 before its first signal.
+    """
+    missing = set(prices.symbols) - set(signals)
+    if missing:
+        raise ValueError(f"No signal for symbols: {sorted(missing)}")
+    aligned = pd.concat({s: signals[s] for s in prices.symbols}, axis=1)
+    aligned = aligned.reindex(prices.index).ffill().fillna(0)
+    return aligned.to_numpy(dtype=float)
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from backend.engine.batch import _mp_context
+from backend.engine.metrics import compute_metrics_batch
+
+# ---------------------------------------------------------------------
+# Monte Carlo robustness of one backtest
+#
+# Resampled histories are built from the backtest's per-bar net returns as a (paths x bars)
+# index matrix, gathered, compounded and scored with compute_metrics_batch in one pass per
+# chunk of paths. Chunks get independent child seeds (SeedSequence.spawn), so results for a
+# given seed and chunk size do not depend on how many workers ran them.
+METHODS = ("block_bootstrap", "trade_shuffle")
+ROBUSTNESS_METRICS = ("sharpe", "max_drawdown_pct", "ann_return_pct")
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+CHUNK_BYTES = 64 * 1024 * 1024          # working memory per chunk of paths
+
+
+def default_block(n_bars: int) -> int:
+    """Rule-of-thumb block length n^(1/3) for the stationary block bootstrap."""
+    return max(1, int(round(n_bars ** (1 / 3))))
+
+
+def block_bootstrap_indices(
+    rng: np.random.Generator, n_bars: int, n_paths: int, block: int
+) -> np.ndarray:
+    """
+    Circular block bootstrap: each path is ceil(n/block) blocks of ``block`` consecutive bars
+    starting at uniform random bars (wrapping around the end), cut to ``n_bars``.
+    """
+    n_blocks = -(-n_bars // block)
+    starts = rng.integers(0, n_bars, size=(n_paths, n_blocks))
+    idx = starts[:, :, None] + np.arange(block)
+    idx %= n_bars
+    return idx.reshape(n_paths, n_blocks * block)[:, :n_bars]
+
+
+def trade_segments(signal: np.ndarray) -> np.ndarray:
+    """
+    Start bar of each segment of constant signal: the in-trade and flat runs between fills.
+    A segment starts on the bar its fill is charged (where the signal changes).
+    """
+    signal = np.asarray(signal)
+    return np.concatenate(([0], np.flatnonzero(np.diff(signal)) + 1))
+
+
+def trade_shuffle_indices(
+    rng: np.random.Generator, starts: np.ndarray, n_bars: int, n_paths: int
+) -> np.ndarray:
+    """
+    Random reorderings of whole segments (bars keep their order inside a segment), built
+    without a per-path loop: permuted segment lengths give each segment's new offset, and
+    np.repeat expands the per-segment shifts to bars.
+    """
+    lengths = np.diff(np.append(starts, n_bars))
+    perm = np.argsort(rng.random((n_paths, len(starts))), axis=1)
+    new_lengths = lengths[perm]
+    new_starts = np.cumsum(new_lengths, axis=1) - new_lengths
+    shift = np.repeat((starts[perm] - new_starts).ravel(), new_lengths.ravel())
+    return shift.reshape(n_paths, n_bars) + np.arange(n_bars)
+
+
+def _resample_chunk(
+    net: np.ndarray,
+    method: str,
+    n_paths: int,
+    seed: np.random.SeedSequence,
+    block: int,
+    starts: Optional[np.ndarray],
+    rf_rate_pct: float,
+    freq: str,
+) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    n = len(net)
+    if method == "block_bootstrap":
+        idx = block_bootstrap_indices(rng, n, n_paths, block)
+    else:
+        idx = trade_shuffle_indices(rng, starts, n, n_paths)
+
+    equity = np.empty((n_paths, n + 1))
+    equity[:, 0] = 1.0
+    np.add(net[idx], 1.0, out=equity[:, 1:])
+    del idx
+    np.cumprod(equity[:, 1:], axis=1, out=equity[:, 1:])
+    metrics = compute_metrics_batch(equity, rf_rate_pct=rf_rate_pct, freq=freq)
+    return {k: metrics[k] for k in ROBUSTNESS_METRICS}
+
+
+@dataclass
+class RobustnessOutput:
+    method: str
+    n_paths: int
+    block: Optional[int]                # bootstrap block length (None for trade_shuffle)
+    samples: Dict[str, np.ndarray]      # metric -> one value per resampled path
+
+    def interval(self, metric: str, confidence: float = 0.95) -> tuple:
+        """Percentile confidence interval of ``metric`` across paths."""
+        tail = (1 - confidence) / 2
+        lo, hi = np.nanquantile(self.samples[metric], [tail, 1 - tail])
+        return float(lo), float(hi)
+
+    def summary(self, observed: Dict[str, float], confidence: float = 0.95) -> Dict[str, Dict]:
+        """
+        Per metric: observed value, mean/std over paths, the confidence interval, quantiles
+        and the share of paths that came out below the observed value.
+        """
+        out = {}
+        for metric in ROBUSTNESS_METRICS:
+            values = self.samples[metric]
+            lo, hi = self.interval(metric, confidence)
+            q = np.nanquantile(values, QUANTILES)
+            out[metric] = {
+                "observed": float(observed[metric]),
+                "mean": float(np.nanmean(values)),
+                "std": float(np.nanstd(values)),
+                "lower": lo,
+                "upper": hi,
+                "quantiles": {f"{p:g}": float(v) for p, v in zip(QUANTILES, q, strict=True)},
+                "below_observed_pct": float(np.mean(values < observed[metric]) * 100),
+            }
+        return out
+
+
+def resample_metrics(
+    net: np.ndarray,
+    method: str = "block_bootstrap",
+    n_paths: int = 1000,
+    block: Optional[int] = None,
+    signal: Optional[Sequence[int]] = None,
+    seed: Optional[int] = None,
+    rf_rate_pct: float = 0.0,
+    freq: str = "D",
+    chunk_paths: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[float, float], None]] = None,
+) -> RobustnessOutput:
+    """
+    Distributions of Sharpe, max drawdown and annual return over resampled histories.
+
+    - net: per-bar net returns of a backtest (equity[t] / equity[t-1] - 1)
+    - method "block_bootstrap": circular blocks of ``block`` bars (default n^(1/3)), which
+      keeps short-range autocorrelation such as volatility clusters
+    - method "trade_shuffle": the segments between fills (``signal`` required) in random
+      order, which keeps every trade intact but reshuffles when it happened; mean-based
+      metrics (Sharpe, annual return) are order-free, so only the drawdown spreads out
+    - chunk_paths: paths simulated per 2D block (default: as many as fit CHUNK_BYTES)
+    - max_workers: > 1 runs chunks on a process pool; results are the same either way
+    - progress(done, total) is called with the chunks finished so far
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method} (expected one of {list(METHODS)})")
+    net = np.asarray(net, dtype=float)
+    if net.ndim != 1 or len(net) < 2:
+        raise ValueError("Need at least 2 per-bar returns.")
+    if np.isnan(net).any():
+        raise ValueError("Returns contain NaNs.")
+    if n_paths < 1:
+        raise ValueError("n_paths must be >= 1.")
+
+    n = len(net)
+    starts = None
+    if method == "block_bootstrap":
+        block = default_block(n) if block is None else int(block)
+        if not 1 <= block <= n:
+            raise ValueError("block must be between 1 and the number of bars.")
+    else:
+        if signal is None:
+            raise ValueError("trade_shuffle needs the backtest's signal.")
+        signal = np.asarray(signal)
+        if len(signal) != n:
+            raise ValueError("Signal and returns must have the same length.")
+        starts = trade_segments(signal)
+        block = None
+
+    if chunk_paths is None:
+        # index matrix (int64) + equity matrix + metric temporaries, ~4 arrays of n floats
+        chunk_paths = max(1, CHUNK_BYTES // (32 * (n + 1)))
+    sizes = [min(chunk_paths, n_paths - i) for i in range(0, n_paths, chunk_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [
+        (net, method, size, child, block, starts, rf_rate_pct, freq)
+        for size, child in zip(sizes, seeds, strict=True)
+    ]
+
+    parts: List[Dict[str, np.ndarray]] = []
+    if max_workers is not None and max_workers > 1 and len(sizes) > 1:
+        # clean forkserver/spawn workers: forking the threaded server can deadlock them
+        workers = min(max_workers, len(sizes))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context()) as pool:
+            for part in pool.map(_resample_chunk, *zip(*args, strict=True)):
+                parts.append(part)
+                if progress is not None:
+                    progress(len(parts), len(sizes))
+    else:
+        for a in args:
+            parts.append(_resample_chunk(*a))
+            if progress is not None:
+                progress(len(parts), len(sizes))
+
+    samples = {k: np.concatenate([p[k] for p in parts]) for k in ROBUSTNESS_METRICS}
+    return RobustnessOutput(method=method, n_paths=n_paths, block=block, samples=samples)
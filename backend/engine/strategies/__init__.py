@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import importlib
+import itertools
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------------------------------
+# Strategy registry
+#
+# Each strategy declares its parameters, how many bars of history it needs before its
+# signal is meaningful (lookback), and a vectorized signal function
+#   signals(close: np.ndarray, **params) -> np.ndarray of {0, 1}, one value per bar
+# living in a module that is only imported the first time the strategy is used. Optionally
+# it also names, in the same module:
+#   indicators(close, **params) -> {name: np.ndarray}    the lines it trades on, for charts
+#   grid_signals(close, **{param: [values]}) -> (params list, int8 (params x bars) matrix)
+#       every combination at once, sharing indicator work (walk-forward); without it each
+#       combination is one signals() call
+#   state(**params) -> object with update(close) -> 0/1   bar-by-bar signal (streaming and
+#       chunked runs); without it the strategy is vectorized-only
+
+
+@dataclass(frozen=True)
+class ParamSpec:
+    name: str
+    type: type = float                  # int or float
+    default: float = 0.0
+    ge: Optional[float] = None
+    le: Optional[float] = None
+    description: str = ""
+
+    def coerce(self, value) -> float:
+        if self.type is int and float(value) != int(float(value)):
+            raise ValueError(f"{self.name} must be an integer.")
+        value = self.type(value)
+        if self.ge is not None and value < self.ge:
+            raise ValueError(f"{self.name} must be >= {self.ge:g}.")
+        if self.le is not None and value > self.le:
+            raise ValueError(f"{self.name} must be <= {self.le:g}.")
+        return value
+
+
+@dataclass(frozen=True)
+class StrategySpec:
+    name: str
+    module: str                                     # imported lazily on first use
+    function: str                                   # signals(close, **params) in ``module``
+    params: Tuple[ParamSpec, ...]
+    lookback: Callable[[Dict[str, float]], int]     # warm-up bars needed for given params
+    description: str = ""
+    indicators: Optional[str] = None                # indicators(close, **params) in ``module``
+    indicator_pane: str = "price"                   # "price" (Close's scale) or "separate"
+    grid_signals: Optional[str] = None              # grid_signals(close, **grid) in ``module``
+    state: Optional[str] = None                     # state(**params) in ``module``
+    _loaded: Dict[str, Callable] = field(default_factory=dict, compare=False, repr=False)
+
+    def resolve(self, params: Mapping[str, float]) -> Dict[str, float]:
+        """Defaults filled in, values cast and bounds-checked; unknown names are rejected."""
+        unknown = set(params) - {p.name for p in self.params}
+        if unknown:
+            raise ValueError(f"Unknown params for {self.name}: {sorted(unknown)}")
+        return {p.name: p.coerce(params.get(p.name, p.default)) for p in self.params}
+
+    def resolve_grid(self, grid: Mapping[str, Sequence[float]]) -> Dict[str, List[float]]:
+        """
+        Candidate values per param (the default alone where ``grid`` has none), each cast
+        and bounds-checked; unknown names are rejected.
+        """
+        unknown = set(grid) - {p.name for p in self.params}
+        if unknown:
+            raise ValueError(f"Unknown params for {self.name}: {sorted(unknown)}")
+        return {
+            p.name: [p.coerce(v) for v in grid.get(p.name, [p.default])] for p in self.params
+        }
+
+    def _function(self, name: str) -> Callable:
+        fn = self._loaded.get(name)
+        if fn is None:
+            fn = getattr(importlib.import_module(self.module), name)
+            self._loaded[name] = fn
+        return fn
+
+    def signals(self) -> Callable[..., np.ndarray]:
+        return self._function(self.function)
+
+    def indicator_values(
+        self, close: np.ndarray, params: Mapping[str, float]
+    ) -> Dict[str, np.ndarray]:
+        """Named indicator series behind the signal (empty if the strategy declares none)."""
+        if self.indicators is None:
+            return {}
+        return self._function(self.indicators)(close, **self.resolve(params))
+
+    def signal_grid(
+        self, close: np.ndarray, grid: Mapping[str, Sequence[float]]
+    ) -> Tuple[List[Dict[str, float]], np.ndarray]:
+        """
+        Signals for every combination of ``grid`` as an int8 (params x bars) matrix, plus
+        the params of each row. Combinations the strategy rejects (e.g. fast >= slow) are
+        skipped; none left is an error.
+        """
+        values = self.resolve_grid(grid)
+        if self.grid_signals is not None:
+            return self._function(self.grid_signals)(close, **values)
+
+        params, rows = [], []
+        for combo in itertools.product(*values.values()):
+            p = dict(zip(values, combo, strict=True))
+            try:
+                rows.append(np.asarray(self.signals()(close, **p), dtype=np.int8))
+            except ValueError:
+                continue
+            params.append(p)
+        if not rows:
+            raise ValueError(f"No valid {self.name} parameter combinations in the grid.")
+        return params, np.stack(rows)
+
+    def signal_state(self, params: Mapping[str, float]):
+        """Bar-by-bar signal state: ``update(close) -> 0/1`` per bar, same as signals()."""
+        if self.state is None:
+            raise ValueError(f"Strategy {self.name} has no bar-by-bar (streaming) version.")
+        return self._function(self.state)(**self.resolve(params))
+
+    def warmup_bars(self, params: Mapping[str, float]) -> int:
+        return int(self.lookback(self.resolve(params)))
+
+
+STRATEGIES: Dict[str, StrategySpec] = {}
+
+
+def register(spec: StrategySpec) -> StrategySpec:
+    STRATEGIES[spec.name] = spec
+    return spec
+
+
+def get_strategy(name: str) -> StrategySpec:
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unsupported strategy: {name}") from None
+
+
+def available_strategies() -> List[str]:
+    return sorted(STRATEGIES)
+
+
+register(
+    StrategySpec(
+        name="sma_crossover",
+        module="backend.engine.strategies.sma",
+        function="sma_crossover_signals",
+        params=(
+            ParamSpec("fast", int, 10, ge=1, description="Fast SMA window (bars)"),
+            ParamSpec("slow", int, 30, ge=2, description="Slow SMA window (bars), > fast"),
+        ),
+        # the slow SMA is first defined on its ``slow``-th close, so ``slow`` bars of history
+        # give a valid signal on the bar before start (the position held into the range)
+        lookback=lambda p: p["slow"],
+        description="Long while the fast SMA is above the slow SMA.",
+        indicators="sma_crossover_indicators",
+        grid_signals="sma_crossover_signal_grid",
+        state="sma_crossover_state",
+    )
+)
+
+register(
+    StrategySpec(
+        name="rsi",
+        module="backend.engine.strategies.rsi",
+        function="rsi_signals",
+        params=(
+            ParamSpec("period", int, 14, ge=1, description="RSI smoothing period (bars)"),
+            ParamSpec("lower", float, 30, ge=0, le=100, description="Enter long below"),
+            ParamSpec("upper", float, 70, ge=0, le=100, description="Exit above"),
+        ),
+        # Wilder smoothing never fully forgets its seed; after 10 periods the seed's weight
+        # is below (1 - 1/period)^(10 * period) < e^-10
+        lookback=lambda p: 10 * p["period"],
+        description="RSI mean reversion: long below ``lower``, flat above ``upper``.",
+        indicators="rsi_indicators",
+        indicator_pane="separate",
+        grid_signals="rsi_signal_grid",
+        state="rsi_state",
+    )
+)
+
+
+def build_signal(df: pd.DataFrame, strategy: str, params: Dict[str, float]) -> pd.Series:
+    """
+    Dispatch a strategy name + params dict (as sent to /backtest) to its registered
+    signal function. Returns the int signal state per bar named "signal".
+    """
+    spec = get_strategy(strategy)
+    if "Close" not in df.columns:
+        raise ValueError("Dataframe must contain 'Close' column.")
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise ValueError("Index must be a DatetimeIndex (got %r)" % type(df.index))
+
+    values = spec.signals()(df["Close"].to_numpy(), **spec.resolve(params))
+    return pd.Series(np.asarray(values).astype(int), index=df.index, name="signal")
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.engine.indicators import INDICATORS
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Wilder RSI (EWM smoothing with alpha=1/period) on a plain array of closes.
+    The first bar has no change and is NaN.
+    """
+    close = np.asarray(close, dtype=float)
+    delta = np.diff(close, prepend=np.nan)
+    up = np.clip(delta, 0, None)
+    down = -np.clip(delta, None, 0)
+    # pandas' compiled EWM kernel; wrapping the arrays is zero-copy
+    roll_up = pd.Series(up).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+    roll_down = pd.Series(down).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+    rs = roll_up / (roll_down + 1e-12)
+    return 100 - (100 / (1 + rs))
+
+
+def band_hysteresis(r: np.ndarray, lower: float, upper: float) -> np.ndarray:
+    """
+    Hysteresis state machine without a Python loop:
+      enter (1) when r < lower, exit (0) when r > upper, otherwise keep the previous state.
+    Entries/exits are marked, then the last mark is forward-filled. Bar 0 always starts flat.
+    """
+    r = np.asarray(r, dtype=float)
+    n = len(r)
+    if n == 0:
+        return np.zeros(0, dtype=int)
+
+    state = np.full(n, -1, dtype=np.int8)   # -1 = no event on this bar
+    state[r > upper] = 0
+    state[r < lower] = 1                     # entry checked first, as in the bar-by-bar rule
+    state[0] = 0
+
+    # forward-fill: index of the last bar that carried an event
+    last = np.where(state >= 0, np.arange(n), 0)
+    np.maximum.accumulate(last, out=last)
+    return state[last].astype(int)
+
+
+def rsi_signals(
+    close: np.ndarray, period: int = 14, lower: float = 30, upper: float = 70
+) -> np.ndarray:
+    """
+    Registry signal function: long-only RSI mean-reversion state per bar (int8),
+    long below ``lower``, flat above ``upper``.
+    """
+    if period < 1:
+        raise ValueError("RSI period must be >= 1.")
+    if not 0 <= lower < upper <= 100:
+        raise ValueError("RSI bands must satisfy 0 <= lower < upper <= 100.")
+    return band_hysteresis(INDICATORS.rsi(close, int(period)), lower, upper).astype(np.int8)
+
+
+def rsi_indicators(
+    close: np.ndarray, period: int = 14, lower: float = 30, upper: float = 70
+) -> Dict[str, np.ndarray]:
+    """Registry indicator function: the RSI line the bands are applied to."""
+    return {f"RSI {int(period)}": INDICATORS.rsi(close, int(period))}
+
+
+def rsi_signal_grid(
+    close: np.ndarray,
+    period: Sequence[int] = (14,),
+    lower: Sequence[float] = (30,),
+    upper: Sequence[float] = (70,),
+) -> Tuple[List[Dict[str, float]], np.ndarray]:
+    """
+    Registry grid function: every (period, lower, upper) with 0 <= lower < upper <= 100,
+    one RSI per distinct period.
+    """
+    params, rows = [], []
+    for p in sorted({int(p) for p in period}):
+        if p < 1:
+            raise ValueError("RSI period must be >= 1.")
+        r = INDICATORS.rsi(close, p)
+        for lo in lower:
+            for hi in upper:
+                if not 0 <= lo < hi <= 100:
+                    continue
+                params.append({"period": p, "lower": float(lo), "upper": float(hi)})
+                rows.append(band_hysteresis(r, lo, hi).astype(np.int8))
+    if not rows:
+        raise ValueError("No valid RSI bands: need 0 <= lower < upper <= 100.")
+    return params, np.stack(rows)
+
+
+def rsi_state(period: int = 14, lower: float = 30, upper: float = 70):
+    """Registry state function: the bar-by-bar bands (see streaming.RSIBandState)."""
+    from backend.engine.streaming import RSIBandState
+
+    return RSIBandState(int(period), float(lower), float(upper))
+
+
+def rsi_band_signals(
+    df: pd.DataFrame, period: int = 14, lower: float = 30, upper: float = 70
+) -> pd.Series:
+    """
+    Long-only RSI mean-reversion signal: go long below ``lower``, flatten above ``upper``.
+    """
+    r = INDICATORS.rsi(df, period)
+    return pd.Series(band_hysteresis(r, lower, upper), index=df.index)
+
+
+def generate_signals_rsi(
+    df: pd.DataFrame, period: int = 14, lower: float = 30, upper: float = 70
+) -> pd.Series:
+    """
+    Validated entry point used by /backtest (strategy "rsi").
+    Returns the signal *state per bar*; execution is next-bar in the backtester.
+    """
+    if "Close" not in df.columns:
+        raise ValueError("Dataframe must contain 'Close' column.")
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise ValueError("Index must be a DatetimeIndex (got %r)" % type(df.index))
+
+    signal = rsi_signals(df["Close"].to_numpy(), period=int(period), lower=lower, upper=upper)
+    return pd.Series(signal.astype(int), index=df.index, name="signal")
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
 import pandas as pd
 
+from backend.engine.indicators import INDICATORS
 
-def add_sma(df: pd.DataFrame, fast: int, slow: int) -> pd.DataFrame:
-    """
-    Adds SMA_fast and SMA_slow columns to a copy of df.
-    Expects df with a 'Close' column and DatetimeIndex.
-    """
+
+def _check_sma_inputs(df: pd.DataFrame, fast: int, slow: int) -> None:
     if "Close" not in df.columns:
         raise ValueError("Dataframe must contain 'Close' column.")
     if not isinstance(df.index, pd.DatetimeIndex):
@@ -18,12 +19,63 @@ def add_sma(df: pd.DataFrame, fast: int, slow: int) -> pd.DataFrame:
     if slow <= fast:
         raise ValueError("slow must be strictly greater than fast.")
 
-    out = df.copy()
-    out["SMA_fast"] = out["Close"].rolling(int(fast)).mean()
-    out["SMA_slow"] = out["Close"].rolling(int(slow)).mean()
+
+def add_sma(df: pd.DataFrame, fast: int, slow: int) -> pd.DataFrame:
+    """
+    Adds SMA_fast and SMA_slow columns to a (shallow, copy-on-write) copy of df.
+    Expects df with a 'Close' column and DatetimeIndex.
+    """
+    _check_sma_inputs(df, fast, slow)
+
+    out = df.copy(deep=False)
+    out["SMA_fast"] = INDICATORS.sma(df, int(fast))
+    out["SMA_slow"] = INDICATORS.sma(df, int(slow))
     return out
 
 
+def sma_crossover_signals(close: np.ndarray, fast: int = 10, slow: int = 30) -> np.ndarray:
+    """
+    Registry signal function: 1 while SMA_fast > SMA_slow, else 0 (int8, one per bar).
+    Warm-up region (before SMAs exist) -> flat: NaN comparisons are False.
+    """
+    if fast < 1 or slow < 1:
+        raise ValueError("fast/slow windows must be >= 1.")
+    if slow <= fast:
+        raise ValueError("slow must be strictly greater than fast.")
+    return (INDICATORS.sma(close, int(fast)) > INDICATORS.sma(close, int(slow))).astype(np.int8)
+
+
+def sma_crossover_indicators(
+    close: np.ndarray, fast: int = 10, slow: int = 30
+) -> Dict[str, np.ndarray]:
+    """Registry indicator function: the two SMAs the crossover compares."""
+    return {
+        f"SMA {int(fast)}": INDICATORS.sma(close, int(fast)),
+        f"SMA {int(slow)}": INDICATORS.sma(close, int(slow)),
+    }
+
+
+def sma_crossover_signal_grid(
+    close: np.ndarray, fast: Sequence[int] = (10,), slow: Sequence[int] = (30,)
+) -> Tuple[List[Dict[str, int]], np.ndarray]:
+    """
+    Registry grid function: every (fast, slow) pair with slow > fast, all windows derived
+    from one shared cumulative sum.
+    """
+    pairs = sma_crossover_pairs(fast, slow)
+    if not pairs:
+        raise ValueError("No valid (fast, slow) pairs: slow must be greater than fast.")
+    means = rolling_means(close, {w for pair in pairs for w in pair})
+    return [{"fast": f, "slow": s} for f, s in pairs], sma_crossover_grid(means, pairs)
+
+
+def sma_crossover_state(fast: int = 10, slow: int = 30):
+    """Registry state function: the bar-by-bar crossover (see streaming.SMACrossoverState)."""
+    from backend.engine.streaming import SMACrossoverState
+
+    return SMACrossoverState(int(fast), int(slow))
+
+
 def generate_signals_sma(df: pd.DataFrame, fast: int, slow: int) -> pd.Series:
     """
     Long-only SMA crossover signal:
@@ -31,13 +83,48 @@ def generate_signals_sma(df: pd.DataFrame, fast: int, slow: int) -> pd.Series:
     NOTE: This returns the *signal state per bar*. To avoid look-ahead,
     execute trades on the NEXT bar (i.e., shift the signal by 1 when applying).
     """
-    df_sma = add_sma(df, fast=fast, slow=slow)
+    _check_sma_inputs(df, fast, slow)
+    signal = sma_crossover_signals(df["Close"].to_numpy(), fast=fast, slow=slow)
+    return pd.Series(signal.astype(int), index=df.index, name="signal")
 
-    # Signal: hold long while fast above slow
-    signal = (df_sma["SMA_fast"] > df_sma["SMA_slow"]).astype(int)
 
-    # Warm-up region (before SMAs exist) -> flat
-    signal = signal.where(df_sma[["SMA_fast", "SMA_slow"]].notna().all(axis=1), other=0)
+def rolling_means(close: np.ndarray, windows: Iterable[int]) -> Dict[int, np.ndarray]:
+    """
+    Simple moving averages for many windows, all derived from one shared cumulative sum.
+    Bars before a window is full are NaN, matching ``Series.rolling(window).mean()``.
+    """
+    close = np.asarray(close, dtype=float)
+    if np.isnan(close).any():
+        raise ValueError("Close contains NaNs; cumulative-sum SMAs need a gap-free series.")
+
+    csum = np.concatenate(([0.0], np.cumsum(close)))
+    out: Dict[int, np.ndarray] = {}
+    for w in sorted({int(w) for w in windows}):
+        if w < 1:
+            raise ValueError("SMA windows must be >= 1.")
+        sma = np.full(close.shape, np.nan)
+        if w <= len(close):
+            sma[w - 1 :] = (csum[w:] - csum[:-w]) / w
+        out[w] = sma
+    return out
+
 
-    signal.name = "signal"
-    return signal
+def sma_crossover_pairs(fasts: Sequence[int], slows: Sequence[int]) -> List[Tuple[int, int]]:
+    """All (fast, slow) combinations with slow strictly greater than fast."""
+    return [(int(f), int(s)) for f in fasts for s in slows if int(s) > int(f) >= 1]
+
+
+def sma_crossover_grid(
+    means: Dict[int, np.ndarray],
+    pairs: Sequence[Tuple[int, int]],
+) -> np.ndarray:
+    """
+    2D signal matrix (len(pairs) x bars) for the SMA crossover rule, one row per pair.
+    Same semantics as generate_signals_sma: 1 while fast > slow, 0 otherwise and in warm-up
+    (NaN comparisons are False, so bars before either SMA exists stay flat).
+    """
+    if not pairs:
+        raise ValueError("No valid (fast, slow) pairs: slow must be strictly greater than fast.")
+    fast_mat = np.stack([means[f] for f, _ in pairs])
+    slow_mat = np.stack([means[s] for _, s in pairs])
+    return (fast_mat > slow_mat).astype(np.int8)
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+import pandas as pd
+
+from backend.engine.backtester import BacktestOutput, build_trade_log
+
+Bar = Tuple[Any, float, float]  # (ts, open, close)
+
+
+# ---------------------------------------------------------------------
+# O(1) indicator state. Arithmetic mirrors pandas' rolling/ewm kernels step for step, so a
+# replay produces bit-identical values to the vectorized strategies.
+class RollingMean:
+    """Ring-buffer simple moving average (Kahan-compensated running sum, like pandas)."""
+
+    __slots__ = ("window", "_buf", "_sum", "_comp_add", "_comp_remove", "_neg", "_same", "_prev")
+
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError("SMA window must be >= 1.")
+        self.window = int(window)
+        self._buf: deque = deque()
+        self._sum = 0.0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._neg = 0
+        self._same = 0
+        self._prev = math.nan
+
+    def update(self, x: float) -> float:
+        """Add one value; returns the mean once the window is full, else NaN."""
+        if len(self._buf) == self.window:
+            old = self._buf.popleft()
+            y = -old - self._comp_remove
+            t = self._sum + y
+            self._comp_remove = t - self._sum - y
+            self._sum = t
+            if math.copysign(1.0, old) < 0:
+                self._neg -= 1
+
+        self._buf.append(x)
+        y = x - self._comp_add
+        t = self._sum + y
+        self._comp_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, x) < 0:
+            self._neg += 1
+        self._same = self._same + 1 if x == self._prev else 1
+        self._prev = x
+
+        n = len(self._buf)
+        if n < self.window:
+            return math.nan
+        if self._same >= n:
+            return self._prev
+        mean = self._sum / n
+        if self._neg == 0 and mean < 0:
+            return 0.0
+        if self._neg == n and mean > 0:
+            return 0.0
+        return mean
+
+
+class WilderRSI:
+    """Incremental RSI matching strategies.rsi.rsi (EWM, alpha=1/period, adjust=False)."""
+
+    __slots__ = ("_alpha", "_decay", "_up", "_down", "_prev_close")
+
+    def __init__(self, period: int = 14):
+        if period < 1:
+            raise ValueError("RSI period must be >= 1.")
+        self._alpha = 1 / period
+        self._decay = 1 - self._alpha
+        self._up = math.nan
+        self._down = math.nan
+        self._prev_close = math.nan
+
+    def _ewm(self, weighted: float, cur: float) -> float:
+        if weighted != weighted:
+            return cur
+        if weighted != cur:
+            weighted = (self._decay * weighted + self._alpha * cur) / (self._decay + self._alpha)
+        return weighted
+
+    def update(self, close: float) -> float:
+        delta = close - self._prev_close
+        self._prev_close = close
+        if delta != delta:
+            return math.nan
+        self._up = self._ewm(self._up, max(delta, 0.0))
+        self._down = self._ewm(self._down, -min(delta, 0.0))
+        rs = self._up / (self._down + 1e-12)
+        return 100 - (100 / (1 + rs))
+
+
+class SMACrossoverState:
+    """Bar-by-bar generate_signals_sma: 1 while SMA_fast > SMA_slow, flat during warm-up."""
+
+    def __init__(self, fast: int, slow: int):
+        if fast < 1 or slow < 1:
+            raise ValueError("fast/slow windows must be >= 1.")
+        if slow <= fast:
+            raise ValueError("slow must be strictly greater than fast.")
+        self._fast = RollingMean(fast)
+        self._slow = RollingMean(slow)
+
+    def update(self, close: float) -> int:
+        fast = self._fast.update(close)
+        slow = self._slow.update(close)
+        return 1 if fast > slow else 0  # NaN comparisons are False -> flat in warm-up
+
+
+class RSIBandState:
+    """Bar-by-bar rsi_band_signals: long below ``lower``, flat above ``upper``, else hold."""
+
+    def __init__(self, period: int = 14, lower: float = 30, upper: float = 70):
+        self._rsi = WilderRSI(period)
+        self._lower = lower
+        self._upper = upper
+        self._state: Optional[int] = None
+
+    def update(self, close: float) -> int:
+        r = self._rsi.update(close)
+        if self._state is None:
+            self._state = 0          # bar 0 always starts flat
+        elif r < self._lower:
+            self._state = 1
+        elif r > self._upper:
+            self._state = 0
+        return self._state
+
+
+def make_signal_state(strategy: str, params: Dict[str, float]):
+    """
+    Streaming counterpart of strategies.build_signal (same names, defaults and validation):
+    the registered strategy's bar-by-bar state.
+    """
+    from backend.engine.strategies import get_strategy
+
+    return get_strategy(strategy).signal_state(params)
+
+
+# ---------------------------------------------------------------------
+class BarEvent:
+    """What one bar produced: equity after the bar, its net return, the signal and any fill."""
+
+    __slots__ = ("ts", "equity", "net_return", "signal", "trade")
+
+    def __init__(self, ts, equity: float, net_return: float, signal: int, trade: Optional[Dict]):
+        self.ts = ts
+        self.equity = equity
+        self.net_return = net_return
+        self.signal = signal
+        self.trade = trade
+
+
+class StreamingBacktester:
+    """
+    Event-driven simulate_long_only: feed bars one at a time (or from an async iterator).
+
+    Same rules as the vectorized engine:
+    - the signal decided on bar t-1 earns bar t's close-to-close return (next-bar execution)
+    - (cost_bps + slippage_bps)/10000 is charged on the bar where the signal changes
+    - fills are logged at that bar's open (close if no open is given), qty 1.0
+    """
+
+    def __init__(self, signal_state, cost_bps: float = 0.0, slippage_bps: float = 0.0):
+        self.signal_state = signal_state
+        self.cost_bps = cost_bps
+        self.slippage_bps = slippage_bps
+        self._fric = (cost_bps + slippage_bps) / 10000.0
+        self._fees = round(cost_bps / 10000.0, 8)
+        self._slippage = round(slippage_bps / 10000.0, 8)
+        self.equity = 1.0
+        self.signal = 0
+        self.bars = 0
+        self._prev_close: Optional[float] = None
+
+    def on_bar(self, ts, close: float, open: Optional[float] = None) -> BarEvent:
+        prev_signal = self.signal
+        if self._prev_close is None:
+            r = 0.0
+        else:
+            r = close / self._prev_close - 1
+        self._prev_close = close
+
+        signal = self.signal_state.update(close)
+        turnover = abs(signal - prev_signal) if self.bars else 0
+        net = r * prev_signal - turnover * self._fric
+        self.equity *= 1.0 + net
+        self.signal = signal
+        self.bars += 1
+
+        trade = None
+        if turnover:
+            trade = {
+                "ts": ts.isoformat() if hasattr(ts, "isoformat") else str(ts),
+                "side": "buy" if signal > prev_signal else "sell",
+                "price": float(close if open is None else open),
+                "qty": 1.0,
+                "fees": self._fees,
+                "slippage": self._slippage,
+            }
+        return BarEvent(ts, self.equity, net, signal, trade)
+
+    def run(self, bars: Iterable[Bar]) -> Iterator[BarEvent]:
+        for ts, open_, close in bars:
+            yield self.on_bar(ts, close, open_)
+
+    async def arun(self, bars: AsyncIterable[Bar]) -> AsyncIterator[BarEvent]:
+        async for ts, open_, close in bars:
+            yield self.on_bar(ts, close, open_)
+
+
+def replay(
+    df: pd.DataFrame,
+    strategy: str,
+    params: Dict[str, float],
+    cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+) -> BacktestOutput:
+    """Run a historical frame through the streaming engine; output matches simulate_long_only."""
+    engine = StreamingBacktester(make_signal_state(strategy, params), cost_bps, slippage_bps)
+    opens = df["Open"] if "Open" in df.columns else df["Close"]
+
+    equity: List[float] = []
+    signals: List[int] = []
+    for event in engine.run(zip(df.index, opens.tolist(), df["Close"].tolist(), strict=True)):
+        equity.append(event.equity)
+        signals.append(event.signal)
+
+    signal = pd.Series(signals, index=df.index)
+    return BacktestOutput(
+        equity_curve=equity,
+        trade_log=build_trade_log(df, signal, cost_bps=cost_bps, slippage_bps=slippage_bps),
+    )
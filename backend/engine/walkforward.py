@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.engine.backtester import grid_net_returns
+from backend.engine.metrics import compute_metrics_batch
+
+
+@dataclass
+class WalkForwardWindow:
+    train_start: pd.Timestamp
+    train_end: pd.Timestamp             # last bar of the train slice (inclusive)
+    test_start: pd.Timestamp
+    test_end: pd.Timestamp              # last bar of the test slice (inclusive)
+    params: Dict[str, float]
+    train_metrics: Dict[str, float]
+    test_metrics: Dict[str, float]
+    trades: int                         # signal changes inside the test slice
+
+
+@dataclass
+class WalkForwardOutput:
+    equity: pd.Series                   # stitched out-of-sample equity (1.0 on the bar before
+                                        # the first test slice)
+    windows: List[WalkForwardWindow] = field(default_factory=list)
+    combinations: int = 0               # parameter sets scored on every train slice
+    trades: int = 0
+
+
+# ---------------------------------------------------------------------
+# Signal matrix over the full history, one row per parameter set
+def signal_grid(
+    df: pd.DataFrame,
+    strategy: str,
+    grid: Dict[str, Sequence[float]],
+) -> Tuple[List[Dict[str, float]], np.ndarray]:
+    """
+    Signals for every parameter combination of ``grid`` as an int8 (params x bars) matrix,
+    through the strategy registry (StrategySpec.signal_grid). Indicators are computed once
+    per distinct window/period over the whole frame, so train and test slices are plain
+    views with the warm-up taken from the preceding history.
+    """
+    from backend.engine.strategies import get_strategy
+
+    spec = get_strategy(strategy)
+    if "Close" not in df.columns:
+        raise ValueError("Price dataframe must contain a 'Close' column.")
+    return spec.signal_grid(df["Close"].to_numpy(dtype=float), grid)
+
+
+# ---------------------------------------------------------------------
+def walk_forward_windows(
+    n_bars: int,
+    train_bars: int,
+    test_bars: int,
+    anchored: bool = False,
+) -> List[Tuple[slice, slice]]:
+    """
+    (train, test) bar slices that roll forward by ``test_bars``.
+    - rolling (default): each train slice is the ``train_bars`` bars before its test slice
+    - anchored: train slices all start at bar 0 and grow
+    The last test slice is truncated at the end of the data.
+    """
+    if train_bars < 2 or test_bars < 2:
+        raise ValueError("train_bars and test_bars must be >= 2.")
+    if n_bars < train_bars + test_bars:
+        raise ValueError(
+            f"Need at least train_bars + test_bars = {train_bars + test_bars} bars, got {n_bars}."
+        )
+
+    windows = []
+    for test_start in range(train_bars, n_bars, test_bars):
+        test_end = min(test_start + test_bars, n_bars)
+        if test_end - test_start < 2:
+            break
+        train_start = 0 if anchored else test_start - train_bars
+        windows.append((slice(train_start, test_start), slice(test_start, test_end)))
+    return windows
+
+
+def _slice_equity(net: np.ndarray) -> np.ndarray:
+    """Equity curves for a (params x bars) block of net returns, anchored at 1.0 before bar 0."""
+    equity = np.empty((net.shape[0], net.shape[1] + 1))
+    equity[:, 0] = 1.0
+    np.add(net, 1.0, out=equity[:, 1:])
+    return np.cumprod(equity, axis=1, out=equity)
+
+
+def _row(metrics: Dict[str, np.ndarray], i: int) -> Dict[str, float]:
+    return {k: float(v[i]) for k, v in metrics.items()}
+
+
+def _best_on_train(
+    net: np.ndarray,
+    train: slice,
+    objective: str,
+    rf_rate_pct: float,
+) -> Tuple[int, Dict[str, float]]:
+    metrics = compute_metrics_batch(_slice_equity(net[:, train]), rf_rate_pct=rf_rate_pct)
+    if objective not in metrics:
+        raise ValueError(f"Unknown objective: {objective}")
+    score = np.where(np.isnan(metrics[objective]), -np.inf, metrics[objective])
+    best = int(np.argmax(score))          # ties -> first combination in grid order
+    return best, _row(metrics, best)
+
+
+def walk_forward(
+    df: pd.DataFrame,
+    strategy: str,
+    grid: Dict[str, Sequence[float]],
+    train_bars: int,
+    test_bars: int,
+    anchored: bool = False,
+    objective: str = "sharpe",
+    cost_bps: float = 0.0,
+    slippage_bps: float = 0.0,
+    rf_rate_pct: float = 0.0,
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[float, float], None]] = None,
+) -> WalkForwardOutput:
+    """
+    Walk-forward optimization: pick the best parameters on each train slice by ``objective``
+    (higher is better), then trade them on the following test slice.
+
+    - Signals and per-bar net returns for the whole grid are computed once over the full
+      history; every window works on views of that (params x bars) matrix.
+    - Train windows are independent and scored in a thread pool (the numpy reductions
+      release the GIL).
+    - Returns the stitched out-of-sample equity curve and, per window, the chosen params
+      with their train and test metrics.
+    - progress(done, total) is called with the train windows scored so far.
+    """
+    params, signals = signal_grid(df, strategy, grid)
+    close = df["Close"].to_numpy(dtype=float)
+    net = grid_net_returns(close, signals, cost_bps=cost_bps, slippage_bps=slippage_bps)
+    windows = walk_forward_windows(len(df), train_bars, test_bars, anchored=anchored)
+
+    def score(window: Tuple[slice, slice]) -> Tuple[int, Dict[str, float]]:
+        return _best_on_train(net, window[0], objective, rf_rate_pct)
+
+    picks: List[Tuple[int, Dict[str, float]]] = []
+    if max_workers == 1 or len(windows) == 1:
+        for w in windows:
+            picks.append(score(w))
+            if progress is not None:
+                progress(len(picks), len(windows))
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for pick in pool.map(score, windows):   # progress is reported from this thread
+                picks.append(pick)
+                if progress is not None:
+                    progress(len(picks), len(windows))
+
+    # --- Out-of-sample: stitch the chosen rows into one signal and simulate it, so a
+    # parameter switch at a window boundary trades from the position actually held
+    first, last = windows[0][1].start - 1, windows[-1][1].stop
+    stitched = np.empty(last - first, dtype=np.int8)
+    stitched[0] = signals[picks[0][0], first]
+    for (_, test), (best, _) in zip(windows, picks, strict=True):
+        stitched[test.start - first : test.stop - first] = signals[best, test]
+    oos_net = grid_net_returns(
+        close[first:last], stitched[None, :], cost_bps=cost_bps, slippage_bps=slippage_bps
+    )[0]
+    turnover = np.abs(np.diff(stitched, prepend=stitched[0]))
+
+    index = df.index
+    out = WalkForwardOutput(
+        equity=pd.Series(np.cumprod(1.0 + oos_net), index=index[first:last]),
+        combinations=len(params),
+    )
+    for (train, test), (best, train_metrics) in zip(windows, picks, strict=True):
+        part = slice(test.start - first, test.stop - first)
+        test_metrics = compute_metrics_batch(_slice_equity(oos_net[None, part]), rf_rate_pct)
+        trades = int(np.count_nonzero(turnover[part]))
+        out.windows.append(
+            WalkForwardWindow(
+                train_start=index[train.start],
+                train_end=index[train.stop - 1],
+                test_start=index[test.start],
+                test_end=index[test.stop - 1],
+                params=params[best],
+                train_metrics=train_metrics,
+                test_metrics=_row(test_metrics, 0),
+                trades=trades,
+            )
+        )
+        out.trades += trades
+    return out
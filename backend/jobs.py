@@ -0,0 +1,389 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# ---------------------------------------------------------------------
+# Background jobs: a SQLite job table (no external broker) drained by a bounded pool of
+# worker threads, highest priority first, oldest first within a priority.
+#
+# Long-running engine loops take a progress(done, total) callback, which backend.api.jobs
+# binds to progress() below when it runs them as jobs. Outside a job that is
+# one ContextVar read; inside a job it records progress (throttled) and is the point where a
+# cancelled job stops, by raising JobCancelled.
+ENV_DB = "ALGOTRADE_JOBS_DB"
+ENV_WORKERS = "ALGOTRADE_JOB_WORKERS"
+DEFAULT_DB = Path(".cache") / "jobs.sqlite3"
+
+FINISHED = ("succeeded", "failed", "cancelled")
+PROGRESS_INTERVAL_S = 0.25      # min seconds between progress writes / cancel checks per job
+POLL_INTERVAL_S = 1.0           # idle workers also pick up jobs queued by other processes
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    spec TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'queued',
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    result TEXT,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority DESC, created_at);
+"""
+_COLUMNS = (
+    "id, kind, spec, priority, status, progress, message, error, "
+    "created_at, started_at, finished_at"
+)
+
+
+_OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _pid_alive(pid: str) -> bool:
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, ValueError):
+        return True
+    return True
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job by progress() once cancellation was requested."""
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    spec: dict
+    priority: int
+    status: str                         # queued | running | succeeded | failed | cancelled
+    progress: float                     # 0..1
+    message: Optional[str]
+    error: Optional[str]
+    created_at: float                   # unix seconds
+    started_at: Optional[float]
+    finished_at: Optional[float]
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "Job":
+        return cls(row[0], row[1], json.loads(row[2]), *row[3:])
+
+
+class JobStore:
+    """The job table. Each method is one short statement/transaction, safe across threads."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.isolation_level = None           # autocommit: one transaction per statement
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _one(self, sql: str, args: tuple = ()) -> Optional[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, args).fetchone()
+
+    def create(self, kind: str, spec: dict, priority: int = 0) -> Job:
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, spec, priority, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(spec), int(priority), time.time()),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        row = self._one(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,))
+        return None if row is None else Job.from_row(row)
+
+    def result(self, job_id: str) -> Optional[str]:
+        row = self._one("SELECT result FROM jobs WHERE id = ?", (job_id,))
+        return None if row is None else row[0]
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> List[Job]:
+        sql = f"SELECT {_COLUMNS} FROM jobs"
+        args: tuple = ()
+        if status is not None:
+            sql += " WHERE status = ?"
+            args = (status,)
+        sql += " ORDER BY created_at DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(sql, args + (int(limit),)).fetchall()
+        return [Job.from_row(r) for r in rows]
+
+    def claim(self) -> Optional[Job]:
+        """Atomically move the next queued job (priority, then age) to running."""
+        row = self._one(
+            f"""
+            UPDATE jobs SET status = 'running', started_at = ?, owner = ?
+            WHERE id = (
+                SELECT id FROM jobs WHERE status = 'queued'
+                ORDER BY priority DESC, created_at, rowid LIMIT 1
+            )
+            RETURNING {_COLUMNS}
+            """,
+            (time.time(), _OWNER),
+        )
+        return None if row is None else Job.from_row(row)
+
+    def set_progress(self, job_id: str, progress: float, message: Optional[str] = None) -> bool:
+        """Record progress; returns True if cancellation has been requested meanwhile."""
+        row = self._one(
+            "UPDATE jobs SET progress = ?, message = COALESCE(?, message) WHERE id = ? "
+            "RETURNING cancel_requested",
+            (min(max(float(progress), 0.0), 1.0), message, job_id),
+        )
+        return bool(row and row[0])
+
+    def finish(
+        self,
+        job_id: str,
+        status: str,
+        result: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, "
+                "progress = CASE WHEN ? = 'succeeded' THEN 1 ELSE progress END WHERE id = ?",
+                (status, result, error, time.time(), status, job_id),
+            )
+
+    def request_cancel(self, job_id: str) -> Optional[Job]:
+        """Queued jobs are cancelled at once; running ones are flagged for progress()."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? "
+                "WHERE id = ? AND status = 'queued'",
+                (time.time(), job_id),
+            )
+            self._conn.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'",
+                (job_id,),
+            )
+        return self.get(job_id)
+
+    def requeue_interrupted(self) -> int:
+        """
+        Jobs left 'running' by a dead process on this host go back to the queue (or to
+        'cancelled' if that was requested). Jobs owned by live processes are left alone.
+        """
+        host = socket.gethostname()
+        with self._lock:
+            owners = self._conn.execute(
+                "SELECT DISTINCT owner FROM jobs WHERE status = 'running' AND owner LIKE ?",
+                (f"{host}:%",),
+            ).fetchall()
+            dead = [o for (o,) in owners if o != _OWNER and not _pid_alive(o.rsplit(":", 1)[1])]
+            requeued = 0
+            for owner in dead:
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'cancelled', finished_at = ? "
+                    "WHERE status = 'running' AND owner = ? AND cancel_requested = 1",
+                    (time.time(), owner),
+                )
+                requeued += self._conn.execute(
+                    "UPDATE jobs SET status = 'queued', started_at = NULL, progress = 0, "
+                    "owner = NULL WHERE status = 'running' AND owner = ?",
+                    (owner,),
+                ).rowcount
+            return requeued
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ---------------------------------------------------------------------
+# Progress / cancellation from inside a running job
+class _JobContext:
+    __slots__ = ("store", "job_id", "cancelled", "_last")
+
+    def __init__(self, store: JobStore, job_id: str, cancelled: threading.Event):
+        self.store = store
+        self.job_id = job_id
+        self.cancelled = cancelled
+        self._last = 0.0
+
+    def update(self, fraction: float, message: Optional[str]) -> None:
+        if self.cancelled.is_set():
+            raise JobCancelled(self.job_id)
+        now = time.monotonic()
+        if now - self._last < PROGRESS_INTERVAL_S and fraction < 1.0:
+            return
+        self._last = now
+        if self.store.set_progress(self.job_id, fraction, message):
+            self.cancelled.set()
+            raise JobCancelled(self.job_id)
+
+
+_CURRENT: ContextVar[Optional[_JobContext]] = ContextVar("algotrade_job", default=None)
+
+
+def progress(done: float, total: float = 1.0, message: Optional[str] = None) -> None:
+    """Report ``done`` of ``total`` steps of the current job (no-op outside a job)."""
+    ctx = _CURRENT.get()
+    if ctx is not None:
+        ctx.update(done / total if total else 1.0, message)
+
+
+# ---------------------------------------------------------------------
+# Runners: job kind -> callable(spec) returning the JSON result body
+RUNNERS: Dict[str, Callable[[dict], str]] = {}
+
+
+def register_runner(kind: str, runner: Callable[[dict], str]) -> None:
+    RUNNERS[kind] = runner
+
+
+def _default_workers() -> int:
+    # half the cores: leave the rest to interactive requests
+    value = os.environ.get(ENV_WORKERS)
+    return max(1, int(value) if value else (os.cpu_count() or 2) // 2)
+
+
+class JobQueue:
+    """
+    Bounded worker pool over a JobStore. start() (the app's lifespan hook) requeues jobs
+    interrupted by a dead process and starts the threads, which drain whatever is queued in
+    the table, including rows left there before a restart; submit() only adds a row and
+    wakes them. At most ``workers`` jobs run at once however many are queued.
+    """
+
+    def __init__(self, store: JobStore, workers: Optional[int] = None):
+        self.store = store
+        self.workers = workers or _default_workers()
+        self._threads: List[threading.Thread] = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._cancel: Dict[str, threading.Event] = {}
+        self._guard = threading.Lock()
+
+    def submit(self, kind: str, spec: dict, priority: int = 0) -> Job:
+        if kind not in RUNNERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = self.store.create(kind, spec, priority)
+        self._wake.set()
+        return job
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self.store.request_cancel(job_id)
+        with self._guard:
+            event = self._cancel.get(job_id)
+        if event is not None:
+            event.set()
+        return job
+
+    def start(self) -> None:
+        """Requeue interrupted jobs and start the worker threads (no-op if running)."""
+        with self._guard:
+            if self._threads:
+                return
+            self.store.requeue_interrupted()
+            self._stop = stop = threading.Event()
+            for i in range(self.workers):
+                t = threading.Thread(
+                    target=self._work, args=(stop,), name=f"algotrade-job-{i}", daemon=True
+                )
+                t.start()
+                self._threads.append(t)
+
+    def _work(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            self._wake.clear()
+            job = self.store.claim()
+            if job is None:
+                self._wake.wait(POLL_INTERVAL_S)
+                continue
+            self._run(job)
+
+    def _run(self, job: Job) -> None:
+        cancelled = threading.Event()
+        with self._guard:
+            self._cancel[job.id] = cancelled
+        token = _CURRENT.set(_JobContext(self.store, job.id, cancelled))
+        try:
+            result = RUNNERS[job.kind](job.spec)
+            if cancelled.is_set():
+                raise JobCancelled(job.id)
+        except JobCancelled:
+            self.store.finish(job.id, "cancelled")
+        except Exception as e:
+            if cancelled.is_set():  # JobCancelled re-raised as a handler error
+                self.store.finish(job.id, "cancelled")
+            else:
+                self.store.finish(job.id, "failed", error=f"{type(e).__name__}: {e}")
+        else:
+            self.store.finish(job.id, "succeeded", result=result)
+        finally:
+            _CURRENT.reset(token)
+            with self._guard:
+                self._cancel.pop(job.id, None)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop taking new jobs; running ones finish (or wait on progress() to cancel)."""
+        with self._guard:
+            threads, self._threads = self._threads, []
+        self._stop.set()
+        self._wake.set()
+        if wait:
+            for t in threads:
+                t.join()
+
+
+_QUEUE: Optional[JobQueue] = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def get_queue() -> JobQueue:
+    """Process-wide queue, created on first use from ALGOTRADE_JOBS_DB / _JOB_WORKERS."""
+    global _QUEUE
+    with _QUEUE_LOCK:
+        if _QUEUE is None:
+            _QUEUE = JobQueue(JobStore(Path(os.environ.get(ENV_DB) or DEFAULT_DB)))
+        return _QUEUE
+
+
+def start_queue() -> JobQueue:
+    """Start the process-wide queue's workers (creating the queue if needed)."""
+    queue = get_queue()
+    queue.start()
+    return queue
+
+
+def shutdown_queue(wait: bool = True) -> None:
+    """Stop the process-wide queue's workers, if a queue was ever created."""
+    with _QUEUE_LOCK:
+        queue = _QUEUE
+    if queue is not None:
+        queue.shutdown(wait=wait)
+
+
+def set_queue(queue: Optional[JobQueue]) -> Optional[JobQueue]:
+    """Swap the process-wide queue (tests, custom setups); returns the previous one."""
+    global _QUEUE
+    with _QUEUE_LOCK:
+        previous, _QUEUE = _QUEUE, queue
+    return previous
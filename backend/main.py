@@ -1,11 +1,37 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from backend import jobs, startup
+from backend.api.jobs import router as jobs_router
 from backend.api.routes import router
+from backend.telemetry import REGISTRY, TelemetryMiddleware, enabled_from_env
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Engine imported and exercised before the worker accepts requests (on the handler
+    # thread pool, which starts it too); hot symbols (ALGOTRADE_WARM_SYMBOLS) warm in the
+    # background while /health/ready answers 503. The job queue's workers start here, so
+    # jobs queued or interrupted before a restart run without waiting for a new submit.
+    await run_in_threadpool(startup.preload)
+    await startup.prime_routes(app)
+    startup.start_warmup(startup.hot_symbols_from_env())
+    jobs.start_queue()
+    yield
+    jobs.shutdown_queue(wait=False)
+    from backend.engine.batch import shutdown_pool
+
+    shutdown_pool(wait=False)
+
 
 app = FastAPI(
     title="AlgoTrade Lite",
     version="0.2.0",
     description="Backtesting API (MVP skeleton).",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -15,8 +41,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-stage Server-Timing headers + request histograms (ALGOTRADE_TELEMETRY=0 disables)
+if enabled_from_env():
+    app.add_middleware(TelemetryMiddleware)
+
 @app.get("/health")
 def health() -> dict:
-    return {"status": "ok"}
+    """Liveness (always "ok" while the process serves) plus the start-up readiness state."""
+    return {"status": "ok", **startup.READINESS.snapshot()}
+
+@app.get("/health/ready")
+def ready() -> JSONResponse:
+    """Readiness: 200 once the engine is preloaded and hot symbols are warm, else 503."""
+    state = startup.READINESS.snapshot()
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Prometheus text exposition: request/stage histograms and cache counters."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
 
 app.include_router(router)   # <-- must be executed
+app.include_router(jobs_router)
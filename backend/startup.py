@@ -0,0 +1,230 @@
+"""
+Worker start-up: preload the engine, warm hot symbols, report readiness.
+
+Nothing here runs at import. The app's lifespan hook calls preload() and prime_routes()
+before the worker accepts traffic, so the first request does not pay for importing
+pandas/pyarrow/the engine or for first-call initialization inside them or in FastAPI (the
+routes are primed with real in-process requests on synthetic bars), then start_warmup()
+loads the symbols listed in ALGOTRADE_WARM_SYMBOLS (comma-separated) on a background
+thread:
+
+- each symbol's default window (the range /backtest uses without start/end) is fetched into
+  the parquet and in-memory frame caches
+- every registered strategy's signal is built with its default params, which fills the
+  shared indicator store (SMA 10/30, RSI 14, ...)
+
+READINESS tracks the phases; /health reports it next to liveness and /health/ready answers
+503 until preloading and warm-up are done.
+"""
+from __future__ import annotations
+
+import importlib
+import logging
+import os
+import threading
+import time
+from datetime import date
+from typing import Dict, List, Optional
+
+ENV_WARM_SYMBOLS = "ALGOTRADE_WARM_SYMBOLS"
+
+# Imported by preload(); the request path imports these lazily, which is then a dict lookup.
+PRELOAD_MODULES = (
+    "numpy",
+    "pandas",
+    "pyarrow",
+    "pyarrow.ipc",
+    "pyarrow.parquet",
+    "backend.engine.data",
+    "backend.engine.indicators",
+    "backend.engine.strategies",
+    "backend.engine.backtester",
+    "backend.engine.downsample",
+    "backend.engine.metrics",
+    "backend.engine.walkforward",
+    "backend.engine.portfolio",
+    "backend.engine.robustness",
+    "backend.engine.batch",
+    "backend.api.arrow",
+)
+
+# Symbol of the start-up requests; served by _SyntheticProvider, never by the real source.
+STARTUP_SYMBOL = "__STARTUP__"
+
+log = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------
+class Readiness:
+    """Start-up state shared with /health: starting -> preloading -> warming -> ready."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.phase = "starting"
+        self.warmed: List[str] = []
+        self.failed: Dict[str, str] = {}
+        self.started_at = time.time()
+        self.ready_after_s: Optional[float] = None
+
+    def set_phase(self, phase: str) -> None:
+        with self._lock:
+            self.phase = phase
+            if phase == "ready":
+                self.ready_after_s = round(time.time() - self.started_at, 3)
+
+    def record(self, symbol: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            if error is None:
+                self.warmed.append(symbol)
+            else:
+                self.failed[symbol] = error
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.phase == "ready",
+                "phase": self.phase,
+                "warmed": list(self.warmed),
+                "failed": dict(self.failed),
+                "ready_after_s": self.ready_after_s,
+            }
+
+
+READINESS = Readiness()
+
+
+# ---------------------------------------------------------------------
+def hot_symbols_from_env() -> List[str]:
+    raw = os.environ.get(ENV_WARM_SYMBOLS, "")
+    return [s.strip().upper() for s in raw.split(",") if s.strip()]
+
+
+def _synthetic_bars(index):
+    import numpy as np
+    import pandas as pd
+
+    close = 100.0 * np.exp(np.cumsum(np.sin(np.arange(len(index)) / 7.0) * 0.01))
+    return pd.DataFrame(
+        {"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1.0},
+        index=index,
+    )
+
+
+class _SyntheticProvider:
+    """Local provider (nothing cached on disk) serving smooth synthetic daily bars."""
+
+    local = True
+
+    def download(self, symbol: str, start: date, end: date, interval: str):
+        import pandas as pd
+
+        idx = pd.bdate_range(start, end, inclusive="left", name="Datetime")
+        return _synthetic_bars(idx)
+
+
+def _exercise_engine() -> None:
+    """One tiny synthetic backtest per strategy, so lazy first-call setup happens now."""
+    import json
+
+    import pandas as pd
+
+    from backend.engine.backtester import simulate_long_only, trim_warmup
+    from backend.engine.downsample import minmax_indices
+    from backend.engine.metrics import compute_buy_and_hold, compute_metrics
+    from backend.engine.strategies import STRATEGIES, build_signal, get_strategy
+
+    df = _synthetic_bars(pd.bdate_range("2000-01-03", periods=300, name="Datetime"))
+    for name in STRATEGIES:
+        get_strategy(name).warmup_bars({})
+        signal = build_signal(df, name, {})
+        out = trim_warmup(simulate_long_only(df, signal), df, signal, 10)
+        equity = pd.Series(out.equity_curve, index=df.index[10 : 10 + len(out.equity_curve)])
+        minmax_indices(equity.to_numpy(), 50)
+        json.dumps({**compute_metrics(equity), "bh": compute_buy_and_hold(df)})
+
+
+def preload() -> None:
+    """Import the engine and run its code paths once (blocking; called before serving)."""
+    READINESS.set_phase("preloading")
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module)
+
+    from backend.engine.data import YFinanceProvider, get_provider
+
+    if isinstance(get_provider(), YFinanceProvider):
+        try:
+            importlib.import_module("yfinance")
+        except ImportError:  # pragma: no cover - reported on the first download instead
+            log.warning("yfinance is not installed; downloads will fail")
+    _exercise_engine()
+
+
+async def prime_routes(app) -> None:
+    """
+    Send the main routes one real in-process request each (httpx over ASGI, through the
+    middleware), so FastAPI's lazily built middleware stack and per-route state, request
+    validation and response serialization are set up before the worker serves. The requests
+    ask for STARTUP_SYMBOL with a synthetic provider swapped in meanwhile; they are left out
+    of the metrics and their cached /backtest results are dropped again.
+    """
+    import httpx
+
+    from backend import telemetry
+    from backend.api.routes import RESULT_CACHE
+    from backend.engine import data
+    from backend.engine.strategies import STRATEGIES
+
+    payload = {"symbol": STARTUP_SYMBOL}
+    requests = [("GET", "/strategies", None)]
+    requests += [("POST", "/backtest", {**payload, "strategy": name}) for name in STRATEGIES]
+    requests += [("POST", "/backtest/chart", {**payload, "strategy": next(iter(STRATEGIES))})]
+
+    previous = data.set_provider(_SyntheticProvider())
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+            with telemetry.unrecorded():
+                for method, path, body in requests:
+                    r = await client.request(method, path, json=body)
+                    if r.status_code != 200:
+                        log.warning("start-up request %s %s: %s", method, path, r.status_code)
+                    etag = r.headers.get("etag")
+                    if etag:
+                        RESULT_CACHE.discard(etag.strip('"'))
+    finally:
+        data.set_provider(previous)
+
+
+def warm_symbols(symbols: List[str]) -> None:
+    """Load each symbol's default window and its default indicators into the caches."""
+    from backend.engine import data
+    from backend.engine.strategies import STRATEGIES, build_signal
+
+    for symbol in symbols:
+        try:
+            df = data.fetch_ohlc(symbol)
+            for name in STRATEGIES:
+                build_signal(df, name, {})
+        except Exception as e:
+            log.warning("warm-up of %s failed: %s", symbol, e)
+            READINESS.record(symbol, f"{type(e).__name__}: {e}")
+        else:
+            READINESS.record(symbol)
+
+
+def start_warmup(symbols: List[str]) -> Optional[threading.Thread]:
+    """Warm ``symbols`` on a background thread, then mark the worker ready."""
+    if not symbols:
+        READINESS.set_phase("ready")
+        return None
+
+    def run() -> None:
+        try:
+            warm_symbols(symbols)
+        finally:
+            READINESS.set_phase("ready")
+
+    READINESS.set_phase("warming")
+    thread = threading.Thread(target=run, name="algotrade-warmup", daemon=True)
+    thread.start()
+    return thread
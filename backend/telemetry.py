@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import os
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# ---------------------------------------------------------------------
+# Request telemetry: per-stage timers (Server-Timing header) and Prometheus metrics.
+#
+# Hot-path calls (lap / stage / observe_bars) look up the current request's timer in a ContextVar
+# and do nothing when there is none, so with ALGOTRADE_TELEMETRY=0 the middleware is never
+# installed and instrumentation reduces to one ContextVar read per call site.
+ENV_FLAG = "ALGOTRADE_TELEMETRY"
+
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BYTES_BUCKETS = tuple(float(4**k) for k in range(4, 14))  # 256 B .. 64 MB
+BARS_BUCKETS = (100, 1_000, 5_000, 10_000, 50_000, 100_000, 1_000_000, 10_000_000)
+
+
+def enabled_from_env() -> bool:
+    return os.environ.get(ENV_FLAG, "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label value (Prometheus semantics)."""
+
+    def __init__(self, name: str, help: str, label: str, buckets: Iterable[float]):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[str, List[float]] = {}  # label -> [bucket counts..., +Inf, sum]
+
+    def observe(self, label: str, value: float) -> None:
+        series = self._series.get(label)
+        if series is None:
+            series = self._series[label] = [0.0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label, series in sorted(self._series.items()):
+            tag = f'{self.label}="{label}"'
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1], strict=True):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f'{self.name}_bucket{{{tag},le="{le}"}} {cumulative:g}')
+            lines.append(f"{self.name}_sum{{{tag}}} {series[-1]:.6g}")
+            lines.append(f"{self.name}_count{{{tag}}} {cumulative:g}")
+        return lines
+
+
+class Registry:
+    """Process-wide metric store; ``collectors`` add lines computed at scrape time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = Histogram(
+            "algotrade_stage_seconds", "Time spent per request stage.", "stage", STAGE_BUCKETS
+        )
+        self.requests = Histogram(
+            "algotrade_request_seconds", "Request latency by route.", "route", STAGE_BUCKETS
+        )
+        self.request_bytes = Histogram(
+            "algotrade_request_bytes", "Request body size by route.", "route", BYTES_BUCKETS
+        )
+        self.response_bytes = Histogram(
+            "algotrade_response_bytes", "Response body size by route.", "route", BYTES_BUCKETS
+        )
+        self.bars = Histogram(
+            "algotrade_bars", "Price bars loaded per backtest.", "route", BARS_BUCKETS
+        )
+        self.statuses: Dict[Tuple[str, int], int] = {}
+        self.collectors: List[Callable[[], List[str]]] = []
+
+    def record_request(
+        self,
+        route: str,
+        status: int,
+        seconds: float,
+        request_bytes: int,
+        response_bytes: int,
+        timer: "RequestTimer",
+    ) -> None:
+        with self._lock:
+            self.requests.observe(route, seconds)
+            self.request_bytes.observe(route, request_bytes)
+            self.response_bytes.observe(route, response_bytes)
+            for stage, spent in timer.stages.items():
+                self.stages.observe(stage, spent)
+            if timer.bars is not None:
+                self.bars.observe(route, timer.bars)
+            self.statuses[(route, status)] = self.statuses.get((route, status), 0) + 1
+
+    def render(self) -> str:
+        with self._lock:
+            lines = [
+                "# HELP algotrade_requests_total Requests by route and status.",
+                "# TYPE algotrade_requests_total counter",
+            ]
+            for (route, status), count in sorted(self.statuses.items()):
+                tag = f'route="{route}",status="{status}"'
+                lines.append(f"algotrade_requests_total{{{tag}}} {count}")
+            for hist in (self.requests, self.stages, self.request_bytes, self.response_bytes,
+                         self.bars):
+                lines.extend(hist.render())
+        for collect in self.collectors:
+            lines.extend(collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# ---------------------------------------------------------------------
+# Per-request timer
+class RequestTimer:
+    __slots__ = ("start", "_last", "stages", "bars")
+
+    def __init__(self):
+        self.start = self._last = perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.bars: Optional[int] = None
+
+    def lap(self, stage: str) -> None:
+        """Charge the time since the previous lap (or request start) to ``stage``."""
+        now = perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        parts = [f"{stage};dur={spent * 1e3:.2f}" for stage, spent in self.stages.items()]
+        parts.append(f"total;dur={total * 1e3:.2f}")
+        return ", ".join(parts)
+
+
+_CURRENT: ContextVar[Optional[RequestTimer]] = ContextVar("algotrade_request_timer", default=None)
+
+
+class _Stage:
+    __slots__ = ("_timer", "_name", "_t0")
+
+    def __init__(self, timer: RequestTimer, name: str):
+        self._timer = timer
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._t0 = perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self._timer.add(self._name, perf_counter() - self._t0)
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+def lap(stage: str) -> None:
+    """Sequential stages of a handler: time since the previous lap goes to ``stage``."""
+    timer = _CURRENT.get()
+    if timer is not None:
+        timer.lap(stage)
+
+
+def stage(name: str):
+    """Context manager timing a nested step (e.g. a download inside the fetch stage)."""
+    timer = _CURRENT.get()
+    return _NULL_STAGE if timer is None else _Stage(timer, name)
+
+
+def observe_bars(n: int) -> None:
+    timer = _CURRENT.get()
+    if timer is not None:
+        timer.bars = n
+
+
+_RECORDED: ContextVar[bool] = ContextVar("algotrade_telemetry_recorded", default=True)
+
+
+@contextmanager
+def unrecorded() -> Iterator[None]:
+    """
+    Requests served from this context (in-process ones, e.g. the start-up warm-up) are
+    timed as usual but left out of the metrics.
+    """
+    token = _RECORDED.set(False)
+    try:
+        yield
+    finally:
+        _RECORDED.reset(token)
+
+
+# ---------------------------------------------------------------------
+class TelemetryMiddleware:
+    """
+    Pure ASGI middleware: opens a RequestTimer per HTTP request, adds the Server-Timing
+    header when the response starts and records request metrics when it ends.
+    """
+
+    def __init__(self, app, registry: Registry = REGISTRY):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timer = RequestTimer()
+        token = _CURRENT.set(timer)
+        request_bytes = 0
+        for key, value in scope.get("headers", ()):
+            if key == b"content-length":
+                request_bytes = int(value)
+        status = 500
+        response_bytes = 0
+
+        async def send_with_timing(message):
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing = timer.server_timing(perf_counter() - timer.start).encode()
+                message = {**message, "headers": [*message.get("headers", ()),
+                                                  (b"server-timing", timing)]}
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _CURRENT.reset(token)
+            if _RECORDED.get():
+                route = getattr(scope.get("route"), "path", None) or "unmatched"
+                self.registry.record_request(
+                    route, status, perf_counter() - timer.start, request_bytes, response_bytes,
+                    timer,
+                )
+
+
+def cache_metrics() -> List[str]:
+    """Scrape-time counters of the data, indicator and result caches."""
+    from backend.api.routes import RESULT_CACHE
+    from backend.engine import data
+    from backend.engine.indicators import INDICATORS
+
+    caches = {
+        "frame": data.FRAME_CACHE.stats(),
+        "indicator": INDICATORS.stats(),
+        "result": RESULT_CACHE.stats(),
+    }
+    lines = []
+    for field, kind in (("hits", "counter"), ("misses", "counter"), ("evictions", "counter"),
+                        ("invalidations", "counter"), ("entries", "gauge"), ("bytes", "gauge")):
+        name = f"algotrade_cache_{field}" + ("_total" if kind == "counter" else "")
+        lines += [f"# HELP {name} Cache {field} by cache.", f"# TYPE {name} {kind}"]
+        for cache, stats in caches.items():
+            if field in stats:
+                lines.append(f'{name}{{cache="{cache}"}} {stats[field]}')
+
+    flights = data._FLIGHTS.stats()
+    lines += [
+        "# HELP algotrade_data_loads_total Data loads executed vs. shared by concurrent callers.",
+        "# TYPE algotrade_data_loads_total counter",
+        f'algotrade_data_loads_total{{result="executed"}} {flights["executed"]}',
+        f'algotrade_data_loads_total{{result="shared"}} {flights["shared"]}',
+    ]
+    return lines
+
+
+REGISTRY.collectors.append(cache_metrics)
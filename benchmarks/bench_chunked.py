@@ -0,0 +1,42 @@
+"""
+Chunked simulation from a memory-mapped bars file: time and peak Python-heap memory
+(numpy buffers, via tracemalloc) as history grows. Peak should stay flat.
+
+    python -m benchmarks.bench_chunked [n_bars ...]
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from backend.engine.chunked import simulate_file, write_bars
+from backend.engine.strategies import build_signal
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+def main(sizes=(1_000_000, 4_000_000)) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_bars in sizes:
+            df = synthetic_ohlcv(n_bars, freq="minute")
+            signal = build_signal(df, "sma_crossover", {"fast": 50, "slow": 200})
+            path = write_bars(df, Path(tmp) / "bars.arrow", signal=signal, float32=True)
+            del df, signal
+
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            out = simulate_file(path, cost_bps=5, slippage_bps=2)
+            elapsed = time.perf_counter() - t0
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f"bars={n_bars:>11,}  {elapsed:7.3f} s  peak {peak / 1e6:7.1f} MB  "
+                f"fills={len(out.trade_log):,}  final equity {out.final_equity:.4f}"
+            )
+
+
+if __name__ == "__main__":
+    sizes = tuple(int(a) for a in sys.argv[1:])
+    main(sizes or (1_000_000, 4_000_000))
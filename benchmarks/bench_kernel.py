@@ -0,0 +1,75 @@
+"""
+Simulation: legacy pandas simulate_long_only vs. the NumPy kernel it now wraps.
+
+    python -m benchmarks.bench_kernel [n_bars]
+
+Reports best-of-3 latency and the tracemalloc peak (bytes allocated on top of the inputs).
+"""
+from __future__ import annotations
+
+import sys
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from backend.engine.backtester import (
+    BacktestOutput,
+    build_trade_log,
+    simulate_long_only,
+    simulate_positions,
+)
+from benchmarks.suite import time_runs
+
+
+def _legacy_simulate(df: pd.DataFrame, signal: pd.Series, cost_bps: float, slippage_bps: float):
+    # The Series pipeline simulate_long_only ran before the kernel, kept as the reference.
+    signal = signal.astype(int)
+    r_close = df["Close"].pct_change().fillna(0.0)
+    pos = signal.shift(1).fillna(0).astype(int)
+    gross = r_close * pos
+    turnover = signal.diff().abs().fillna(0.0)
+    fric = (cost_bps + slippage_bps) / 10000.0
+    net = gross - turnover * fric
+    equity = (1.0 + net).cumprod()
+    return BacktestOutput(
+        equity_curve=equity.tolist(),
+        trade_log=build_trade_log(df, signal, cost_bps=cost_bps, slippage_bps=slippage_bps),
+    )
+
+
+def _peak(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(n_bars: int = 1_000_000) -> None:
+    rng = np.random.default_rng(7)
+    idx = pd.date_range("2000-01-03", periods=n_bars, freq="min")
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.0005, n_bars))
+    df = pd.DataFrame({"Open": close, "Close": close}, index=idx)
+    signal = pd.Series(np.cumsum(rng.random(n_bars) < 0.05) % 2, index=idx)
+    target = signal.to_numpy() - 0.5
+
+    cases = [
+        ("legacy pandas", lambda: _legacy_simulate(df, signal, 5, 2)),
+        ("simulate_long_only", lambda: simulate_long_only(df, signal, 5, 2)),
+        ("  validate=False", lambda: simulate_long_only(df, signal, 5, 2, validate=False)),
+        ("simulate_positions", lambda: simulate_positions(close, target, 5, 2)),
+        ("  validate=False", lambda: simulate_positions(close, target, 5, 2, validate=False)),
+    ]
+    assert _legacy_simulate(df, signal, 5, 2).equity_curve == (
+        simulate_long_only(df, signal, 5, 2).equity_curve
+    )
+    print(f"bars={n_bars:,}")
+    for name, fn in cases:
+        best = min(time_runs(fn, 3, warmup=False))
+        print(f"{name:<24}: {best * 1e3:8.1f} ms  peak {_peak(fn) / 2**20:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
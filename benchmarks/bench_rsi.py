@@ -0,0 +1,55 @@
+"""
+RSI band signals: legacy bar-by-bar ``signal.iloc[i] = ...`` loop vs. vectorized hysteresis.
+
+    python -m benchmarks.bench_rsi [n_bars]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.engine.strategies.rsi import rsi, rsi_band_signals
+
+
+def _legacy_rsi_band_signals(df: pd.DataFrame, period: int, lower: float, upper: float):
+    # The loop the strategy used before vectorization, kept as the reference.
+    r = pd.Series(rsi(df["Close"].to_numpy(), period), index=df.index)
+    signal = pd.Series(index=df.index, dtype=float)
+    signal.iloc[0] = 0
+    for i in range(1, len(df)):
+        if r.iloc[i] < lower:
+            signal.iloc[i] = 1
+        elif r.iloc[i] > upper:
+            signal.iloc[i] = 0
+        else:
+            signal.iloc[i] = signal.iloc[i - 1]
+    return signal
+
+
+def main(n_bars: int = 100_000) -> None:
+    rng = np.random.default_rng(11)
+    idx = pd.date_range("2000-01-03", periods=n_bars, freq="min")
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.001, n_bars))
+    df = pd.DataFrame({"Close": close}, index=idx)
+
+    t0 = time.perf_counter()
+    legacy = _legacy_rsi_band_signals(df, 14, 30, 70)
+    t_legacy = time.perf_counter() - t0
+
+    best = float("inf")
+    for _ in range(5):
+        t0 = time.perf_counter()
+        fast = rsi_band_signals(df, 14, 30, 70)
+        best = min(best, time.perf_counter() - t0)
+
+    assert np.array_equal(legacy.to_numpy(), fast.to_numpy())
+    print(f"bars={n_bars:,}")
+    print(f"legacy loop : {t_legacy * 1e3:10.1f} ms")
+    print(f"vectorized  : {best * 1e3:10.1f} ms  ({t_legacy / best:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
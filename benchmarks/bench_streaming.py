@@ -0,0 +1,41 @@
+"""
+Event-driven engine throughput (bars/sec on one core) for each streaming strategy.
+
+    python -m benchmarks.bench_streaming [n_bars]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.engine.streaming import StreamingBacktester, make_signal_state
+
+CASES = [
+    ("sma_crossover", {"fast": 50, "slow": 200}),
+    ("rsi", {"period": 14, "lower": 30, "upper": 70}),
+]
+
+
+def main(n_bars: int = 1_000_000) -> None:
+    rng = np.random.default_rng(3)
+    idx = pd.date_range("2000-01-03", periods=n_bars, freq="min")
+    close = (100 * np.cumprod(1 + rng.normal(0, 0.0005, n_bars))).tolist()
+    bars = list(zip(idx, close, close, strict=True))
+
+    print(f"bars={n_bars:,}")
+    for strategy, params in CASES:
+        state = make_signal_state(strategy, params)
+        engine = StreamingBacktester(state, cost_bps=5, slippage_bps=2)
+        on_bar = engine.on_bar
+        t0 = time.perf_counter()
+        for ts, open_, close_ in bars:
+            on_bar(ts, close_, open_)
+        elapsed = time.perf_counter() - t0
+        print(f"{strategy:14s}: {n_bars / elapsed:12,.0f} bars/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
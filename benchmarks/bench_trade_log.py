@@ -0,0 +1,58 @@
+"""
+Trade-log construction: legacy per-trade Python loop vs. columnar build_trade_log.
+
+    python -m benchmarks.bench_trade_log [n_bars]
+"""
+from __future__ import annotations
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from backend.engine.backtester import build_trade_log
+from benchmarks.suite import time_runs
+
+
+def _legacy_trade_log(df: pd.DataFrame, signal: pd.Series, cost_bps: float, slippage_bps: float):
+    # The loop simulate_long_only used before the columnar trade log, kept as the reference.
+    opens = df["Open"] if "Open" in df.columns else df["Close"]
+    changes = signal.diff().fillna(0.0)
+    trades = []
+    for ts, ch in changes.items():
+        if ch == 0:
+            continue
+        trades.append(
+            {
+                "ts": ts.isoformat(),
+                "side": "buy" if ch == 1 else "sell",
+                "price": float(opens.loc[ts]),
+                "qty": 1.0,
+                "fees": round(cost_bps / 10000.0, 8),
+                "slippage": round(slippage_bps / 10000.0, 8),
+            }
+        )
+    return trades
+
+
+def main(n_bars: int = 1_000_000) -> None:
+    rng = np.random.default_rng(7)
+    idx = pd.date_range("2000-01-03", periods=n_bars, freq="min")
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.0005, n_bars))
+    df = pd.DataFrame({"Open": close, "Close": close}, index=idx)
+    # frequent crossovers: flip state with ~5% probability per bar
+    signal = pd.Series(np.cumsum(rng.random(n_bars) < 0.05) % 2, index=idx)
+
+    legacy = min(time_runs(lambda: _legacy_trade_log(df, signal, 5, 2), 1, warmup=False))
+    columnar = min(time_runs(lambda: build_trade_log(df, signal, 5, 2), 3, warmup=False))
+    lazy = min(time_runs(lambda: build_trade_log(df, signal, 5, 2).to_dicts(), 1, warmup=False))
+
+    n_trades = len(build_trade_log(df, signal))
+    print(f"bars={n_bars:,} trades={n_trades:,}")
+    print(f"legacy loop        : {legacy * 1e3:10.1f} ms")
+    print(f"columnar           : {columnar * 1e3:10.1f} ms  ({legacy / columnar:,.0f}x)")
+    print(f"columnar + dicts   : {lazy * 1e3:10.1f} ms  ({legacy / lazy:,.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,311 @@
+"""
+Reproducible benchmark suite over deterministic synthetic data (see synthetic.py).
+
+    python -m benchmarks.suite run [--profile quick|full] [--case PREFIX] [--repeat N]
+                                   [--out benchmarks/results.json]
+    python -m benchmarks.suite compare BASELINE.json CURRENT.json [--threshold 0.25]
+
+``run`` times each case at each (freq, bars) size and writes machine-readable JSON.
+``compare`` matches results by (case, freq, bars) and exits non-zero when any case got
+slower than the baseline by more than ``threshold`` (relative).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_ohlcv
+
+# (freq, bars) grids; daily bars cap out around 68k (pandas timestamp range)
+PROFILES: Dict[str, List[Tuple[str, int]]] = {
+    "quick": [("daily", 1_000), ("daily", 10_000), ("minute", 100_000)],
+    "full": [
+        ("daily", 1_000),
+        ("daily", 10_000),
+        ("minute", 100_000),
+        ("minute", 1_000_000),
+        ("minute", 10_000_000),
+    ],
+}
+
+SMA = {"fast": 50, "slow": 200}
+RSI = {"period": 14, "lower": 30, "upper": 70}
+
+
+@dataclass
+class Case:
+    name: str
+    prepare: Callable[[pd.DataFrame], Callable[[], object]]  # untimed setup -> timed call
+    max_bars: Optional[int] = None                          # skip larger sizes
+
+
+# ---------------------------------------------------------------------
+# Cases
+def _signals(strategy: str, params: dict):
+    from backend.engine.indicators import INDICATORS
+    from backend.engine.strategies import build_signal
+
+    def prepare(df: pd.DataFrame):
+        def run():
+            INDICATORS.clear()  # time the computation, not an indicator-store lookup
+            return build_signal(df, strategy, params)
+
+        return run
+
+    return prepare
+
+
+def _simulate(df: pd.DataFrame):
+    from backend.engine.backtester import simulate_long_only
+    from backend.engine.strategies import build_signal
+
+    signal = build_signal(df, "sma_crossover", SMA)
+    return lambda: simulate_long_only(df, signal, cost_bps=5, slippage_bps=2)
+
+
+def _simulate_positions(df: pd.DataFrame):
+    from backend.engine.backtester import simulate_positions
+    from backend.engine.strategies import build_signal
+
+    # long/short at half size: the kernel on float targets, no pandas in the loop
+    close = df["Close"].to_numpy(dtype=float)
+    target = build_signal(df, "sma_crossover", SMA).to_numpy() - 0.5
+    return lambda: simulate_positions(close, target, cost_bps=5, slippage_bps=2)
+
+
+def _backtest_output(df: pd.DataFrame):
+    from backend.engine.backtester import simulate_long_only
+    from backend.engine.strategies import build_signal
+
+    out = simulate_long_only(df, build_signal(df, "sma_crossover", SMA), cost_bps=5)
+    return out, pd.Series(out.equity_curve, index=df.index)
+
+
+def _metrics(df: pd.DataFrame):
+    from backend.engine.metrics import compute_metrics
+
+    _, equity = _backtest_output(df)
+    return lambda: compute_metrics(equity, rf_rate_pct=2.0)
+
+
+def _serialize_json(df: pd.DataFrame):
+    from backend.api.schemas import BacktestResponse
+    from backend.engine.metrics import compute_metrics
+
+    out, equity = _backtest_output(df)
+    summary = {**compute_metrics(equity), "trades": len(out.trade_log)}
+    config = {
+        "symbol": "SYN",
+        "strategy": "sma_crossover",
+        "params": SMA,
+        "cost_bps": 5.0,
+        "slippage_bps": 0.0,
+        "rf_rate_pct": 0.0,
+    }
+
+    def run():
+        return BacktestResponse(
+            summary=summary,
+            equity_curve=out.equity_curve,
+            trades=out.trades,
+            benchmarks={"buy_and_hold_return_pct": 0.0},
+            config=config,
+        ).model_dump_json()
+
+    return run
+
+
+def _serialize_arrow(df: pd.DataFrame):
+    from backend.api.arrow import encode_sections, equity_table, trades_table
+
+    out, equity = _backtest_output(df)
+    return lambda: encode_sections(
+        {
+            "equity": equity_table(equity.index, equity.to_numpy()),
+            "trades": trades_table(out.trade_log),
+        }
+    )
+
+
+def _robustness(df: pd.DataFrame):
+    from backend.engine.robustness import resample_metrics
+
+    _, equity = _backtest_output(df)
+    curve = equity.to_numpy()
+    net = curve[1:] / curve[:-1] - 1
+    return lambda: resample_metrics(net, n_paths=10_000, seed=0)
+
+
+@contextmanager
+def _patched_api(df: pd.DataFrame) -> Iterator[None]:
+    """Serve ``df`` for every symbol and bypass the result cache."""
+    import backend.api.routes as routes_mod
+    import backend.engine.data as data_mod
+    from backend.api.result_cache import ResultCache
+
+    saved = data_mod.fetch_ohlc, routes_mod.RESULT_CACHE
+    data_mod.fetch_ohlc = lambda symbol, start=None, end=None, **kwargs: df
+    routes_mod.RESULT_CACHE = ResultCache(max_bytes=0)
+    try:
+        yield
+    finally:
+        data_mod.fetch_ohlc, routes_mod.RESULT_CACHE = saved
+
+
+def _api_backtest(df: pd.DataFrame):
+    from fastapi.testclient import TestClient
+
+    from backend.main import app
+
+    client = TestClient(app)
+    payload = {"symbol": "SYN", "strategy": "sma_crossover", "params": SMA, "cost_bps": 5}
+
+    def run():
+        with _patched_api(df):
+            r = client.post("/backtest", json=payload)
+        if r.status_code != 200:
+            raise RuntimeError(f"/backtest returned {r.status_code}: {r.text[:200]}")
+        return r
+
+    return run
+
+
+CASES: List[Case] = [
+    Case("signals.sma_crossover", _signals("sma_crossover", SMA)),
+    Case("signals.rsi", _signals("rsi", RSI)),
+    Case("simulate.long_only", _simulate),
+    Case("simulate.positions", _simulate_positions),
+    Case("metrics.compute", _metrics),
+    Case("robustness.bootstrap_10k", _robustness, max_bars=10_000),
+    Case("serialize.json", _serialize_json, max_bars=1_000_000),
+    Case("serialize.arrow", _serialize_arrow),
+    Case("api.backtest", _api_backtest, max_bars=1_000_000),
+]
+
+
+# ---------------------------------------------------------------------
+def time_runs(fn: Callable[[], object], repeat: int, warmup: bool = True) -> List[float]:
+    """Wall time of ``repeat`` calls (the benchmark scripts share this timer too)."""
+    if warmup:
+        fn()  # warm-up: imports, first-touch allocations
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def run_suite(
+    sizes: List[Tuple[str, int]],
+    cases: List[Case],
+    repeat: int = 3,
+    seed: int = 0,
+    log=print,
+) -> dict:
+    results = []
+    for freq, n_bars in sizes:
+        df = synthetic_ohlcv(n_bars, freq=freq, seed=seed)
+        for case in cases:
+            if case.max_bars is not None and n_bars > case.max_bars:
+                continue
+            times = time_runs(case.prepare(df), repeat)
+            row = {
+                "case": case.name,
+                "freq": freq,
+                "bars": n_bars,
+                "repeat": repeat,
+                "best_s": min(times),
+                "median_s": statistics.median(times),
+            }
+            results.append(row)
+            log(f"{case.name:24s} {freq:7s} {n_bars:>11,} bars  {row['best_s'] * 1e3:10.2f} ms")
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "seed": seed,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.25, min_delta_s: float = 1e-3):
+    """
+    Rows of (key, baseline_s, current_s, ratio, regressed) for cases present in both runs.
+    A case regresses when it is ``threshold`` slower (relative) and at least ``min_delta_s``
+    slower in absolute terms (ignores timer noise on sub-millisecond cases).
+    """
+    def index(run: dict) -> Dict[Tuple[str, str, int], float]:
+        return {(r["case"], r["freq"], r["bars"]): r["best_s"] for r in run["results"]}
+
+    base, cur = index(baseline), index(current)
+    rows = []
+    for key in sorted(base.keys() & cur.keys()):
+        b, c = base[key], cur[key]
+        ratio = c / b if b > 0 else float("inf")
+        rows.append((key, b, c, ratio, ratio > 1 + threshold and c - b >= min_delta_s))
+    return rows
+
+
+# ---------------------------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="run the suite and write JSON results")
+    p_run.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    p_run.add_argument("--case", action="append", help="only cases starting with PREFIX")
+    p_run.add_argument("--repeat", type=int, default=3)
+    p_run.add_argument("--seed", type=int, default=0)
+    p_run.add_argument("--out", default="benchmarks/results.json")
+
+    p_cmp = sub.add_parser("compare", help="flag regressions against a baseline run")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--threshold", type=float, default=0.25)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        cases = [c for c in CASES if not args.case or c.name.startswith(tuple(args.case))]
+        report = run_suite(PROFILES[args.profile], cases, repeat=args.repeat, seed=args.seed)
+        with open(args.out, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"wrote {len(report['results'])} results to {args.out}")
+        return 0
+
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    with open(args.current) as fh:
+        current = json.load(fh)
+    rows = compare(baseline, current, threshold=args.threshold)
+    for (case, freq, bars), b, c, ratio, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(
+            f"{case:24s} {freq:7s} {bars:>11,}  {b * 1e3:10.2f} -> {c * 1e3:10.2f} ms"
+            f"  x{ratio:5.2f}  {flag}"
+        )
+    regressions = sum(1 for row in rows if row[-1])
+    print(f"{len(rows)} compared, {regressions} regression(s) (threshold {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Deterministic synthetic OHLCV bars (geometric Brownian motion) for benchmarks.
+
+The same (n_bars, freq, seed) always yields the same frame, so timings from different
+commits/machines are measured on identical inputs.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+# bar frequency -> (pandas frequency, bars per year used to scale drift/vol)
+FREQS = {
+    "daily": ("B", 252),
+    "minute": ("min", 252 * 390),
+}
+
+
+def synthetic_ohlcv(
+    n_bars: int,
+    freq: str = "daily",
+    seed: int = 0,
+    start: str = "2000-01-03",
+    s0: float = 100.0,
+    mu: float = 0.07,
+    sigma: float = 0.2,
+) -> pd.DataFrame:
+    """
+    OHLCV frame with ``n_bars`` rows on a DatetimeIndex, like data.fetch_ohlc returns.
+    - Close follows GBM with annual drift ``mu`` and volatility ``sigma``
+    - Open gaps slightly from the previous close; High/Low bracket Open and Close
+    - daily bars are business days, so they top out around 68k bars (pandas' year-2262
+      timestamp limit); use minute bars for the multi-million sizes
+    """
+    if n_bars < 1:
+        raise ValueError("n_bars must be >= 1.")
+    if freq not in FREQS:
+        raise ValueError(f"Unknown freq: {freq} (expected one of {sorted(FREQS)})")
+    pd_freq, per_year = FREQS[freq]
+    dt = 1.0 / per_year
+
+    rng = np.random.default_rng(seed)
+    z = rng.standard_normal(n_bars)
+    log_ret = (mu - 0.5 * sigma**2) * dt + sigma * np.sqrt(dt) * z
+    close = s0 * np.exp(np.cumsum(log_ret))
+
+    prev = np.concatenate(([s0], close[:-1]))
+    open_ = prev * np.exp(rng.normal(0.0, 0.1 * sigma * np.sqrt(dt), n_bars))
+    wick = np.abs(rng.normal(0.0, 0.5 * sigma * np.sqrt(dt), (2, n_bars)))
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+    volume = np.round(rng.lognormal(13.0, 0.5, n_bars))
+
+    idx = pd.date_range(start, periods=n_bars, freq=pd_freq, name="Datetime")
+    return pd.DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}, index=idx
+    )
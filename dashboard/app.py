@@ -1,14 +1,27 @@
+import os
+
 import streamlit as st
 import requests
 import pandas as pd
 import matplotlib.pyplot as plt
-import yfinance as yf
 
-API = "http://127.0.0.1:8000"
+API = os.environ.get("ALGOTRADE_API", "http://127.0.0.1:8000")
+MAX_POINTS = 1500  # per plotted series; the backend downsamples, the UI never sees every bar
 
 st.set_page_config(page_title="AlgoTrade Lite", layout="wide")
 st.title("AlgoTrade Lite")
 
+
+# Same form -> same payload -> served from Streamlit's cache, no request to the API at all.
+# Errors raise, and exceptions are never cached.
+@st.cache_data(ttl=600, show_spinner=False)
+def post_json(path: str, payload: dict) -> dict:
+    r = requests.post(f"{API}{path}", json=payload, timeout=120)
+    if not r.ok:
+        raise RuntimeError(r.text)
+    return r.json()
+
+
 with st.form("backtest"):
     c1, c2, c3 = st.columns(3)
 
@@ -26,76 +39,92 @@ with st.form("backtest"):
             params["fast"] = st.number_input("fast", min_value=2, max_value=400, value=10, step=1)
             params["slow"] = st.number_input("slow", min_value=3, max_value=500, value=30, step=1)
         else:
-            params["period"] = st.number_input("period", min_value=5, max_value=100, value=14, step=1)
+            params["period"] = st.number_input(
+                "period", min_value=5, max_value=100, value=14, step=1
+            )
             params["lower"] = st.number_input("lower", min_value=5, max_value=50, value=30, step=1)
             params["upper"] = st.number_input("upper", min_value=50, max_value=95, value=70, step=1)
 
         # optional trading cost in bps (0.05% = 5 bps)
-        params["cost_bps"] = st.number_input("cost_bps (per trade)", min_value=0, max_value=200, value=0, step=1)
+        cost_bps = st.number_input(
+            "cost_bps (per trade)", min_value=0, max_value=200, value=0, step=1
+        )
 
     submitted = st.form_submit_button("Run backtest")
 
 if submitted:
-    payload = {"symbol": symbol, "strategy": strategy, "params": params}
+    payload = {
+        "symbol": symbol.strip().upper(),
+        "strategy": strategy,
+        "params": params,
+        "cost_bps": cost_bps,
+        "max_points": MAX_POINTS,
+    }
     if start.strip():
         payload["start"] = start.strip()
     if end.strip():
         payload["end"] = end.strip()
 
+    # one call: /backtest/chart carries the summary and equity as well as the plot series
     with st.spinner("Running backtest..."):
         try:
-            r = requests.post(f"{API}/backtest", json=payload, timeout=60)
+            chart = post_json("/backtest/chart", payload)
         except Exception as e:
             st.error(f"Request failed: {e}")
             st.stop()
 
-    if not r.ok:
-        st.error(r.text)
-        st.stop()
-
-    data = r.json()
-
     # ---- Metrics summary ----
     st.subheader("Metrics")
-    m = data["metrics"]
-    cols = st.columns(5)
-    cols[0].metric("Return %", m["return_pct"])
-    cols[1].metric("Sharpe", m["sharpe"])
-    cols[2].metric("Max DD %", m["max_drawdown_pct"])
-    cols[3].metric("Trades", data["n_trades"])
-    cols[4].write(f"**Period:** {data['start']} → {data['end']}")
+    s = chart["summary"]
+    cols = st.columns(6)
+    cols[0].metric("Ann. return %", f"{s['ann_return_pct']:.2f}")
+    cols[1].metric("Sharpe", f"{s['sharpe']:.2f}")
+    cols[2].metric("Max DD %", f"{s['max_drawdown_pct']:.2f}")
+    cols[3].metric("Trades", s["trades"])
+    cols[4].metric("Buy & hold %", f"{chart['benchmarks']['buy_and_hold_return_pct']:.2f}")
+    if chart["timestamps"]:
+        first, last = chart["timestamps"][0][:10], chart["timestamps"][-1][:10]
+        cols[5].write(f"**Period:** {first} → {last}")
 
     # ---- Equity curve plot ----
-    eq = pd.Series(data["equity_curve"])
+    ts = pd.to_datetime(chart["timestamps"])
     fig = plt.figure()
-    plt.plot(eq.index, eq.values)
+    plt.plot(ts, chart["equity"])
     plt.title("Equity Curve")
-    plt.xlabel("Bars")
+    plt.xlabel("Date")
     plt.ylabel("Equity")
     st.pyplot(fig)
 
-    # ---- Price + indicator plot (for SMA only) ----
-    if strategy == "sma_crossover":
-        # fetch for visualization only (backend already did the official calc)
-        if not (start.strip() or end.strip()):
-            hist = yf.Ticker(symbol).history(period="5y", auto_adjust=True, actions=False)
-        else:
-            hist = yf.Ticker(symbol).history(start=start or None, end=end or None, auto_adjust=True, actions=False)
-
-        if not hist.empty and "Close" in hist.columns:
-            fast = int(params.get("fast", 10))
-            slow = int(params.get("slow", 30))
-            fast_ma = hist["Close"].rolling(fast).mean()
-            slow_ma = hist["Close"].rolling(slow).mean()
-
-            st.subheader("Price with Moving Averages")
-            fig2 = plt.figure()
-            plt.plot(hist.index, hist["Close"].values, label="Close")
-            plt.plot(hist.index, fast_ma.values, label=f"MA {fast}")
-            plt.plot(hist.index, slow_ma.values, label=f"MA {slow}")
-            plt.legend()
-            plt.xlabel("Date")
-            plt.ylabel("Price")
-            st.pyplot(fig2)
-        else:
-            st.info("Could not fetch price history for the MA overlay.")
+    # ---- Price + indicators + trade markers (same timestamps) ----
+    price_lines = [x for x in chart["indicators"] if x["pane"] == "price"]
+    panel_lines = [x for x in chart["indicators"] if x["pane"] == "separate"]
+
+    st.subheader("Price, Indicators and Trades")
+    if panel_lines:
+        fig2, (ax, ax_ind) = plt.subplots(
+            2, 1, sharex=True, gridspec_kw={"height_ratios": [3, 1]}
+        )
+    else:
+        fig2, ax = plt.subplots()
+        ax_ind = None
+
+    ax.plot(ts, chart["close"], label="Close")
+    for line in price_lines:
+        ax.plot(ts, pd.Series(line["values"], dtype=float), label=line["name"])
+
+    trades = pd.DataFrame(chart["trades"], columns=["ts", "side", "price"])
+    buys, sells = trades[trades["side"] == "buy"], trades[trades["side"] == "sell"]
+    ax.scatter(pd.to_datetime(buys["ts"]), buys["price"], marker="^", color="green", label="Buy")
+    ax.scatter(pd.to_datetime(sells["ts"]), sells["price"], marker="v", color="red", label="Sell")
+    ax.set_ylabel("Price")
+    ax.legend()
+
+    if ax_ind is not None:
+        for line in panel_lines:
+            ax_ind.plot(ts, pd.Series(line["values"], dtype=float), label=line["name"])
+        if strategy == "rsi":
+            ax_ind.axhline(params["lower"], color="gray", linestyle="--", linewidth=0.8)
+            ax_ind.axhline(params["upper"], color="gray", linestyle="--", linewidth=0.8)
+        ax_ind.legend()
+    (ax_ind or ax).set_xlabel("Date")
+    st.pyplot(fig2)
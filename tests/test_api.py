@@ -35,3 +35,330 @@ def test_backtest_endpoint_stubbed(monkeypatch):
     assert r.status_code == 200
     body = r.json()
     assert "summary" in body and "equity_curve" in body and "trades" in body
+
+def test_sweep_endpoint_stubbed(monkeypatch):
+    import backend.engine.data as data_mod
+    monkeypatch.setattr(data_mod, "fetch_ohlc", lambda symbol, start=None, end=None: _stub_df())
+
+    payload = {
+        "symbol": "FAKE",
+        "fast": {"start": 5, "stop": 15, "step": 5},
+        "slow": {"start": 20, "stop": 40, "step": 10},
+        "rank_by": "sharpe",
+        "top_n": 4,
+    }
+    r = client.post("/backtest/sweep", json=payload)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["evaluated"] == 9
+    assert len(body["results"]) == 4
+    sharpes = [row["sharpe"] for row in body["results"]]
+    assert sharpes == sorted(sharpes, reverse=True)
+
+    huge = {**payload, "fast": {"start": 1, "stop": 1000}, "slow": {"start": 1, "stop": 1000}}
+    r = client.post("/backtest/sweep", json=huge)
+    assert r.status_code == 422 and "combinations" in r.text
+
+def test_batch_endpoint_reports_per_symbol_errors(monkeypatch):
+    import backend.engine.data as data_mod
+    def fake_fetch(symbol, start=None, end=None):
+        if symbol == "BAD":
+            raise ValueError("unknown ticker")
+        return _stub_df()
+    monkeypatch.setattr(data_mod, "fetch_ohlc", fake_fetch)
+
+    payload = {
+        "symbols": ["FAKE", "BAD"],
+        "strategy": "sma_crossover",
+        "params": {"fast": 5, "slow": 15},
+        "max_workers": 1,
+    }
+    r = client.post("/backtest/batch", json=payload)
+    assert r.status_code == 200
+    body = r.json()
+    assert set(body["results"]) == {"FAKE"}
+    assert "unknown ticker" in body["errors"]["BAD"]
+
+def test_backtest_rsi_strategy_stubbed(monkeypatch):
+    import backend.engine.data as data_mod
+    monkeypatch.setattr(data_mod, "fetch_ohlc", lambda symbol, start=None, end=None: _stub_df())
+
+    payload = {
+        "symbol": "FAKE",
+        "strategy": "rsi",
+        "params": {"period": 14, "lower": 40, "upper": 60},
+    }
+    r = client.post("/backtest", json=payload)
+    assert r.status_code == 200
+    assert r.json()["config"]["strategy"] == "rsi"
+
+def test_backtest_result_cache_and_conditional_get(monkeypatch):
+    import backend.api.routes as routes_mod
+    import backend.engine.backtester as bt_mod
+    import backend.engine.data as data_mod
+    from backend.api.result_cache import ResultCache
+
+    monkeypatch.setattr(routes_mod, "RESULT_CACHE", ResultCache())
+    monkeypatch.setattr(data_mod, "fetch_ohlc", lambda symbol, start=None, end=None: _stub_df())
+    runs = []
+    real_simulate = bt_mod.simulate_long_only
+    def counting_simulate(*args, **kwargs):
+        runs.append(1)
+        return real_simulate(*args, **kwargs)
+
+    monkeypatch.setattr(bt_mod, "simulate_long_only", counting_simulate)
+
+    payload = {"symbol": "FAKE", "strategy": "sma_crossover", "params": {"fast": 5, "slow": 15}}
+    first = client.post("/backtest", json=payload)
+    second = client.post("/backtest", json=payload)
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert len(runs) == 1
+    etag = first.headers["etag"]
+    assert second.headers["etag"] == etag and "max-age" in first.headers["cache-control"]
+
+    not_modified = client.post("/backtest", json=payload, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+
+    # new data -> new fingerprint -> new ETag and a fresh run
+    monkeypatch.setattr(
+        data_mod, "fetch_ohlc", lambda symbol, start=None, end=None: _stub_df(seed=2)
+    )
+    third = client.post("/backtest", json=payload, headers={"If-None-Match": etag})
+    assert third.status_code == 200 and third.headers["etag"] != etag
+    assert len(runs) == 2
+
+def test_backtest_downsampled_and_ndjson_stream(monkeypatch):
+    import json
+    import backend.engine.data as data_mod
+    monkeypatch.setattr(
+        data_mod, "fetch_ohlc", lambda symbol, start=None, end=None: _stub_df(n=2000)
+    )
+
+    payload = {"symbol": "FAKE", "strategy": "sma_crossover", "params": {"fast": 5, "slow": 15}}
+    full = client.post("/backtest", json=payload).json()
+    small = client.post("/backtest", json={**payload, "max_points": 100}).json()
+    assert len(full["equity_curve"]) == 2000 and full["equity_timestamps"] is None
+    assert len(small["equity_curve"]) <= 100
+    assert len(small["equity_timestamps"]) == len(small["equity_curve"])
+    assert small["summary"] == full["summary"]   # metrics use the full curve
+
+    r = client.post("/backtest", json=payload, headers={"Accept": "application/x-ndjson"})
+    assert r.status_code == 200 and r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert lines[0]["summary"] == full["summary"] and lines[0]["points"] == 2000
+    assert [p["equity"] for p in lines[1:]] == full["equity_curve"]
+    assert lines[1]["ts"] == "2020-01-01T00:00:00"
+
+def test_backtest_and_batch_arrow_responses(monkeypatch):
+    import numpy as np
+    import backend.engine.data as data_mod
+    from backend.api.arrow import decode_sections, section_extras
+
+    def fake_fetch(symbol, start=None, end=None):
+        if symbol == "BAD":
+            raise ValueError("unknown ticker")
+        return _stub_df()
+    monkeypatch.setattr(data_mod, "fetch_ohlc", fake_fetch)
+    arrow = {"Accept": "application/vnd.apache.arrow.stream"}
+
+    payload = {"symbol": "FAKE", "strategy": "sma_crossover", "params": {"fast": 5, "slow": 15}}
+    body = client.post("/backtest", json=payload).json()
+    r = client.post("/backtest?equity_dtype=float32", json=payload, headers=arrow)
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/vnd.apache.arrow.stream"
+
+    sections = decode_sections(r.content)
+    equity, trades = sections["equity"], sections["trades"]
+    assert str(equity.schema.field("equity").type) == "float"
+    assert np.allclose(equity.column("equity").to_numpy(), body["equity_curve"], rtol=1e-6)
+    assert trades.num_rows == len(body["trades"])
+    assert trades.column("price").to_pylist() == [t["price"] for t in body["trades"]]
+    assert section_extras(equity)["summary"] == body["summary"]
+
+    batch = {"symbols": ["FAKE", "BAD"], "strategy": "sma_crossover", "max_workers": 1}
+    sections = decode_sections(client.post("/backtest/batch", json=batch, headers=arrow).content)
+    assert sections["results"].column("symbol").to_pylist() == ["FAKE"]
+    assert sections["errors"].to_pylist()[0]["symbol"] == "BAD"
+
+def test_walkforward_endpoint_stubbed(monkeypatch):
+    import backend.engine.data as data_mod
+    monkeypatch.setattr(
+        data_mod, "fetch_ohlc", lambda symbol, start=None, end=None: _stub_df(n=500)
+    )
+
+    payload = {
+        "symbol": "FAKE",
+        "strategy": "sma_crossover",
+        "grid": {"fast": [5, 10], "slow": [20, 40]},
+        "train_bars": 200,
+        "test_bars": 100,
+        "cost_bps": 5,
+    }
+    r = client.post("/backtest/walkforward", json=payload)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["combinations"] == 4
+    assert len(body["windows"]) == 3
+    assert len(body["equity_curve"]) == len(body["equity_timestamps"]) == 301
+    assert body["equity_curve"][0] == 1.0
+    assert body["summary"]["trades"] == sum(w["test"]["trades"] for w in body["windows"])
+
+    r = client.post("/backtest/walkforward", json={**payload, "train_bars": 450})
+    assert r.status_code == 400
+
+def test_portfolio_endpoint_stubbed(monkeypatch):
+    import backend.engine.data as data_mod
+    seeds = {"AAA": 1, "BBB": 2, "CCC": 3}
+    monkeypatch.setattr(data_mod, "fetch_ohlc",
+                        lambda symbol, start=None, end=None: _stub_df(seed=seeds[symbol]))
+
+    payload = {"symbols": ["AAA", "BBB", "CCC"], "strategy": "sma_crossover",
+               "params": {"fast": 5, "slow": 20}, "cost_bps": 5}
+    r = client.post("/backtest/portfolio", json=payload)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["bars"] == 200 and len(body["equity_curve"]) == 200
+    assert set(body["contributions_pct"]) == set(seeds)
+    assert body["summary"]["trades"] > 0
+
+    r = client.post("/backtest/portfolio", json={**payload, "weights": {"ZZZ": 1.0}})
+    assert r.status_code == 400
+
+def test_server_timing_and_prometheus_metrics(monkeypatch):
+    import backend.engine.data as data_mod
+    monkeypatch.setattr(data_mod, "fetch_ohlc", lambda symbol, start=None, end=None: _stub_df())
+
+    payload = {"symbol": "FAKE", "strategy": "sma_crossover", "params": {"fast": 7, "slow": 21}}
+    r = client.post("/backtest", json=payload, headers={"Accept": "application/x-ndjson"})
+    assert r.status_code == 200
+    stages = [part.split(";")[0] for part in r.headers["server-timing"].split(", ")]
+    assert stages == ["fetch", "signal", "simulate", "metrics", "serialize", "total"]
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    text = r.text
+    assert 'algotrade_stage_seconds_count{stage="simulate"}' in text
+    assert 'algotrade_requests_total{route="/backtest",status="200"}' in text
+    assert 'algotrade_bars_bucket{route="/backtest",le="1000.0"}' in text
+    assert 'algotrade_cache_hits_total{cache="frame"}' in text
+
+def test_robustness_endpoint_stubbed(monkeypatch):
+    import backend.engine.data as data_mod
+    monkeypatch.setattr(
+        data_mod, "fetch_ohlc", lambda symbol, start=None, end=None: _stub_df(n=400)
+    )
+
+    payload = {"symbol": "FAKE", "strategy": "sma_crossover", "params": {"fast": 5, "slow": 20},
+               "cost_bps": 5, "n_paths": 500, "seed": 7, "confidence": 0.9}
+    r = client.post("/backtest/robustness", json=payload)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["n_paths"] == 500 and body["block_bars"] == 7
+    assert set(body["metrics"]) == {"sharpe", "max_drawdown_pct", "ann_return_pct"}
+    sharpe = body["metrics"]["sharpe"]
+    assert sharpe["observed"] == body["summary"]["sharpe"]
+    assert sharpe["lower"] <= sharpe["quantiles"]["0.5"] <= sharpe["upper"]
+    assert client.post("/backtest/robustness", json=payload).json() == body   # seeded
+
+    r = client.post("/backtest/robustness", json={**payload, "method": "trade_shuffle"})
+    assert r.status_code == 200 and r.json()["block_bars"] is None
+
+def test_jobs_endpoints_stubbed(monkeypatch, tmp_path):
+    import time
+    from backend import jobs
+    import backend.engine.data as data_mod
+    monkeypatch.setattr(data_mod, "fetch_ohlc", lambda symbol, start=None, end=None: _stub_df())
+    queue = jobs.JobQueue(jobs.JobStore(tmp_path / "jobs.sqlite3"), workers=1)
+    previous = jobs.set_queue(queue)
+    queue.start()
+    try:
+        spec = {"symbol": "FAKE", "strategy": "sma_crossover", "params": {"fast": 5, "slow": 15}}
+        r = client.post("/jobs", json={"kind": "backtest", "spec": spec, "priority": 3})
+        assert r.status_code == 202
+        job = r.json()
+        assert job["status"] in ("queued", "running", "succeeded") and job["priority"] == 3
+
+        for _ in range(500):
+            job = client.get(f"/jobs/{job['id']}").json()
+            if job["status"] == "succeeded":
+                break
+            time.sleep(0.01)
+        assert job["progress"] == 1.0 and job["finished_at"]
+        result = client.get(f"/jobs/{job['id']}/result")
+        assert result.json() == client.post("/backtest", json=spec).json()
+        assert [j["id"] for j in client.get("/jobs").json()] == [job["id"]]
+
+        bad = client.post("/jobs", json={"kind": "backtest", "spec": {"symbol": "FAKE"}})
+        assert bad.status_code == 422
+        assert bad.json()["detail"][0]["loc"][:3] == ["body", "spec", "strategy"]
+        assert client.get("/jobs/missing").status_code == 404
+        assert client.post("/jobs/missing/cancel").status_code == 404
+    finally:
+        jobs.set_queue(previous).shutdown()
+
+def test_lifespan_preloads_and_reports_readiness(monkeypatch, tmp_path):
+    import time
+    import threading
+    import backend.engine.data as data_mod
+    from backend import jobs, startup
+
+    release = threading.Event()
+    def slow_fetch(symbol, start=None, end=None):
+        if symbol != startup.STARTUP_SYMBOL:  # start-up requests pass, warm-up waits
+            release.wait(5)
+        if symbol == "BAD":
+            raise ValueError("No data for BAD")
+        return _stub_df(n=300)
+
+    monkeypatch.setattr(data_mod, "fetch_ohlc", slow_fetch)
+    monkeypatch.setattr(startup, "READINESS", startup.Readiness())
+    monkeypatch.setenv(startup.ENV_WARM_SYMBOLS, "fake, bad")
+    monkeypatch.setenv(jobs.ENV_DB, str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(jobs, "_QUEUE", None)
+
+    with TestClient(app) as c:
+        assert jobs.get_queue()._threads  # job workers started by the lifespan hook
+        r = c.get("/health/ready")
+        assert r.status_code == 503 and r.json()["phase"] == "warming"
+        assert c.get("/health").json()["status"] == "ok"  # live while warming
+        release.set()
+        for _ in range(100):
+            if c.get("/health/ready").status_code == 200:
+                break
+            time.sleep(0.05)
+        body = c.get("/health").json()
+        assert body["ready"] and body["warmed"] == ["FAKE"] and "BAD" in body["failed"]
+
+def test_chart_endpoint_aligned_and_downsampled(monkeypatch):
+    import backend.engine.data as data_mod
+    monkeypatch.setattr(
+        data_mod, "fetch_ohlc", lambda symbol, start=None, end=None: _stub_df(n=2000)
+    )
+
+    payload = {"symbol": "FAKE", "strategy": "sma_crossover", "params": {"fast": 5, "slow": 20},
+               "max_points": 200}
+    r = client.post("/backtest/chart", json=payload)
+    assert r.status_code == 200
+    body = r.json()
+    n = len(body["timestamps"])
+    assert n <= 200 and len(body["close"]) == n and body["bars"] == 2000
+    assert [s["name"] for s in body["indicators"]] == ["SMA 5", "SMA 20"]
+    assert all(len(s["values"]) == n and s["pane"] == "price" for s in body["indicators"])
+    assert body["indicators"][1]["values"][0] is None  # no history before the default window
+
+    assert len(body["equity"]) == n and body["equity"][0] == 1.0
+    bt = client.post("/backtest", json=payload).json()
+    assert body["trades"] == bt["trades"]
+    assert body["summary"] == bt["summary"] and body["benchmarks"] == bt["benchmarks"]
+
+    # served from the result cache / revalidated like /backtest
+    etag = r.headers["etag"]
+    again = client.post("/backtest/chart", json=payload)
+    assert again.headers["etag"] == etag and again.json() == body
+    assert client.post(
+        "/backtest/chart", json=payload, headers={"If-None-Match": etag}
+    ).status_code == 304
+
+    rsi = client.post("/backtest/chart", json={**payload, "strategy": "rsi", "params": {}}).json()
+    assert [(s["name"], s["pane"]) for s in rsi["indicators"]] == [("RSI 14", "separate")]
@@ -17,3 +17,104 @@ def test_simulate_long_only_runs():
     # at least one entry and one exit
     sides = {t["side"] for t in out.trades}
     assert sides >= {"buy", "sell"}
+
+
+def test_sweep_matches_single_backtests():
+    from backend.engine.backtester import sweep_sma_crossover
+    from backend.engine.metrics import compute_metrics
+    from backend.engine.strategies.sma import generate_signals_sma
+
+    df = make_df(500)
+    calls = []
+    table = sweep_sma_crossover(
+        df, fasts=[3, 5, 8], slows=[5, 20, 40], cost_bps=5, slippage_bps=2, chunk_size=4,
+        progress=lambda done, total: calls.append((done, total)),
+    )
+    assert len(table) == 7  # only slow > fast combinations are kept
+    assert calls == [(4, 7), (7, 7)]
+    assert table["sharpe"].is_monotonic_decreasing
+
+    for row in table.to_dict(orient="records"):
+        sig = generate_signals_sma(df, fast=row["fast"], slow=row["slow"])
+        out = simulate_long_only(df, sig, cost_bps=5, slippage_bps=2)
+        m = compute_metrics(pd.Series(out.equity_curve, index=df.index))
+        assert row["trades"] == len(out.trades)
+        for k, v in m.items():
+            assert abs(row[k] - v) <= 0.011, (row, k)
+
+
+def test_trade_log_is_columnar_and_matches_dicts():
+    df = make_df(50)
+    sig = pd.Series(0, index=df.index)
+    sig.iloc[5:10] = 1
+    sig.iloc[30:] = 1
+    out = simulate_long_only(df, sig, cost_bps=5, slippage_bps=2)
+
+    log = out.trade_log
+    assert len(log) == 3
+    assert list(log.side) == [1, -1, 1]
+    assert list(log.ts) == [df.index[5], df.index[10], df.index[30]]
+    assert np.allclose(log.price, df["Open"].iloc[[5, 10, 30]])
+
+    frame = log.to_frame()
+    assert list(frame["side"]) == ["buy", "sell", "buy"]
+    assert out.trades[1] == {
+        "ts": df.index[10].isoformat(),
+        "side": "sell",
+        "price": float(df["Open"].iloc[10]),
+        "qty": 1.0,
+        "fees": 0.0005,
+        "slippage": 0.0002,
+    }
+
+
+def test_trim_warmup_keeps_range_returns_and_fills():
+    from backend.engine.backtester import trim_warmup
+
+    df = make_df(300)
+    sig = pd.Series(0, index=df.index)
+    sig.iloc[50:120] = 1
+    sig.iloc[150:260] = 1
+    full = simulate_long_only(df, sig, cost_bps=5, slippage_bps=5)
+    fric = 10 / 10000
+
+    # carried-in long position, no fill on the first kept bar
+    out = trim_warmup(full, df, sig, 100)
+    eq = pd.Series(out.equity_curve, index=df.index[100:])
+    assert eq.iloc[0] == 1.0
+    full_eq = pd.Series(full.equity_curve, index=df.index)
+    assert np.allclose(eq.pct_change().iloc[1:], full_eq.pct_change().iloc[101:])
+    start = df.index[100].isoformat()
+    assert [t["ts"] for t in out.trades] == [t["ts"] for t in full.trades if t["ts"] >= start]
+
+    # a fill on the first kept bar is still charged
+    out = trim_warmup(full, df, sig, 150)
+    assert np.isclose(out.equity_curve[0], 1 - fric)
+    assert out.trades[0]["ts"] == df.index[150].isoformat()
+
+
+def test_position_kernel_shorts_fractions_and_blocks():
+    from backend.engine.backtester import simulate_positions
+
+    close = np.array([100.0, 110.0, 99.0, 99.0])
+    equity = simulate_positions(close, [-1.0, 0.5, 0.5, 0.0], cost_bps=10)
+    # short 10% up, 1.5 turnover; half long 10% down; 0.5 turnover on a flat bar
+    expected = np.cumprod([1.0, 1 - 0.1 - 0.0015, 1 - 0.05, 1 - 0.0005])
+    np.testing.assert_allclose(equity, expected)
+
+    df = make_df(300)
+    sig = pd.Series((np.arange(300) // 17) % 2, index=df.index)
+    close = df["Close"].to_numpy()
+    out = simulate_long_only(df, sig, cost_bps=5, slippage_bps=2, validate=False)
+    assert out.equity_curve == simulate_long_only(df, sig, 5, 2).equity_curve
+
+    targets = np.vstack([sig.to_numpy(), -0.5 * sig.to_numpy()])
+    grid = simulate_positions(close, targets, 5, 2)
+    assert grid[0].tolist() == out.equity_curve
+    # continuing a split series from its last close/target/equity reproduces the whole run
+    head = simulate_positions(close[:120], targets[1, :120], 5, 2)
+    tail = simulate_positions(
+        close[120:], targets[1, 120:], 5, 2,
+        prev_close=close[119], prev_target=targets[1, 119], equity0=head[-1],
+    )
+    np.testing.assert_allclose(np.concatenate([head, tail]), grid[1], rtol=1e-12)
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+from backend.engine import batch
+from backend.engine.batch import BatchConfig, run_batch
+
+
+def _fake_fetch(symbol, start=None, end=None):
+    if symbol == "BAD":
+        raise ValueError("No data for BAD")
+    seed = sum(map(ord, symbol))
+    idx = pd.date_range("2020-01-01", periods=300, freq="B")
+    returns = np.random.default_rng(seed).normal(0.0003, 0.01, 300)
+    price = 100 * (1 + pd.Series(returns, index=idx)).cumprod()
+    return pd.DataFrame({"Open": price, "Close": price})
+
+
+def test_run_batch_pool_collects_results_and_errors(monkeypatch):
+    monkeypatch.setenv(batch.ENV_BATCH_WORKERS, "2")
+    config = BatchConfig(
+        strategy="sma_crossover", params={"fast": 5, "slow": 20}, cost_bps=5, loader=_fake_fetch
+    )
+    try:
+        pooled = run_batch(["AAA", "BAD", "CCC", "AAA", "DDD"], config, max_workers=64)
+        assert batch.get_pool()._max_workers == 2           # clamped to the server limit
+        again = run_batch(["DDD", "AAA"], config)
+        assert batch.get_pool() is batch.get_pool()         # shared, not one per call
+    finally:
+        batch.shutdown_pool()
+    inline = run_batch(["AAA", "BAD", "CCC", "DDD"], config, max_workers=1)
+
+    assert list(pooled.results) == ["AAA", "CCC", "DDD"]
+    assert "BAD" in pooled.errors and "No data" in pooled.errors["BAD"]
+    assert pooled.results == inline.results
+    assert again.results == {s: inline.results[s] for s in ("DDD", "AAA")}
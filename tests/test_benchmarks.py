@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+from benchmarks.suite import compare
+from benchmarks.synthetic import synthetic_ohlcv
+
+def test_synthetic_ohlcv_is_deterministic_and_consistent():
+    a = synthetic_ohlcv(5000, freq="minute", seed=42)
+    pd.testing.assert_frame_equal(a, synthetic_ohlcv(5000, freq="minute", seed=42))
+    assert not a.equals(synthetic_ohlcv(5000, freq="minute", seed=43))
+    assert list(a.columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert isinstance(a.index, pd.DatetimeIndex) and a.index.is_monotonic_increasing
+    assert (a["High"] >= a[["Open", "Close"]].max(axis=1)).all()
+    assert (a["Low"] <= a[["Open", "Close"]].min(axis=1)).all()
+    assert np.isfinite(a.to_numpy()).all()
+
+
+def test_compare_flags_only_real_regressions():
+    def run(**times):
+        return {"results": [{"case": k, "freq": "daily", "bars": 1000, "best_s": v}
+                            for k, v in times.items()]}
+
+    rows = compare(run(a=0.100, b=0.100, c=0.0001, d=1.0),
+                   run(a=0.110, b=0.200, c=0.0009, e=1.0), threshold=0.25)
+    flagged = {key[0]: regressed for key, _, _, _, regressed in rows}
+    assert flagged == {"a": False, "b": True, "c": False}
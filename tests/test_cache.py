@@ -0,0 +1,118 @@
+from backend.engine.cache import LRUCache
+
+
+def test_lru_is_bounded_by_bytes_and_counts_events():
+    cache = LRUCache(max_bytes=100)
+    cache.put("a", "A", nbytes=40)
+    cache.put("b", "B", nbytes=40)
+    assert cache.get("a") == "A"          # a becomes most recently used
+    cache.put("c", "C", nbytes=40)        # over budget -> evicts b, the LRU entry
+
+    assert cache.get("b") is None
+    assert cache.get("c") == "C"
+    cache.put("huge", "H", nbytes=101)    # larger than the whole budget: never stored
+    assert cache.get("huge") is None
+
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["bytes"] == 80
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 2, 1)
+
+
+def test_lru_version_mismatch_invalidates():
+    cache = LRUCache(max_bytes=100)
+    cache.put("k", 1, nbytes=8, version=("v1",))
+    assert cache.get("k", version=("v1",)) == 1
+    assert cache.get("k", version=("v2",)) is None
+    assert cache.get("k", version=("v1",)) is None   # dropped, not resurrected
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_singleflight_shares_result_and_errors():
+    import threading
+    import time
+
+    import pytest
+    from backend.engine.singleflight import SingleFlight
+
+    flights = SingleFlight()
+    calls = []
+
+    def slow(value):
+        def fn():
+            calls.append(value)
+            time.sleep(0.1)
+            if isinstance(value, Exception):
+                raise value
+            return value
+        return fn
+
+    out = []
+    barrier = threading.Barrier(5)
+
+    def worker():
+        barrier.wait()
+        out.append(flights.do("k", slow(42)))
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert out == [42] * 5 and calls == [42]
+
+    with pytest.raises(KeyError):
+        flights.do("k", slow(KeyError("boom")))
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_result_cache_disk_tier_and_ttl(tmp_path, monkeypatch):
+    import time
+
+    from backend.api.result_cache import ResultCache
+
+    cache = ResultCache(max_bytes=1024, ttl_seconds=60, disk_dir=tmp_path)
+    cache.put("k1", b'{"x": 1}')
+    assert cache.get("k1") == b'{"x": 1}'
+
+    # a fresh process (empty memory tier) still finds it on disk
+    restarted = ResultCache(max_bytes=1024, ttl_seconds=60, disk_dir=tmp_path)
+    assert restarted.get("k1") == b'{"x": 1}'
+    assert restarted.stats()["disk_hits"] == 1
+
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 120)   # past the TTL
+    assert restarted.get("k1") is None
+    assert not (tmp_path / "k1.json").exists()
+
+
+def test_result_cache_concurrent_disk_writes_and_budget(tmp_path, monkeypatch):
+    import threading
+
+    from backend.api.result_cache import ResultCache
+
+    cache = ResultCache(max_bytes=1024, disk_dir=tmp_path, disk_max_bytes=250)
+    barrier = threading.Barrier(8)
+    errors = []
+
+    def put_same_key():
+        barrier.wait()
+        try:
+            cache.put("same", b"x" * 100)
+        except Exception as e:  # pragma: no cover - the regression
+            errors.append(e)
+
+    threads = [threading.Thread(target=put_same_key) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == [] and sorted(p.name for p in tmp_path.iterdir()) == ["same.json"]
+
+    scans = []
+    trim = cache._trim_disk
+    monkeypatch.setattr(cache, "_trim_disk", lambda: scans.append(1) or trim())
+    cache.put("a", b"a" * 100)                 # 200 bytes on disk: no scan
+    assert scans == []
+    cache.put("b", b"b" * 100)                 # 300 > 250: one scan drops the oldest
+    assert scans == [1] and not (tmp_path / "same.json").exists()
+    assert cache.get("b") == b"b" * 100
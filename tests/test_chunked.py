@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.engine.backtester import simulate_long_only
+from backend.engine.chunked import read_blocks, simulate_chunked, simulate_file, write_bars
+from backend.engine.metrics import compute_metrics
+from backend.engine.strategies import build_signal
+
+
+def make_df(n=5000, seed=11):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2021-01-04 09:30", periods=n, freq="min")
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.002, n))
+    return pd.DataFrame({"Open": close * (1 + rng.normal(0, 0.0005, n)), "Close": close}, index=idx)
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+@pytest.mark.parametrize("float32", [False, True])
+def test_chunked_matches_in_memory_engine_exactly(tmp_path, suffix, float32):
+    df = make_df()
+    params = {"fast": 12, "slow": 60}
+    path = write_bars(df, tmp_path / f"bars{suffix}", float32=float32, block_bars=1000)
+    if float32:  # stored prices are float32; the in-memory run sees the same values
+        df = df.astype(np.float32).astype(float)
+    signal = build_signal(df, "sma_crossover", params)
+    expected = simulate_long_only(df, signal, cost_bps=5, slippage_bps=2)
+
+    sink = tmp_path / "equity.parquet"
+    out = simulate_file(
+        path, strategy="sma_crossover", params=params, cost_bps=5, slippage_bps=2,
+        block_bars=777, equity_sink=sink,
+    )
+    assert out.bars == len(df)
+    assert pd.read_parquet(sink)["equity"].tolist() == expected.equity_curve  # bit-identical
+    assert out.final_equity == expected.equity_curve[-1]
+    assert out.trade_log.to_dicts() == expected.trades
+    assert out.summary == compute_metrics(pd.Series(expected.equity_curve, index=df.index))
+
+
+def test_chunked_uses_stored_signal_column(tmp_path):
+    df = make_df(3000)
+    signal = build_signal(df, "rsi", {"period": 10, "lower": 35, "upper": 65})
+    path = write_bars(df, tmp_path / "bars.parquet", signal=signal)
+    expected = simulate_long_only(df, signal, cost_bps=3)
+
+    out = simulate_chunked(read_blocks(path, block_bars=512), cost_bps=3)
+    assert out.final_equity == expected.equity_curve[-1]
+    assert len(out.trade_log) == len(expected.trade_log)
+
+    with pytest.raises(ValueError, match="no signal"):
+        simulate_file(write_bars(df, tmp_path / "prices.parquet"))
@@ -0,0 +1,174 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import backend.engine.data as data_mod
+from backend.engine.cache import LRUCache
+from backend.engine.data import fetch_ohlc
+
+
+class FakeProvider:
+    """Deterministic business-day bars; records every requested range."""
+
+    def __init__(self):
+        self.calls = []
+
+    def download(self, symbol, start, end, interval):
+        self.calls.append((start, end))
+        idx = pd.date_range(start, end, freq="B", inclusive="left", name="Datetime")
+        close = 100 + (idx.year - 2000) + idx.dayofyear / 1000  # depends on the date only
+        return pd.DataFrame(
+            {"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1.0},
+            index=idx,
+        )
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_mod, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(data_mod, "FRAME_CACHE", LRUCache(max_bytes=64 * 1024 * 1024))
+    return FakeProvider()
+
+
+def test_fetch_slices_cached_range_without_redownload(provider, monkeypatch):
+    df = fetch_ohlc("FAKE", date(2018, 1, 1), date(2021, 1, 1), provider=provider)
+    assert provider.calls == [(date(2018, 1, 1), date(2021, 1, 1))]
+    assert df.index[0] >= pd.Timestamp("2018-01-01") and df.index[-1] < pd.Timestamp("2021-01-01")
+
+    read = []
+    real_read_parquet = pd.read_parquet
+    def recording_read_parquet(path, **kwargs):
+        read.append(path.name)
+        return real_read_parquet(path, **kwargs)
+
+    monkeypatch.setattr(pd, "read_parquet", recording_read_parquet)
+    month = fetch_ohlc("FAKE", date(2019, 6, 1), date(2019, 7, 1), provider=provider)
+    assert read == ["2019.parquet"]
+    assert len(provider.calls) == 1
+    assert month.index.min() >= pd.Timestamp("2019-06-01")
+    assert month.index.max() < pd.Timestamp("2019-07-01")
+    assert month.equals(df.loc["2019-06-01":"2019-06-30"])
+
+
+def test_fetch_downloads_only_missing_head_and_tail(provider):
+    fetch_ohlc("FAKE", date(2019, 1, 1), date(2020, 1, 1), provider=provider)
+    df = fetch_ohlc("FAKE", date(2018, 7, 1), date(2020, 3, 1), provider=provider)
+
+    assert provider.calls == [
+        (date(2019, 1, 1), date(2020, 1, 1)),
+        (date(2018, 7, 1), date(2019, 1, 1)),
+        (date(2020, 1, 1), date(2020, 3, 1)),
+    ]
+    assert not df.index.duplicated().any()
+    assert df.index.is_monotonic_increasing
+    assert df.equals(FakeProvider().download("FAKE", date(2018, 7, 1), date(2020, 3, 1), "1d"))
+
+
+def test_force_download_refetches_only_requested_range(provider):
+    fetch_ohlc("FAKE", date(2015, 1, 1), date(2020, 1, 1), provider=provider)
+    fetch_ohlc("FAKE", date(2019, 1, 1), date(2019, 2, 1), provider=provider, force_download=True)
+    assert provider.calls[-1] == (date(2019, 1, 1), date(2019, 2, 1))
+
+
+def test_future_end_downloads_new_bars_once_they_exist(provider, monkeypatch):
+    today = [date(2020, 1, 10)]
+
+    class Clock(date):
+        @classmethod
+        def today(cls):
+            return today[0]
+
+    monkeypatch.setattr(data_mod, "date", Clock)
+    real_download = provider.download
+    provider.download = lambda s, lo, hi, i: real_download(s, lo, min(hi, today[0]), i)
+
+    args = ("FAKE", date(2020, 1, 1), date(2020, 2, 1))
+    first = fetch_ohlc(*args, provider=provider)
+    assert first.index[-1] == pd.Timestamp("2020-01-09")
+
+    today[0] = date(2020, 1, 20)               # the clock moves on, new bars exist
+    second = fetch_ohlc(*args, provider=provider)
+    assert provider.calls[-1] == (date(2020, 1, 10), date(2020, 1, 20))
+    assert second.index[-1] == pd.Timestamp("2020-01-17")
+    assert second.iloc[: len(first)].equals(first)
+
+
+def test_unknown_symbol_raises_and_caches_nothing(provider, tmp_path):
+    provider.download = lambda *a: pd.DataFrame()
+    with pytest.raises(ValueError, match="No data"):
+        fetch_ohlc("NOPE", date(2020, 1, 1), date(2020, 2, 1), provider=provider)
+    assert not (tmp_path / "NOPE_1d" / data_mod.COVERAGE_FILE).exists()
+
+
+def test_memory_cache_hits_are_isolated_and_invalidated_on_disk_change(provider, monkeypatch):
+    args = ("FAKE", date(2019, 1, 1), date(2020, 1, 1))
+    first = fetch_ohlc(*args, provider=provider)
+    first["Close"] = 0.0                       # caller mutation must not leak into the cache
+
+    read = []
+    real_read_parquet = pd.read_parquet
+    monkeypatch.setattr(
+        pd, "read_parquet", lambda path, **kw: read.append(path) or real_read_parquet(path, **kw)
+    )
+
+    second = fetch_ohlc(*args, provider=provider)
+    assert read == []                          # served from memory, no parquet parsing
+    assert (second["Close"] > 0).all()
+    with pytest.raises(ValueError):
+        second["Close"].to_numpy()[0] = 1.0    # shared arrays are read-only
+    assert data_mod.FRAME_CACHE.stats()["hits"] == 1
+
+    # extending the on-disk cache (another range) changes its version -> the entry is dropped
+    fetch_ohlc("FAKE", date(2019, 1, 1), date(2020, 6, 1), provider=provider)
+    fetch_ohlc(*args, provider=provider)
+    assert data_mod.FRAME_CACHE.stats()["invalidations"] == 1
+
+
+def test_concurrent_cold_fetches_share_one_download(provider, tmp_path):
+    import threading
+    import time
+
+    real_download = provider.download
+
+    def slow_download(*args):
+        time.sleep(0.2)
+        return real_download(*args)
+
+    provider.download = slow_download
+    barrier = threading.Barrier(8)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(fetch_ohlc("FAKE", date(2019, 1, 1), date(2021, 1, 1), provider=provider))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(provider.calls) == 1
+    assert len(results) == 8 and all(r.equals(results[0]) for r in results)
+    assert not list((tmp_path / "FAKE_1d").glob("*.tmp"))   # temp files renamed away
+
+
+def test_fetch_with_warmup_loads_exact_lookback(provider, monkeypatch):
+    from backend.engine.data import fetch_ohlc_with_warmup
+
+    monkeypatch.setattr(data_mod, "_provider", provider)
+    df, warmup = fetch_ohlc_with_warmup("FAKE", date(2020, 3, 2), date(2020, 6, 1), lookback=200)
+    assert warmup == 200
+    assert df.index[warmup] == pd.Timestamp("2020-03-02")
+    assert df.index[-1] < pd.Timestamp("2020-06-01")
+
+    # history starting after the padded range: take what exists, don't loop forever
+    class ListedProvider(FakeProvider):
+        def download(self, symbol, start, end, interval):
+            return super().download(symbol, max(start, date(2020, 1, 1)), end, interval)
+
+    monkeypatch.setattr(data_mod, "_provider", ListedProvider())
+    df, warmup = fetch_ohlc_with_warmup("NEW", date(2020, 3, 2), date(2020, 6, 1), lookback=200)
+    assert df.index[0] == pd.Timestamp("2020-01-01")
+    assert df.index[warmup] == pd.Timestamp("2020-03-02")
@@ -0,0 +1,20 @@
+import numpy as np
+from backend.engine.downsample import minmax_indices
+
+
+def test_minmax_keeps_endpoints_and_extremes():
+    rng = np.random.default_rng(5)
+    y = np.cumprod(1 + rng.normal(0, 0.01, 100_000))
+    idx = minmax_indices(y, 500)
+
+    assert len(idx) <= 500
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert y.argmax() in idx and y.argmin() in idx
+
+    # max drawdown survives downsampling exactly (the peak and trough are both kept)
+    def max_dd(v):
+        return (v / np.maximum.accumulate(v) - 1).min()
+    assert np.isclose(max_dd(y[idx]), max_dd(y))
+
+    assert np.array_equal(minmax_indices(y[:300], 500), np.arange(300))
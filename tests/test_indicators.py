@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.engine.data import _freeze
+from backend.engine.indicators import IndicatorStore, close_fingerprint
+from backend.engine.strategies.rsi import rsi
+
+def make_df(n=300, seed=0):
+    idx = pd.date_range("2020-01-01", periods=n, freq="B")
+    returns = np.random.default_rng(seed).normal(0.0002, 0.01, n)
+    price = 100 * (1 + pd.Series(returns, index=idx)).cumprod()
+    return pd.DataFrame({"Open": price, "Close": price})
+
+
+def test_store_memoizes_read_only_values():
+    store = IndicatorStore()
+    df = make_df()
+    sma = store.sma(df, 20)
+    np.testing.assert_array_equal(sma, df["Close"].rolling(20).mean().to_numpy())
+    np.testing.assert_array_equal(store.rsi(df, 14), rsi(df["Close"].to_numpy(), 14))
+    with pytest.raises(ValueError):
+        sma[-1] = 0.0
+
+    # same content in a different frame object -> lookup, not a recompute
+    assert store.sma(df.copy(), 20) is sma
+    assert store.stats()["hits"] == 1
+
+    changed = df.copy()
+    changed.iloc[-1, changed.columns.get_loc("Close")] += 1.0
+    assert store.sma(changed, 20) is not sma
+
+
+def test_fingerprint_memo_only_for_frozen_frames():
+    df = make_df()
+    frozen = _freeze(df)
+    fp = close_fingerprint(frozen)
+    assert close_fingerprint(frozen.copy(deep=False)) == fp == close_fingerprint(df)
+
+    # writable frames are re-hashed every time, so in-place edits are seen
+    df.loc[df.index[5], "Close"] = 1.0
+    assert close_fingerprint(df) != fp
@@ -0,0 +1,124 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from backend import jobs
+
+
+def wait_finished(store, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = store.get(job_id)
+        if job.status in jobs.FINISHED:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish: {store.get(job_id)}")
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = jobs.JobQueue(jobs.JobStore(tmp_path / "jobs.sqlite3"), workers=1)
+    q.start()
+    yield q
+    q.shutdown()
+    q.store.close()
+
+
+def test_jobs_run_by_priority_and_report_progress(queue, monkeypatch):
+    gate = threading.Event()
+    order = []
+
+    def blocker(spec):
+        gate.wait(5)
+        return "{}"
+
+    def record(spec):
+        order.append(spec["name"])
+        for i in range(3):
+            jobs.progress(i + 1, 3)
+        return '{"ok": true}'
+
+    monkeypatch.setitem(jobs.RUNNERS, "blocker", blocker)
+    monkeypatch.setitem(jobs.RUNNERS, "record", record)
+
+    first = queue.submit("blocker", {})
+    low = queue.submit("record", {"name": "low"}, priority=-1)
+    high = queue.submit("record", {"name": "high"}, priority=5)
+    gate.set()
+
+    for job in (first, low, high):
+        assert wait_finished(queue.store, job.id).status == "succeeded"
+    assert order == ["high", "low"]                 # single worker: priority, not submit order
+    assert queue.store.get(low.id).progress == 1.0
+    assert queue.store.result(low.id) == '{"ok": true}'
+
+    with pytest.raises(ValueError, match="Unknown job kind"):
+        queue.submit("nope", {})
+
+
+def test_jobs_cancel_and_failure(queue, monkeypatch):
+    started = threading.Event()
+
+    def endless(spec):
+        started.set()
+        while True:
+            jobs.progress(0.5)
+            time.sleep(0.005)
+
+    def broken(spec):
+        raise ValueError("bad spec")
+
+    monkeypatch.setitem(jobs.RUNNERS, "endless", endless)
+    monkeypatch.setitem(jobs.RUNNERS, "broken", broken)
+
+    running = queue.submit("endless", {})
+    queued = queue.submit("broken", {})
+    assert started.wait(5)
+    assert queue.cancel(queued.id).status == "cancelled"    # never ran
+    queue.cancel(running.id)
+    assert wait_finished(queue.store, running.id).status == "cancelled"
+
+    failed = wait_finished(queue.store, queue.submit("broken", {}).id)
+    assert failed.status == "failed" and failed.error == "ValueError: bad spec"
+
+    jobs.progress(1, 2)  # outside a job: no-op
+
+
+def test_jobs_interrupted_by_dead_process_are_requeued(tmp_path):
+    store = jobs.JobStore(tmp_path / "jobs.sqlite3")
+    orphan, live = store.create("record", {}), store.create("record", {})
+    store.claim(), store.claim()
+    dead_owner = f"{socket.gethostname()}:99999999"   # no such pid on this host
+    with store._lock:
+        store._conn.execute("UPDATE jobs SET owner = ? WHERE id = ?", (dead_owner, orphan.id))
+
+    assert store.requeue_interrupted() == 1
+    assert store.get(orphan.id).status == "queued"
+    assert store.get(live.id).status == "running"        # owned by this (live) process
+    store.close()
+
+
+def test_jobs_queued_before_restart_run_on_start(tmp_path, monkeypatch):
+    monkeypatch.setitem(jobs.RUNNERS, "record", lambda spec: '{"ok": true}')
+    store = jobs.JobStore(tmp_path / "jobs.sqlite3")
+    queued, orphan = store.create("record", {}), store.create("record", {})
+    store.claim()                                          # picks `queued`, the older one
+    with store._lock:
+        store._conn.execute(
+            "UPDATE jobs SET owner = ? WHERE status = 'running'",
+            (f"{socket.gethostname()}:99999999",),
+        )
+    store.close()
+
+    queue = jobs.JobQueue(jobs.JobStore(tmp_path / "jobs.sqlite3"), workers=1)
+    try:
+        time.sleep(0.05)
+        assert queue.store.get(orphan.id).status == "queued"   # nothing runs before start()
+        queue.start()
+        for job in (queued, orphan):                           # no new submit needed
+            assert wait_finished(queue.store, job.id).status == "succeeded"
+    finally:
+        queue.shutdown()
+        queue.store.close()
@@ -0,0 +1,118 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import backend.engine.data as data_mod
+import backend.engine.market_store as store_mod
+from backend.engine.data import fetch_ohlc
+from backend.engine.market_store import LocalStoreProvider, build_store
+
+
+def _bars(start, n, base):
+    idx = pd.bdate_range(start, periods=n, name="Datetime").as_unit("ns")
+    close = base + np.arange(n, dtype=float)
+    return pd.DataFrame(
+        {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 10.0},
+        index=idx,
+    )
+
+
+@pytest.fixture
+def sources(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    frames = {
+        "MSFT": _bars("2021-01-04", 300, 200.0),
+        "AAPL": _bars("2021-01-04", 250, 100.0),
+        "SPY": _bars("2021-03-01", 120, 400.0),
+        "QQQ": _bars("2021-01-04", 90, 300.0),
+    }
+    frames["MSFT"].reset_index().to_csv(src / "msft.csv", index=False)
+    frames["AAPL"].reset_index().to_csv(src / "AAPL.csv", index=False)
+    multi = pd.concat(
+        [frames[s].reset_index().assign(Symbol=s) for s in ("SPY", "QQQ")], ignore_index=True
+    )
+    multi.sample(frac=1.0, random_state=0).to_parquet(src / "etfs.parquet", index=False)
+    return src, frames
+
+
+def test_build_and_read_zero_copy(sources, tmp_path, monkeypatch):
+    src, frames = sources
+    monkeypatch.setattr(store_mod, "BATCH_ROWS", 400)  # several record batches
+    store = build_store([src], tmp_path / "store")
+
+    assert store.symbols() == ["AAPL", "MSFT", "QQQ", "SPY"]
+    assert store.rows == sum(len(f) for f in frames.values())
+    for symbol, expected in frames.items():
+        got = store.read(symbol)
+        pd.testing.assert_frame_equal(got, expected, check_freq=False)
+        assert not got["Close"].to_numpy().flags.writeable
+
+    a = store.read("MSFT", date(2021, 2, 1), date(2021, 3, 1))
+    b = store.read("MSFT")
+    assert a.index[0] == pd.Timestamp("2021-02-01") and a.index[-1] < pd.Timestamp("2021-03-01")
+    assert np.shares_memory(a["Close"].to_numpy(), b["Close"].to_numpy())
+
+    xs = store.cross_section("2021-03-01")
+    assert list(xs.index) == ["AAPL", "MSFT", "QQQ", "SPY"]
+    assert xs.loc["SPY", "Close"] == 400.0
+    late = store.cross_section("2021-12-31")
+    assert list(late.index) == ["MSFT"]
+    asof = store.cross_section("2021-12-31", asof=True)
+    assert asof.loc["QQQ", "Datetime"] == frames["QQQ"].index[-1]
+
+
+def test_build_reads_each_source_file_once(sources, tmp_path, monkeypatch):
+    src, frames = sources
+    frames["IWM"] = _bars("2021-01-04", 60, 150.0)
+    frames["IWM"].reset_index().to_parquet(src / "iwm.parquet", index=False)
+
+    read = []
+    real_read_source = store_mod._read_source
+    monkeypatch.setattr(
+        store_mod, "_read_source", lambda path: read.append(path.name) or real_read_source(path)
+    )
+    store = build_store([src], tmp_path / "store")
+
+    assert sorted(read) == ["AAPL.csv", "etfs.parquet", "iwm.parquet", "msft.csv"]
+    pd.testing.assert_frame_equal(store.read("IWM"), frames["IWM"], check_freq=False)
+
+
+def test_fetch_ohlc_offline_through_store(sources, tmp_path, monkeypatch):
+    src, frames = sources
+    build_store([src], tmp_path / "store")
+    monkeypatch.setattr(data_mod, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(data_mod, "_provider", None)
+    monkeypatch.setenv(data_mod.ENV_DATA_STORE, str(tmp_path / "store"))
+
+    assert isinstance(data_mod.get_provider(), LocalStoreProvider)
+    df = fetch_ohlc("AAPL", date(2021, 1, 1), date(2021, 6, 1))
+    expected = frames["AAPL"].loc[:"2021-05-31"]
+    pd.testing.assert_frame_equal(df, expected, check_freq=False)
+    assert not (tmp_path / "cache").exists()  # nothing went through the download cache
+
+    with pytest.raises(ValueError, match="No data"):
+        fetch_ohlc("NOPE", date(2021, 1, 1), date(2021, 6, 1))
+
+
+def test_rebuild_swaps_versions_atomically(sources, tmp_path):
+    src, frames = sources
+    root = tmp_path / "store"
+    build_store([src / "msft.csv"], root)
+    provider = LocalStoreProvider(root)
+    old = store_mod.open_store(root)
+    assert store_mod.open_store(root) is old                  # mapped once per version
+    held = old.read("MSFT")
+
+    build_store([src / "AAPL.csv", src / "etfs.parquet"], root)
+    new = store_mod.open_store(root)
+    assert new is not old and new.symbols() == ["AAPL", "QQQ", "SPY"]
+    assert "AAPL" in provider.store and "MSFT" not in provider.store   # follows the swap
+    pd.testing.assert_frame_equal(held, frames["MSFT"], check_freq=False)  # old mapping intact
+
+    build_store([src / "msft.csv"], root)
+    versions = {p.name for p in root.iterdir() if p.is_dir()}
+    assert len(versions) == 2 and (root / "CURRENT").read_text() in versions  # live + previous
+    assert store_mod.open_store(root).symbols() == ["MSFT"]
@@ -8,3 +8,28 @@ def test_compute_metrics_basic():
     for k in ["ann_return_pct","ann_vol_pct","sharpe","max_drawdown_pct","win_rate_pct"]:
         assert k in m
         assert isinstance(m[k], float)
+
+
+def test_streaming_metrics_agree_with_batch():
+    from backend.engine.metrics import StreamingMetrics
+
+    rng = np.random.default_rng(9)
+    for seed in range(5):
+        eq = np.cumprod(1 + np.random.default_rng(seed).normal(0.0004, 0.012, 1500))
+        eq[rng.integers(0, len(eq), 10)] = np.nan           # gaps are skipped like dropna()
+        expected = compute_metrics(pd.Series(eq), rf_rate_pct=2.0)
+        rets = pd.Series(eq).dropna().pct_change().dropna()
+
+        online = StreamingMetrics(rf_rate_pct=2.0)
+        for v in eq:
+            online.update(v)
+        assert online.snapshot() == expected
+        assert np.isclose(online.mean, rets.mean(), rtol=1e-12)
+        assert np.isclose(online.std, rets.std(), rtol=1e-10)
+
+        chunked = StreamingMetrics(rf_rate_pct=2.0)
+        for block in np.array_split(eq, 7):
+            chunked.update_many(block)
+        assert chunked.snapshot() == expected
+        assert np.isclose(chunked.std, online.std, rtol=1e-10)
+        assert chunked.max_dd == online.max_dd and chunked.wins == online.wins
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+from backend.engine.backtester import simulate_long_only
+from backend.engine.portfolio import align_closes, simulate_portfolio, static_weights
+
+def make_df(n=300, seed=0, start="2020-01-01"):
+    idx = pd.date_range(start, periods=n, freq="B")
+    returns = np.random.default_rng(seed).normal(0.0002, 0.01, n)
+    price = 100 * (1 + pd.Series(returns, index=idx)).cumprod()
+    return pd.DataFrame({"Open": price, "Close": price})
+
+
+def test_single_asset_matches_simulate_long_only():
+    df = make_df()
+    sig = pd.Series(0, index=df.index)
+    sig.iloc[20:100] = 1
+    sig.iloc[150:250] = 1
+    ref = simulate_long_only(df, sig, cost_bps=5, slippage_bps=2)
+    out = simulate_portfolio(df[["Close"]].to_numpy(), sig.to_numpy()[:, None], cost_bps=5,
+                             slippage_bps=2)
+    np.testing.assert_allclose(out.equity, ref.equity_curve, rtol=1e-12)
+    assert out.trades == len(ref.trades)
+
+
+def test_aligned_portfolio_is_weighted_sum_of_assets():
+    # second symbol lists later and skips some days
+    b = make_df(200, seed=1, start="2020-03-02").iloc[::2]
+    prices = align_closes({"A": make_df(), "B": b})
+    assert prices.symbols == ["A", "B"]
+    assert np.isnan(prices.close[0, 1]) and not np.isnan(prices.close[-1, 1])
+
+    w = static_weights(prices, {"A": 0.6, "B": 0.4})
+    assert (w[~prices.available] == 0).all()
+    out = simulate_portfolio(
+        prices.close, w, cost_bps=10, index=prices.index, symbols=prices.symbols
+    )
+
+    rets = pd.DataFrame(prices.close, index=prices.index).pct_change().fillna(0).to_numpy()
+    gross = (np.vstack([np.zeros(2), w[:-1]]) * rets).sum(axis=1)
+    np.testing.assert_allclose(out.returns, gross - out.costs)
+    np.testing.assert_allclose(out.contributions.sum(axis=1), gross)
+    # B enters once at 0.4 (the only weight change): turnover cost on that bar only
+    assert out.trades == 1 and np.isclose(out.turnover.sum(), 0.4)
+    assert np.isclose(out.costs.sum(), 0.4 * 10 / 10000)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from backend.engine.metrics import compute_metrics_batch
+from backend.engine.robustness import (
+    block_bootstrap_indices,
+    resample_metrics,
+    trade_segments,
+    trade_shuffle_indices,
+)
+
+
+def make_returns(n=1000, seed=5):
+    rng = np.random.default_rng(seed)
+    signal = np.repeat(rng.integers(0, 2, n // 25), 25)
+    net = rng.normal(0.0005, 0.01, n) * signal
+    return net, signal
+
+
+def test_resample_indices_preserve_blocks_and_segments():
+    rng = np.random.default_rng(0)
+    idx = block_bootstrap_indices(rng, 100, 50, block=7)
+    assert idx.shape == (50, 100)
+    steps = np.diff(idx, axis=1)
+    assert ((steps == 1) | (steps == -99))[:, :6].all()   # consecutive within the first block
+
+    signal = np.array([0, 0, 1, 1, 1, 0, 1, 1])
+    starts = trade_segments(signal)
+    assert starts.tolist() == [0, 2, 5, 6]
+    idx = trade_shuffle_indices(rng, starts, len(signal), 20)
+    assert (np.sort(idx, axis=1) == np.arange(len(signal))).all()  # a permutation of bars
+
+
+def test_resample_metrics_reproducible_and_parallel_invariant():
+    net, signal = make_returns()
+    a = resample_metrics(net, n_paths=300, seed=1, chunk_paths=64)
+    b = resample_metrics(net, n_paths=300, seed=1, chunk_paths=64, max_workers=2)
+    assert a.block == 10
+    for k in a.samples:
+        assert len(a.samples[k]) == 300
+        np.testing.assert_array_equal(a.samples[k], b.samples[k])
+
+    # reordering whole trades keeps every return, so only the drawdown can move
+    observed = compute_metrics_batch(np.cumprod(np.concatenate(([1.0], 1 + net)))[None, :])
+    out = resample_metrics(net, method="trade_shuffle", n_paths=200, signal=signal, seed=2)
+    assert np.allclose(out.samples["ann_return_pct"], observed["ann_return_pct"][0])
+    assert out.samples["max_drawdown_pct"].std() > 0
+    lo, hi = out.interval("max_drawdown_pct", 0.9)
+    assert lo <= hi <= 0
+
+    with pytest.raises(ValueError, match="signal"):
+        resample_metrics(net, method="trade_shuffle")
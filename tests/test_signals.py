@@ -11,3 +11,69 @@ def test_sma_signal_shapes_and_values():
 
     assert sig.iloc[:10].sum() <= 1  # only small warm-up activity
 
+
+
+def _rsi_band_loop(r, lower, upper):
+    # bar-by-bar reference for the hysteresis rule
+    signal = [0] * len(r)
+    for i in range(1, len(r)):
+        if r[i] < lower:
+            signal[i] = 1
+        elif r[i] > upper:
+            signal[i] = 0
+        else:
+            signal[i] = signal[i - 1]
+    return signal
+
+
+def test_rsi_band_signals_match_loop_on_random_inputs():
+    import numpy as np
+    from backend.engine.strategies.rsi import rsi, rsi_band_signals
+
+    rng = np.random.default_rng(42)
+    for trial in range(20):
+        n = int(rng.integers(2, 2000))
+        idx = pd.date_range("2020-01-01", periods=n, freq="B")
+        close = 100 * np.cumprod(1 + rng.normal(0, 0.02, n))
+        df = pd.DataFrame({"Close": close}, index=idx)
+        period = int(rng.integers(2, 30))
+        lower = float(rng.uniform(10, 45))
+        upper = float(rng.uniform(55, 90))
+
+        expected = _rsi_band_loop(rsi(close, period), lower, upper)
+        got = rsi_band_signals(df, period=period, lower=lower, upper=upper)
+        assert got.tolist() == expected, trial
+
+
+def test_rsi_matches_pandas_reference():
+    import numpy as np
+    from backend.engine.strategies.rsi import rsi
+
+    close = pd.Series(100 * np.cumprod(1 + np.random.default_rng(3).normal(0, 0.01, 500)))
+    delta = close.diff()
+    up = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    down = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False).mean()
+    expected = 100 - (100 / (1 + up / (down + 1e-12)))
+    assert np.allclose(rsi(close.to_numpy(), 14), expected, equal_nan=True)
+
+
+def test_registry_resolves_params_and_dispatches():
+    import pytest
+    from backend.engine.strategies import build_signal, get_strategy
+    from backend.engine.strategies.rsi import generate_signals_rsi
+
+    spec = get_strategy("rsi")
+    assert spec.resolve({"period": 7.0}) == {"period": 7, "lower": 30.0, "upper": 70.0}
+    assert spec.warmup_bars({"period": 7}) == 70
+    assert get_strategy("sma_crossover").warmup_bars({"slow": 50}) == 50
+    for bad in ({"period": 0}, {"period": 7.5}, {"upper": 120}, {"window": 3}):
+        with pytest.raises(ValueError):
+            spec.resolve(bad)
+    with pytest.raises(ValueError, match="Unsupported strategy"):
+        get_strategy("macd")
+
+    idx = pd.date_range("2020-01-01", periods=300, freq="B")
+    df = pd.DataFrame({"Close": (100 + pd.Series(range(300), index=idx) % 17).astype(float)})
+    sig = build_signal(df, "rsi", {"period": 5, "lower": 40, "upper": 60})
+    assert sig.name == "signal"
+    assert sig.equals(generate_signals_rsi(df, period=5, lower=40, upper=60))
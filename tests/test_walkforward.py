@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+from backend.engine.backtester import simulate_long_only
+from backend.engine.strategies import build_signal
+from backend.engine.walkforward import walk_forward, walk_forward_windows
+
+def make_df(n=600, seed=3):
+    idx = pd.date_range("2020-01-01", periods=n, freq="B")
+    returns = np.random.default_rng(seed).normal(0.0002, 0.01, n)
+    price = 100 * (1 + pd.Series(returns, index=idx)).cumprod()
+    return pd.DataFrame({"Open": price, "Close": price})
+
+
+def test_windows_roll_by_test_size():
+    wins = walk_forward_windows(100, train_bars=40, test_bars=25)
+    assert [(w[0].start, w[0].stop, w[1].start, w[1].stop) for w in wins] == [
+        (0, 40, 40, 65), (25, 65, 65, 90), (50, 90, 90, 100)
+    ]
+    anchored = walk_forward_windows(100, train_bars=40, test_bars=25, anchored=True)
+    assert all(train.start == 0 for train, _ in anchored)
+
+
+def test_single_combination_matches_full_backtest():
+    df = make_df()
+    out = walk_forward(df, "sma_crossover", {"fast": [5], "slow": [20]}, 200, 100,
+                       cost_bps=5, slippage_bps=2, max_workers=1)
+    full = simulate_long_only(df, build_signal(df, "sma_crossover", {"fast": 5, "slow": 20}),
+                              cost_bps=5, slippage_bps=2)
+    eq = pd.Series(full.equity_curve, index=df.index).iloc[199:]
+    np.testing.assert_allclose(out.equity.to_numpy(), (eq / eq.iloc[0]).to_numpy(), rtol=1e-12)
+    assert out.equity.index.equals(eq.index)
+    assert len(out.windows) == 4
+
+
+def test_picks_best_train_params_and_stitches_switches():
+    df = make_df(800)
+    grid = {"period": [7, 14], "lower": [25, 35], "upper": [65, 75]}
+    out = walk_forward(df, "rsi", grid, 250, 110, objective="sharpe", cost_bps=5)
+    assert out.combinations == 8
+
+    signals = {}
+    for w in out.windows:
+        train = df.loc[w.train_start:w.train_end].index
+        best = None
+        for period in grid["period"]:
+            for lower in grid["lower"]:
+                for upper in grid["upper"]:
+                    params = {"period": period, "lower": lower, "upper": upper}
+                    key = tuple(params.values())
+                    if key not in signals:
+                        sig = build_signal(df, "rsi", params)
+                        full = simulate_long_only(df, sig, cost_bps=5)
+                        signals[key] = (sig, pd.Series(full.equity_curve, index=df.index))
+                    eq = signals[key][1]
+                    prev = eq.iloc[max(df.index.get_loc(train[0]) - 1, 0)]
+                    rets = (eq.loc[train] / prev).pct_change().fillna(eq.loc[train[0]] / prev - 1)
+                    score = np.sqrt(252) * rets.mean() / (rets.std() + 1e-12)
+                    if best is None or round(score, 2) > round(best[0], 2):
+                        best = (score, params)
+        assert w.params == best[1]
+        assert abs(w.train_metrics["sharpe"] - best[0]) <= 0.011
+
+    # OOS equity == one backtest of the stitched signal
+    stitched = pd.Series(0, index=df.index)
+    for w in out.windows:
+        key = (w.params["period"], w.params["lower"], w.params["upper"])
+        stitched.loc[w.test_start:w.test_end] = signals[key][0].loc[w.test_start:w.test_end]
+    first = out.equity.index[0]
+    stitched.loc[first] = signals[tuple(out.windows[0].params.values())][0].loc[first]
+    part = df.loc[first:]
+    ref = simulate_long_only(part, stitched.loc[first:], cost_bps=5)
+    np.testing.assert_allclose(out.equity.to_numpy(), ref.equity_curve, rtol=1e-12)
+    assert out.trades == len(ref.trades)
+
+
+def test_signal_grid_goes_through_the_registry(monkeypatch):
+    import dataclasses
+
+    import pytest
+    from backend.engine import strategies
+    from backend.engine.streaming import make_signal_state
+    from backend.engine.walkforward import signal_grid
+
+    df = make_df()
+    grid = {"fast": [3, 5, 30], "slow": [20, 40]}
+    params, signals = signal_grid(df, "sma_crossover", grid)
+
+    # registered without grid/state hooks: one signals() call per valid combination
+    plain = dataclasses.replace(
+        strategies.STRATEGIES["sma_crossover"], name="sma_plain", grid_signals=None, state=None
+    )
+    monkeypatch.setitem(strategies.STRATEGIES, "sma_plain", plain)
+    plain_params, plain_signals = signal_grid(df, "sma_plain", grid)
+    assert plain_params == params and np.array_equal(plain_signals, signals)
+    with pytest.raises(ValueError, match="no bar-by-bar"):
+        make_signal_state("sma_plain", {})
+
+    with pytest.raises(ValueError, match=r"Unknown params for sma_crossover: \['fats'\]"):
+        signal_grid(df, "sma_crossover", {"fats": [5], "slow": [20]})
+    with pytest.raises(ValueError, match="Unsupported strategy"):
+        signal_grid(df, "macd", {})
+    with pytest.raises(ValueError, match="Unsupported strategy"):
+        make_signal_state("macd", {})